@@ -152,7 +152,31 @@ configure_gemini() {
     fi
 }
 
-# ─── 8. Summary ─────────────────────────────────────────────────────────────
+# ─── 8. Hardware calibration ────────────────────────────────────────────────
+calibrate_hardware() {
+    echo -e "${BOLD}8. Hardware calibration (optional)${NC}"
+
+    if grep -q "^machine_profile:" "$SCRIPT_DIR/config.yaml" 2>/dev/null; then
+        skip "Already calibrated (re-run with: uv run transcriber calibrate)"
+        return
+    fi
+
+    echo "  A short benchmark picks the fastest model size, device, worker count"
+    echo "  and thread count for this machine and saves them to config.yaml."
+    read -rp "  Run calibration now? [y/N]: " answer
+
+    if [[ "$answer" =~ ^[Yy]$ ]]; then
+        if uv run transcriber calibrate; then
+            ok "Calibration saved to config.yaml"
+        else
+            warn "Calibration failed; keeping current settings"
+        fi
+    else
+        skip "Skipped. Run later with: uv run transcriber calibrate"
+    fi
+}
+
+# ─── 9. Summary ─────────────────────────────────────────────────────────────
 show_summary() {
     echo ""
     echo -e "${BOLD}=== Setup Complete ===${NC}"
@@ -170,6 +194,7 @@ check_hardware
 check_disk
 install_deps
 configure_gemini
+calibrate_hardware
 show_summary
 
 echo -e "${BOLD}Launching transcriber...${NC}\n"
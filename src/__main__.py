@@ -1,34 +1,52 @@
 # src/__main__.py
 
+import argparse
+import json
 import time
-
-from rich.console import Console
-from rich.spinner import Spinner
-from rich.live import Live
-from rich.table import Table
+from pathlib import Path
+from typing import Any, Optional
 
 from src import config
 from src.config import DEFAULT_INPUT_DIR, DEFAULT_OUTPUT_DIR
-from src.ui import run_setup, clear_screen
-from src.home import show_home
-from src.summarizer import load_env, is_available as summarize_available
 
-console = Console()
+
+class _LazyConsole:
+    """rich Console created on first use, so --help and commands that print nothing skip importing rich."""
+
+    _console: Any = None
+
+    def __getattr__(self, name: str) -> Any:
+        if self._console is None:
+            from rich.console import Console  # pylint: disable=import-outside-toplevel
+            self._console = Console()
+        return getattr(self._console, name)
+
+
+console = _LazyConsole()
 
 
 def _show_results(results: list[dict]) -> None:
     """
     Display an operation summary table after queue processing.
 
-    @results: List of dicts with keys 'file', 'success', and 'error'.
+    @results: List of dicts with keys 'file', 'success', and 'error', and
+        optionally 'notes' (list of per-file details) and 'peak_mb'.
     """
+    from rich.table import Table
+
     has_summaries = any("summary_success" in r for r in results)
+    has_notes = any(r.get("notes") for r in results)
+    has_memory = any(r.get("peak_mb") for r in results)
 
     table = Table(title="Operation Summary")
     table.add_column("File", style="cyan")
     table.add_column("Transcription", style="green")
     if has_summaries:
         table.add_column("Summary", style="green")
+    if has_memory:
+        table.add_column("Peak RSS", justify="right")
+    if has_notes:
+        table.add_column("Notes", style="dim")
 
     succeeded = 0
     failed = 0
@@ -38,6 +56,7 @@ def _show_results(results: list[dict]) -> None:
             f"[red]Failed: {r['error']}[/red]" if r.get("error") else "[red]Failed[/red]"
         )
 
+        row = [r["file"], t_status]
         if has_summaries:
             if "summary_success" not in r:
                 s_status = "[dim]-[/dim]"
@@ -45,9 +64,12 @@ def _show_results(results: list[dict]) -> None:
                 s_status = "[green]Done[/green]"
             else:
                 s_status = f"[red]Failed: {r.get('summary_error', '')}[/red]"
-            table.add_row(r["file"], t_status, s_status)
-        else:
-            table.add_row(r["file"], t_status)
+            row.append(s_status)
+        if has_memory:
+            row.append(f"{r['peak_mb']:.0f} MB" if r.get("peak_mb") else "[dim]-[/dim]")
+        if has_notes:
+            row.append("; ".join(r.get("notes", [])))
+        table.add_row(*row)
 
         if r["success"]:
             succeeded += 1
@@ -56,6 +78,7 @@ def _show_results(results: list[dict]) -> None:
 
     console.print()
     console.print(table)
+    _show_worker_memory(results)
     console.print()
     console.print(
         f"[bold]{succeeded} succeeded, {failed} failed "
@@ -64,13 +87,49 @@ def _show_results(results: list[dict]) -> None:
     console.print(f"Output directory: {DEFAULT_OUTPUT_DIR}")
 
 
+def _show_worker_memory(results: list[dict]) -> None:
+    """Show per-worker unique memory (USS) when files ran in forked workers."""
+    from rich.table import Table
+    from src.memory import unique_rss_mb
+
+    workers: dict[int, dict] = {}
+    for r in results:
+        pid = r.get("worker_pid")
+        if pid is None:
+            continue
+        w = workers.setdefault(pid, {"files": 0, "uss": 0.0})
+        w["files"] += 1
+        w["uss"] = max(w["uss"], r.get("worker_uss_mb") or 0.0)
+
+    if not workers:
+        return
+
+    table = Table(title="Worker Memory (unique RSS)")
+    table.add_column("Worker PID", style="cyan")
+    table.add_column("Files", justify="right")
+    table.add_column("Peak USS", style="green", justify="right")
+    for pid, w in sorted(workers.items()):
+        table.add_row(str(pid), str(w["files"]), f"{w['uss']:.0f} MB")
+
+    parent = unique_rss_mb()
+    if parent is not None:
+        table.add_row("parent (model)", "-", f"{parent:.0f} MB")
+
+    console.print()
+    console.print(table)
+
+
 def _run_transcription(settings: dict) -> None:
     """
     Load model and process the selected file queue.
 
     @settings: Config dict from run_setup().
     """
-    from src.transcriber import load_model, process_queue, get_device
+    from rich.live import Live
+    from rich.spinner import Spinner
+    from src.ui import clear_screen
+    from src import preload
+    from src.transcriber import process_queue, get_device
 
     clear_screen()
 
@@ -79,7 +138,7 @@ def _run_transcription(settings: dict) -> None:
         Spinner("dots", text=f"Loading model '{settings['model_size']}'..."),
         console=console,
     ):
-        model = load_model(settings["model_size"])
+        model = preload.get(settings["model_size"])
 
     device = get_device()
     console.print(f"[green]Model '{settings['model_size']}' loaded on {device}.[/green]\n")
@@ -94,7 +153,14 @@ def _run_transcription(settings: dict) -> None:
         output_dir=DEFAULT_OUTPUT_DIR,
         language=settings["language"],
         task=whisper_task,
+        formats=config.OUTPUT_FORMATS,
+        word_timestamps=config.WORD_TIMESTAMPS,
+        language_prepass=config.LANGUAGE_PREPASS,
+        workers=config.WORKERS,
+        watchdog=bool(config.WATCHDOG["enabled"]),
     )
+    if not config.PRELOAD_MODEL:
+        preload.cancel()
 
     elapsed = time.monotonic() - start_time
     minutes, seconds = divmod(int(elapsed), 60)
@@ -111,9 +177,8 @@ def _run_transcription(settings: dict) -> None:
 
 
 def _run_summarization(results: list[dict], style: str) -> None:
-    """Run Gemini summarization on successful transcripts."""
-    from src.summarizer import summarize_file
-    from pathlib import Path
+    """Run the configured summarizer on successful transcripts."""
+    from src.summarizer import summarize_files
     from rich.progress import Progress, SpinnerColumn, TextColumn, MofNCompleteColumn
 
     to_summarize = [r for r in results if r["success"]]
@@ -131,20 +196,25 @@ def _run_summarization(results: list[dict], style: str) -> None:
             "Summarizing", total=len(to_summarize), filename=""
         )
 
+        pairs = []
         for r in to_summarize:
             stem = Path(r["file"]).stem
-            transcript_path = DEFAULT_OUTPUT_DIR / f"{stem}.txt"
-            summary_path = DEFAULT_OUTPUT_DIR / f"{stem}_summary.txt"
-            progress.update(task_id, filename=r["file"])
-            success, error = summarize_file(transcript_path, summary_path, style)
+            pairs.append((DEFAULT_OUTPUT_DIR / f"{stem}.txt", DEFAULT_OUTPUT_DIR / f"{stem}_summary.txt"))
+
+        def _done(i: int, success: bool, error: str | None) -> None:
+            r = to_summarize[i]
             r["summary_success"] = success
             r["summary_error"] = error
+            progress.update(task_id, filename=r["file"])
             progress.advance(task_id)
 
+        summarize_files(pairs, style, on_done=_done)
+
 
 def _run_standalone_summarization(settings: dict) -> None:
     """Summarize existing transcript files without running Whisper."""
-    from src.summarizer import summarize_file
+    from src.ui import clear_screen
+    from src.summarizer import summarize_files
     from rich.progress import Progress, SpinnerColumn, TextColumn, MofNCompleteColumn
 
     clear_screen()
@@ -164,18 +234,22 @@ def _run_standalone_summarization(settings: dict) -> None:
             "Summarizing", total=len(transcript_files), filename=""
         )
 
-        for tpath in transcript_files:
-            progress.update(task_id, filename=tpath.name)
-            summary_path = tpath.parent / f"{tpath.stem}_summary.txt"
-            success, error = summarize_file(tpath, summary_path, style)
-            results.append({"file": tpath.name, "success": success, "error": error})
+        def _done(i: int, _success: bool, _error: str | None) -> None:
+            progress.update(task_id, filename=transcript_files[i].name)
             progress.advance(task_id)
 
+        pairs = [(tpath, tpath.parent / f"{tpath.stem}_summary.txt") for tpath in transcript_files]
+        outcomes = summarize_files(pairs, style, on_done=_done)
+        for tpath, (success, error) in zip(transcript_files, outcomes):
+            results.append({"file": tpath.name, "success": success, "error": error})
+
     _show_summary_results(results)
 
 
 def _show_summary_results(results: list[dict]) -> None:
     """Display results table for standalone summarization."""
+    from rich.table import Table
+
     table = Table(title="Summary Results")
     table.add_column("File", style="cyan")
     table.add_column("Status", style="green")
@@ -202,10 +276,502 @@ def _show_summary_results(results: list[dict]) -> None:
     console.print(f"Output directory: {DEFAULT_OUTPUT_DIR}")
 
 
-def main() -> None:
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the command-line parser. No subcommand starts the interactive TUI."""
+    parser = argparse.ArgumentParser(
+        prog="transcriber",
+        description="Local audio transcription using OpenAI Whisper. "
+                    "Run without arguments for the interactive TUI.",
+    )
+    sub = parser.add_subparsers(dest="command", metavar="COMMAND")
+
+    search_parser = sub.add_parser("search", help="Search transcripts for a term")
+    search_parser.add_argument("query", nargs="+", help="Search terms (FTS5 syntax accepted)")
+    search_parser.add_argument("-n", "--limit", type=int, default=20, help="Maximum number of hits")
+    search_parser.add_argument(
+        "--reindex", action="store_true",
+        help="Re-check every transcript, e.g. after editing files outside the app",
+    )
+
+    worker_parser = sub.add_parser(
+        "worker",
+        help="Cooperatively drain the audio directory with other workers (lease-based)",
+    )
+    worker_parser.add_argument(
+        "--model", choices=config.MODEL_SIZES + [config.TIERED_MODEL], default=config.DEFAULT_MODEL_SIZE,
+        help="Model size",
+    )
+    worker_parser.add_argument("--language", default="auto", help="Language name/code, or 'auto'")
+    worker_parser.add_argument("--task", choices=config.TASKS, default=config.DEFAULT_TASK)
+    worker_parser.add_argument("--input", type=Path, default=DEFAULT_INPUT_DIR, help="Audio directory")
+    worker_parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT_DIR, help="Transcript directory")
+    worker_parser.add_argument(
+        "--lease-ttl", type=float, default=config.LEASE_TTL,
+        help="Seconds without a heartbeat before another worker reclaims a file",
+    )
+    worker_parser.add_argument(
+        "--max-attempts", type=int, default=config.LEASE_MAX_ATTEMPTS,
+        help="Failed attempts after which a file is given up on",
+    )
+
+    calibrate_parser = sub.add_parser(
+        "calibrate",
+        help="Benchmark this machine and save the fastest model/device/worker settings",
+    )
+    calibrate_parser.add_argument(
+        "--tier", choices=list(config.ACCURACY_TIERS), default="standard",
+        help="Minimum accuracy tier (draft=tiny ... max=large)",
+    )
+    calibrate_parser.add_argument(
+        "--sizes", nargs="+", choices=config.MODEL_SIZES,
+        help="Model sizes to benchmark (default: the smallest meeting --tier, then larger ones while real time is met)",
+    )
+    calibrate_parser.add_argument(
+        "--target-rtf", type=float, default=config.CALIBRATE_TARGET_RTF,
+        help="Real-time factor a larger model must reach to be chosen (default: 1.0, real time)",
+    )
+    calibrate_parser.add_argument("--device", choices=["cpu", "cuda"], help="Default: CUDA when available")
+    calibrate_parser.add_argument("--windows", type=int, default=3, help="Timed 30-second windows per run")
+    calibrate_parser.add_argument("--dry-run", action="store_true", help="Measure only; do not update config.yaml")
+
+    eval_parser = sub.add_parser("eval", help="Compare accuracy and speed of settings against reference transcripts")
+    eval_source = eval_parser.add_mutually_exclusive_group(required=True)
+    eval_source.add_argument(
+        "dataset", nargs="?", type=Path,
+        help="Directory of audio files with <stem>.ref.txt references",
+    )
+    eval_source.add_argument(
+        "--smoke", action="store_true",
+        help="Use the offline synthetic non-speech fixture instead: hallucinated words, speed and memory only, no WER",
+    )
+    eval_parser.add_argument(
+        "--models", nargs="+", choices=config.MODEL_SIZES + [config.TIERED_MODEL],
+        default=[config.DEFAULT_MODEL_SIZE],
+    )
+    eval_parser.add_argument(
+        "--presets", nargs="+", choices=list(config.DECODE_PRESETS), default=[config.DECODE_PRESET],
+    )
+    eval_parser.add_argument(
+        "--guard", nargs="+", choices=["on", "off"],
+        default=["on" if config.REPETITION_GUARD["enabled"] else "off"],
+        help="Repetition guard settings to compare",
+    )
+    eval_parser.add_argument("--language", default="auto", help="Language code, or 'auto'")
+    eval_parser.add_argument("--json", type=Path, help="Where to write full results (default: .cache/eval/)")
+
+    archive_parser = sub.add_parser(
+        "archive",
+        help="Pack transcripts and summaries into the compressed archive (or restore them)",
+    )
+    archive_parser.add_argument(
+        "--older-than", type=float, default=0.0, metavar="DAYS",
+        help="Only archive files not modified for this many days",
+    )
+    archive_parser.add_argument("--keep", action="store_true", help="Keep the original files after archiving")
+    archive_parser.add_argument("--extract", nargs="+", metavar="NAME", help="Restore these files from the archive")
+    archive_parser.add_argument("--list", action="store_true", help="List archived files")
+
+    stats_parser = sub.add_parser("stats", help="Aggregate recorded segments (speech hours, confidence)")
+    stats_parser.add_argument(
+        "--by", default="language", choices=["language", "model", "task", "preset", "file", "day"],
+        help="Group runs by this attribute",
+    )
+    stats_parser.add_argument("--all-runs", action="store_true", help="Include superseded runs of re-transcribed files")
+
+    export_parser = sub.add_parser("export", help="Export recorded segments with run metadata")
+    export_parser.add_argument("output", nargs="?", type=Path, help="Destination file (default: stdout)")
+    export_parser.add_argument("--format", choices=["csv", "jsonl"], default="csv")
+    export_parser.add_argument("--all-runs", action="store_true", help="Include superseded runs of re-transcribed files")
+
+    live_parser = sub.add_parser(
+        "live",
+        help="Transcribe a live stream from stdin or a named pipe, printing segments as they settle",
+    )
+    live_parser.add_argument(
+        "--input", default="-",
+        help="Audio source: '-' for stdin (default), a named pipe, a file, or anything ffmpeg reads",
+    )
+    live_parser.add_argument("--raw", action="store_true", help="Input is already 16 kHz mono s16le PCM")
+    live_parser.add_argument(
+        "--realtime", action="store_true",
+        help="Read the input at its native rate (simulate a live source from a file)",
+    )
+    live_parser.add_argument("--model", default=config.DEFAULT_MODEL_SIZE, help="Model size")
+    live_parser.add_argument("--language", default="auto", help="Language code, or 'auto'")
+    live_parser.add_argument("--task", choices=["transcribe", "translate"], default="transcribe")
+    live_parser.add_argument("--output", type=Path, help="Also append finalised segments to this transcript file")
+    live_parser.add_argument("--step", type=float, default=1.0, help="Seconds of new audio between passes")
+    live_parser.add_argument(
+        "--max-buffer", type=float, default=20.0,
+        help="Seconds of unconfirmed audio before segments are finalised regardless (bounds latency)",
+    )
+
+    return parser
+
+
+def _cli_eval(args: argparse.Namespace) -> None:
+    """Run each settings combination over a reference set and print a comparison table."""
+    from rich.table import Table
+    from rich.markup import escape
+    from src.evaluate import REFERENCE_SUFFIX, evaluate, load_dataset, synthetic_fixture
+
+    directory = synthetic_fixture() if args.smoke else args.dataset
+    dataset = load_dataset(directory)
+    if not dataset:
+        console.print(f"[red]No audio files with {REFERENCE_SUFFIX} references in {directory}.[/red]")
+        return
+
+    def _log(row: dict) -> None:
+        label = f"{row['model']} / {row['preset']} / guard {'on' if row['guard'] else 'off'}"
+        if row.get("error"):
+            console.print(f"[red]{label}: {escape(row['error'])}[/red]", highlight=False)
+        else:
+            console.print(f"[dim]{label}: done in {row['transcribe_seconds']:.1f}s[/dim]", highlight=False)
+
+    console.print(f"[bold]Evaluating {len(dataset)} file(s) from {directory}...[/bold]")
+    if args.smoke:
+        console.print("[dim]Smoke test: the fixture has no speech, so WER and CER are not measured.[/dim]")
+    rows = evaluate(
+        dataset, args.models, args.presets, [g == "on" for g in args.guard],
+        language=None if args.language == "auto" else args.language, on_result=_log,
+    )
+
+    def _pct(value: Optional[float]) -> str:
+        return f"{value:.1%}" if value is not None else "-"
+
+    table = Table(title="Evaluation")
+    table.add_column("Model", style="cyan")
+    table.add_column("Preset")
+    table.add_column("Guard")
+    table.add_column("WER", justify="right")
+    table.add_column("CER", justify="right")
+    table.add_column("Hallucinated", justify="right")
+    table.add_column("RTF", justify="right")
+    table.add_column("Load", justify="right")
+    table.add_column("Fallbacks", justify="right")
+    table.add_column("Peak RAM", justify="right")
+    table.add_column("Failed", justify="right")
+    for r in rows:
+        if r.get("error"):
+            table.add_row(r["model"], r["preset"], "on" if r["guard"] else "off", "[red]error[/red]", *["-"] * 7)
+            continue
+        table.add_row(
+            r["model"], r["preset"], "on" if r["guard"] else "off",
+            _pct(r["wer"]), _pct(r["cer"]), str(r["hallucinated_words"]),
+            f"{r['rtf']:.3f}" if r["rtf"] is not None else "-",
+            f"{r['load_seconds']:.1f}s", str(r["fallbacks"]), f"{r['peak_mb']} MB",
+            f"[red]{r['failed']}[/red]" if r["failed"] else "0",
+        )
+    console.print()
+    console.print(table)
+    console.print(
+        "[dim]WER/CER over files with references; Hallucinated = words output for files "
+        "with empty references; RTF = processing seconds per audio second.[/dim]"
+    )
+
+    out = args.json or config.CACHE_DIR / "eval" / f"results-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps({"dataset": str(directory), "results": rows}, indent=2), encoding="utf-8")
+    console.print(f"Full results: {out}")
+
+
+def _cli_calibrate(args: argparse.Namespace) -> None:
+    """Benchmark candidate configurations and write the best one into config.yaml."""
+    from rich.table import Table
+    from rich.markup import escape
+    from src.calibrate import apply_profile, calibrate
+
+    def _log(entry: dict) -> None:
+        if entry["rtf"] is None:
+            outcome = f"[red]failed: {escape(entry.get('error', ''))}[/red]"
+        else:
+            outcome = f"RTF {entry['rtf']:.3f}, peak {entry['peak_mb']} MB"
+            if not entry["fits"]:
+                outcome += " [yellow](exceeds memory budget)[/yellow]"
+        console.print(
+            f"[dim]{entry['model']} on {entry['device']}, {entry['workers']} worker(s) x "
+            f"{entry['threads']} thread(s):[/dim] {outcome}",
+            highlight=False,
+        )
+
+    console.print(f"[bold]Calibrating for accuracy tier '{args.tier}'...[/bold]")
+    profile = calibrate(
+        args.tier, sizes=args.sizes, device=args.device, windows=args.windows, on_result=_log,
+        target_rtf=args.target_rtf,
+    )
+
+    host = profile["host"]
+    gpu = f", {host['gpu']} ({host['vram_mb']} MB)" if host["gpu"] else ""
+    table = Table(title=f"{host['cpu']} x{host['cpu_count']}, {host['ram_mb']} MB RAM{gpu}")
+    table.add_column("Model", style="cyan")
+    table.add_column("Device")
+    table.add_column("Workers", justify="right")
+    table.add_column("Threads", justify="right")
+    table.add_column("RTF", justify="right")
+    table.add_column("Peak RAM", justify="right")
+    table.add_column("VRAM", justify="right")
+    for r in profile["results"]:
+        chosen = r is profile["best"]
+        table.add_row(
+            f"{r['model']} *" if chosen else r["model"],
+            r["device"], str(r["workers"]), str(r["threads"]),
+            f"{r['rtf']:.3f}" if r["rtf"] is not None else "[red]failed[/red]",
+            f"{r['peak_mb']} MB" if r["peak_mb"] is not None else "-",
+            f"{r['vram_mb']} MB" if r["vram_mb"] is not None else "-",
+            style="bold green" if chosen else None,
+        )
+    console.print()
+    console.print(table)
+    console.print("[dim]RTF = processing seconds per second of audio, all workers combined (lower is faster).[/dim]")
+
+    best = profile["best"]
+    if best is None:
+        console.print("[red]No configuration fitted in memory; config.yaml not changed.[/red]")
+        return
+    if best["rtf"] > args.target_rtf:
+        console.print(f"[yellow]No model reached RTF {args.target_rtf:g}; using the fastest configuration.[/yellow]")
+    summary = (
+        f"model_size={best['model']}, device={best['device']}, "
+        f"workers={best['workers']}, threads={best['threads'] if best['device'] == 'cpu' else 0}"
+    )
+    if args.dry_run:
+        console.print(f"[bold]Best: {summary}[/bold] (dry run, config.yaml not changed)")
+        return
+    apply_profile(profile)
+    console.print(f"[bold green]Saved to config.yaml: {summary}[/bold green]")
+
+
+def _cli_archive(args: argparse.Namespace) -> None:
+    """Move transcripts into the archive, restore them, or list its contents."""
+    from rich.markup import escape
+    from src import archive
+    from src.ui import format_size
+
+    try:
+        if args.list:
+            entries = archive.list_entries()
+            for name in sorted(entries, key=str.lower):
+                console.print(f"{escape(name)} [dim]({format_size(entries[name][1])})[/dim]", highlight=False)
+            console.print(f"[bold]{len(entries)} archived file(s)[/bold]")
+            return
+        if args.extract:
+            restored = archive.extract_files(args.extract)
+            console.print(f"[bold]Restored {restored} of {len(args.extract)} file(s).[/bold]")
+            return
+
+        paths = archive.archive_candidates(older_than_days=args.older_than)
+        if not paths:
+            console.print("[yellow]Nothing to archive.[/yellow]")
+            return
+        before = sum(p.stat().st_size for p in paths)
+        count = archive.archive_files(paths, keep=args.keep)
+    except RuntimeError as e:
+        console.print(f"[red]{escape(str(e))}[/red]")
+        return
+    packed = sum(p.stat().st_size for p in (DEFAULT_OUTPUT_DIR / archive.ARCHIVE_DIR_NAME).glob("pack-*.zst"))
+    console.print(
+        f"[bold green]Archived {count} file(s) ({format_size(before)}); "
+        f"archive packs now total {format_size(packed)}.[/bold green]"
+    )
+
+
+def _cli_stats(args: argparse.Namespace) -> None:
+    """Print speech hours and average confidence per group of runs."""
+    from rich.table import Table
+    from rich.markup import escape
+    from src import segment_store
+
+    if not segment_store.store_path().exists():
+        console.print("[yellow]No segments recorded yet.[/yellow]")
+        return
+    rows = segment_store.aggregate(args.by, latest_only=not args.all_runs)
+
+    def _num(value: Optional[float], fmt: str) -> str:
+        return "-" if value is None else format(value, fmt)
+
+    table = Table(title=f"Segments by {args.by}")
+    table.add_column(args.by.capitalize(), style="cyan")
+    for column in ("Files", "Runs", "Segments", "Speech h", "Audio h", "Avg logprob", "Confidence", "No-speech"):
+        table.add_column(column, justify="right")
+    for row in rows:
+        table.add_row(
+            escape(str(row["key"] if row["key"] is not None else "-")),
+            str(row["files"]), str(row["runs"]), str(row["segments"]),
+            f"{row['speech_hours']:.2f}", f"{row['audio_hours']:.2f}",
+            _num(row["avg_logprob"], ".3f"), _num(row["confidence"], ".1%"), _num(row["no_speech_prob"], ".1%"),
+        )
+    console.print(table)
+
+
+def _cli_export(args: argparse.Namespace) -> None:
+    """Stream recorded segments to a file or stdout."""
+    import sys
+    from rich.markup import escape
+    from src import segment_store
+
+    if not segment_store.store_path().exists():
+        console.print("[yellow]No segments recorded yet.[/yellow]")
+        return
+    if args.output is None:
+        segment_store.export(sys.stdout, args.format, latest_only=not args.all_runs)
+        return
+    with open(args.output, "w", encoding="utf-8", newline="") as f:
+        count = segment_store.export(f, args.format, latest_only=not args.all_runs)
+    console.print(f"[green]Exported {count} segment(s) to {escape(str(args.output))}.[/green]")
+
+
+def _cli_live(args: argparse.Namespace) -> None:
+    """Stream finalised segments to stdout; the revisable partial goes to stderr."""
+    import sys
+    from rich.console import Console
+    from src.live import LiveTranscriber, format_segment, open_stream, run_live
+    from src.transcriber import load_model
+
+    err = Console(stderr=True)
+    err.print(f"[dim]Loading model '{args.model}'...[/dim]")
+    live = LiveTranscriber(
+        load_model(args.model),
+        language=None if args.language == "auto" else args.language,
+        task=args.task,
+        step=args.step,
+        max_buffer=args.max_buffer,
+    )
+    stream, proc = open_stream(args.input, raw=args.raw, realtime=args.realtime)
+    out = args.output.open("a", encoding="utf-8") if args.output else None
+    tty = sys.stderr.isatty()
+    shown = ""
+
+    def _partial(text: str) -> None:
+        nonlocal shown
+        if text == shown:
+            return
+        shown = text
+        if tty:
+            sys.stderr.write(f"\r\x1b[K\x1b[2m… {text[-(err.width - 3):]}\x1b[0m" if text else "\r\x1b[K")
+        elif text:
+            sys.stderr.write(f"… {text}\n")
+        sys.stderr.flush()
+
+    def _final(segment: dict) -> None:
+        if tty and shown:
+            sys.stderr.write("\r\x1b[K")
+            sys.stderr.flush()
+        print(format_segment(segment), flush=True)
+        if out:
+            out.write(format_segment(segment) + "\n\n")  # same layout as the .txt writer
+            out.flush()
+
+    err.print("[dim]Listening (Ctrl+C to stop)...[/dim]")
+    try:
+        run_live(live, stream, _final, _partial)
+    except KeyboardInterrupt:
+        for segment in live.finish():
+            _final(segment)
+    finally:
+        if proc is not None:
+            proc.kill()
+            proc.wait()
+        if out:
+            out.close()
+
+
+def _cli_worker(args: argparse.Namespace) -> None:
+    """Load the model and drain the shared audio directory until nothing is left."""
+    from rich.markup import escape
+    from src.leases import new_owner_id
+    from src.transcriber import drain_directory, load_model
+
+    name = new_owner_id()
+    console.print(f"[dim]{name}: loading model '{args.model}'...[/dim]")
+    model = load_model(args.model)
+
+    def _log(event: str, filename: str) -> None:
+        style = {"claimed": "dim", "done": "green", "failed": "red"}[event]
+        console.print(f"[{style}]{name} {event} {escape(filename)}[/{style}]", highlight=False)
+
+    start_time = time.monotonic()
+    results = drain_directory(
+        model=model,
+        input_dir=args.input,
+        output_dir=args.output,
+        language=None if args.language == "auto" else args.language,
+        task=args.task,
+        formats=config.OUTPUT_FORMATS,
+        word_timestamps=config.WORD_TIMESTAMPS,
+        lease_ttl=args.lease_ttl,
+        max_attempts=max(1, args.max_attempts),
+        on_event=_log,
+    )
+    succeeded = sum(1 for r in results if r["success"])
+    console.print(
+        f"[bold]{name}: {succeeded} succeeded, {len(results) - succeeded} failed "
+        f"in {int(time.monotonic() - start_time)}s[/bold]"
+    )
+
+
+def _cli_search(args: argparse.Namespace) -> None:
+    """Print transcript search hits as 'file [timestamp] snippet' lines."""
+    from rich.markup import escape
+    from src import search
+    from src.writers import format_timestamp
+
+    try:
+        if args.reindex:
+            search.sync_index()
+        else:
+            search.sync_if_changed()
+        hits = search.search(" ".join(args.query), limit=args.limit)
+    except RuntimeError as e:
+        console.print(f"[red]{escape(str(e))}[/red]")
+        return
+    for hit in hits:
+        console.print(
+            f"[cyan]{escape(hit['file'])}[/cyan] [green]\\[{format_timestamp(hit['start'])}][/green] "
+            f"{search.format_snippet(hit['snippet'])}",
+            highlight=False,
+            soft_wrap=True,
+        )
+    if not hits:
+        console.print("[yellow]No matches.[/yellow]")
+
+
+def main(argv: Optional[list[str]] = None) -> None:
     """
     Main loop -- home page dispatches to Start, Manage Files, or Settings.
+
+    @argv: Command-line arguments (defaults to sys.argv[1:]).
     """
+    args = _build_parser().parse_args(argv)
+    if args.command == "search":
+        _cli_search(args)
+        return
+    if args.command == "worker":
+        _cli_worker(args)
+        return
+    if args.command == "calibrate":
+        _cli_calibrate(args)
+        return
+    if args.command == "eval":
+        _cli_eval(args)
+        return
+    if args.command == "archive":
+        _cli_archive(args)
+        return
+    if args.command == "stats":
+        _cli_stats(args)
+        return
+    if args.command == "export":
+        _cli_export(args)
+        return
+    if args.command == "live":
+        _cli_live(args)
+        return
+
+    # Interactive TUI only; subcommands and --help never import questionary
+    from src.home import show_home  # pylint: disable=import-outside-toplevel
+    from src.summarizer import load_env, is_available as summarize_available  # pylint: disable=import-outside-toplevel
+    from src.ui import run_setup  # pylint: disable=import-outside-toplevel
+
     DEFAULT_INPUT_DIR.mkdir(parents=True, exist_ok=True)
     DEFAULT_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -0,0 +1,369 @@
+"""
+Compressed transcript archive with random access.
+
+Transcripts and summaries are moved out of the transcript directory into
+append-only pack files (`.archive/pack-NNNNN.zst`). Each file is split on line
+boundaries into blocks of about 64 KiB that are compressed as independent
+zstd frames, and a SQLite index records where every block lives and the first
+timestamp it contains. Reading one transcript decompresses only its own
+blocks; reading a time range decompresses only the blocks that overlap it.
+
+Needs the optional `zstandard` package (`uv sync --extra archive`).
+"""
+
+import os
+import re
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+from typing import IO, Any, Callable, Iterable, Iterator, Optional
+
+from src import config
+
+ARCHIVE_DIR_NAME = ".archive"
+_INDEX_NAME = "index.db"
+_BLOCK_BYTES = 64 * 1024
+_PACK_BYTES = 256 * 1024 * 1024  # start a new pack file beyond this size
+_LEVEL = 10
+
+_LINE_RE = re.compile(r"^\[(\d+):(\d{2}):(\d{2})\.(\d{3})\]")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    name TEXT PRIMARY KEY,
+    pack INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    archived_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS blocks (
+    name TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    start REAL NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    PRIMARY KEY (name, seq)
+);
+"""
+
+
+def _zstd() -> Any:
+    try:
+        import zstandard  # pylint: disable=import-outside-toplevel
+    except ImportError as e:
+        raise RuntimeError("Transcript archive needs the 'zstandard' package (uv sync --extra archive)") from e
+    return zstandard
+
+
+def _archive_dir(directory: Optional[Path]) -> Path:
+    return (directory or config.DEFAULT_OUTPUT_DIR) / ARCHIVE_DIR_NAME
+
+
+def _pack_path(archive_dir: Path, pack: int) -> Path:
+    return archive_dir / f"pack-{pack:05d}.zst"
+
+
+def _open_index(archive_dir: Path, create: bool = False) -> Optional[sqlite3.Connection]:
+    """Open the archive index, or return None if there is no archive and @create is False."""
+    path = archive_dir / _INDEX_NAME
+    if not create and not path.exists():
+        return None
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _line_start(line: str) -> Optional[float]:
+    match = _LINE_RE.match(line)
+    if not match:
+        return None
+    h, m, s, ms = match.groups()
+    return int(h) * 3600 + int(m) * 60 + int(s) + int(ms) / 1000
+
+
+def _split_blocks(text: str) -> list[tuple[float, str]]:
+    """Split @text on line boundaries into (first_timestamp, chunk) blocks of ~_BLOCK_BYTES."""
+    blocks: list[tuple[float, str]] = []
+    lines: list[str] = []
+    size = 0
+    start = last = 0.0
+    for line in text.splitlines(keepends=True):
+        ts = _line_start(line)
+        if ts is not None:
+            last = ts
+        if lines and size >= _BLOCK_BYTES and ts is not None:
+            blocks.append((start, "".join(lines)))
+            lines, size = [], 0
+        if not lines:
+            start = last
+        lines.append(line)
+        size += len(line.encode("utf-8"))
+    if lines or not blocks:
+        blocks.append((start, "".join(lines)))
+    return blocks
+
+
+# ─── Queries ─────────────────────────────────────────────────────────────────
+def list_entries(directory: Optional[Path] = None) -> dict[str, tuple[int, int]]:
+    """
+    List archived files.
+
+    @directory: Transcript directory, defaults to config.DEFAULT_OUTPUT_DIR.
+    @return: {name: (mtime_ns, size)} of the original files.
+    """
+    conn = _open_index(_archive_dir(directory))
+    if conn is None:
+        return {}
+    try:
+        return {name: (mtime_ns, size) for name, mtime_ns, size in conn.execute(
+            "SELECT name, mtime_ns, size FROM entries"
+        )}
+    finally:
+        conn.close()
+
+
+def archived_names(names: Iterable[str], directory: Optional[Path] = None) -> set[str]:
+    """
+    Which of @names are stored in a transcript directory's archive, in one query.
+
+    @names: File names, e.g. one page of a file picker.
+    @directory: Transcript directory, defaults to config.DEFAULT_OUTPUT_DIR.
+    @return: The archived subset of @names.
+    """
+    names = list(names)
+    conn = _open_index(_archive_dir(directory)) if names else None
+    if conn is None:
+        return set()
+    try:
+        placeholders = ", ".join("?" * len(names))
+        return {name for (name,) in conn.execute(
+            f"SELECT name FROM entries WHERE name IN ({placeholders})", names,
+        )}
+    finally:
+        conn.close()
+
+
+def is_archived(path: Path) -> bool:
+    """Whether @path (a file in a transcript directory) is stored in that directory's archive."""
+    conn = _open_index(_archive_dir(path.parent))
+    if conn is None:
+        return False
+    try:
+        return conn.execute("SELECT 1 FROM entries WHERE name = ?", (path.name,)).fetchone() is not None
+    finally:
+        conn.close()
+
+
+def _frames(
+    name: str,
+    directory: Optional[Path],
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+) -> Iterator[bytes]:
+    """Decompress, one at a time, the blocks of @name overlapping [start, end)."""
+    archive_dir = _archive_dir(directory)
+    conn = _open_index(archive_dir)
+    row = conn.execute("SELECT pack FROM entries WHERE name = ?", (name,)).fetchone() if conn else None
+    if row is None:
+        if conn:
+            conn.close()
+        raise FileNotFoundError(f"{name} is not archived")
+    try:
+        sql = "SELECT seq, start, offset, length FROM blocks WHERE name = ?"
+        params: list = [name]
+        if start is not None:
+            # The block containing @start begins at or before it
+            first = conn.execute(
+                "SELECT COALESCE(MAX(seq), 0) FROM blocks WHERE name = ? AND start <= ?", (name, start)
+            ).fetchone()[0]
+            sql += " AND seq >= ?"
+            params.append(first)
+        if end is not None:
+            sql += " AND start < ?"
+            params.append(end)
+        blocks = conn.execute(sql + " ORDER BY seq", params).fetchall()
+    finally:
+        conn.close()
+
+    decompressor = _zstd().ZstdDecompressor()
+    with open(_pack_path(archive_dir, row[0]), "rb") as f:
+        for _, _, offset, length in blocks:
+            f.seek(offset)
+            yield decompressor.decompress(f.read(length))
+
+
+def read_archived(
+    name: str,
+    directory: Optional[Path] = None,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+) -> str:
+    """
+    Read an archived file, or the part of it between two timestamps.
+
+    With @start or @end, only blocks overlapping the range are decompressed and
+    only segments starting in [start, end) are returned.
+
+    @name: File name, e.g. 'meeting.txt'.
+    @directory: Transcript directory, defaults to config.DEFAULT_OUTPUT_DIR.
+    @start: Range start in seconds, or None for the beginning.
+    @end: Range end in seconds, or None for the end.
+    @return: The file's text.
+    """
+    text = b"".join(_frames(name, directory, start, end)).decode("utf-8")
+    if start is None and end is None:
+        return text
+
+    kept: list[str] = []
+    keep = False
+    for line in text.splitlines(keepends=True):
+        ts = _line_start(line)
+        if ts is not None:
+            keep = (start is None or ts >= start) and (end is None or ts < end)
+        if keep:
+            kept.append(line)
+    return "".join(kept)
+
+
+def open_archived(name: str, directory: Optional[Path] = None) -> IO[bytes]:
+    """
+    Decompress an archived file into an anonymous temporary file, one block at a time.
+
+    @name: File name, e.g. 'meeting.txt'.
+    @directory: Transcript directory, defaults to config.DEFAULT_OUTPUT_DIR.
+    @return: Binary file positioned at the start; deleted when closed.
+    """
+    out = tempfile.TemporaryFile()
+    try:
+        for frame in _frames(name, directory):
+            out.write(frame)
+    except BaseException:
+        out.close()
+        raise
+    out.seek(0)
+    return out
+
+
+def read_transcript(path: Path) -> str:
+    """
+    Read a transcript or summary from disk, falling back to its directory's archive.
+
+    @path: Path where the file would be in the transcript directory.
+    @return: The file's text.
+    """
+    try:
+        return path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return read_archived(path.name, path.parent)
+
+
+# ─── Archiving ───────────────────────────────────────────────────────────────
+def _current_pack(conn: sqlite3.Connection, archive_dir: Path) -> int:
+    pack = conn.execute("SELECT COALESCE(MAX(pack), 1) FROM entries").fetchone()[0]
+    path = _pack_path(archive_dir, pack)
+    if path.exists() and path.stat().st_size >= _PACK_BYTES:
+        pack += 1
+    return pack
+
+
+def archive_files(
+    paths: list[Path],
+    directory: Optional[Path] = None,
+    keep: bool = False,
+    on_done: Optional[Callable[[Path], None]] = None,
+) -> int:
+    """
+    Move files into the archive (or refresh their archived copy).
+
+    Each file's blocks are written and fsynced, then indexed, and only then is
+    the original removed, so an interruption never loses a transcript.
+
+    @paths: Files in @directory to archive.
+    @directory: Transcript directory, defaults to config.DEFAULT_OUTPUT_DIR.
+    @keep: Leave the original files in place.
+    @on_done: Called with each path once archived.
+    @return: Number of files archived.
+    """
+    compressor = _zstd().ZstdCompressor(level=_LEVEL)
+    archive_dir = _archive_dir(directory)
+    conn = _open_index(archive_dir, create=True)
+    archived = 0
+    try:
+        pack = _current_pack(conn, archive_dir)
+        for path in paths:
+            st = path.stat()
+            blocks = _split_blocks(path.read_text(encoding="utf-8"))
+            with open(_pack_path(archive_dir, pack), "ab") as f:
+                rows = []
+                for seq, (start, chunk) in enumerate(blocks):
+                    frame = compressor.compress(chunk.encode("utf-8"))
+                    rows.append((path.name, seq, start, f.tell(), len(frame)))
+                    f.write(frame)
+                f.flush()
+                os.fsync(f.fileno())
+                pack_size = f.tell()
+
+            with conn:
+                # A re-archived file replaces its old entry; the old frames become dead space
+                conn.execute("DELETE FROM blocks WHERE name = ?", (path.name,))
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries (name, pack, size, mtime_ns, archived_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (path.name, pack, st.st_size, st.st_mtime_ns, time.time()),
+                )
+                conn.executemany(
+                    "INSERT INTO blocks (name, seq, start, offset, length) VALUES (?, ?, ?, ?, ?)", rows,
+                )
+            if not keep:
+                path.unlink()
+            archived += 1
+            if on_done:
+                on_done(path)
+            if pack_size >= _PACK_BYTES:
+                pack += 1
+    finally:
+        conn.close()
+    return archived
+
+
+def extract_files(names: list[str], directory: Optional[Path] = None) -> int:
+    """
+    Restore archived files to the transcript directory and drop them from the archive.
+
+    @names: File names to restore.
+    @directory: Transcript directory, defaults to config.DEFAULT_OUTPUT_DIR.
+    @return: Number of files restored.
+    """
+    directory = directory or config.DEFAULT_OUTPUT_DIR
+    archived = list_entries(directory)
+    restored = 0
+    for name in names:
+        if name not in archived:
+            continue
+        mtime_ns = archived[name][0]
+        path = directory / name
+        path.write_text(read_archived(name, directory), encoding="utf-8")
+        os.utime(path, ns=(mtime_ns, mtime_ns))  # keeps the search index entry current
+        conn = _open_index(_archive_dir(directory))
+        try:
+            with conn:
+                conn.execute("DELETE FROM blocks WHERE name = ?", (name,))
+                conn.execute("DELETE FROM entries WHERE name = ?", (name,))
+        finally:
+            conn.close()
+        restored += 1
+    return restored
+
+
+def archive_candidates(directory: Optional[Path] = None, older_than_days: float = 0.0) -> list[Path]:
+    """Transcripts and summaries in @directory not modified for @older_than_days days."""
+    directory = directory or config.DEFAULT_OUTPUT_DIR
+    cutoff = time.time() - older_than_days * 86400
+    if not directory.exists():
+        return []
+    return sorted(
+        (p for p in directory.glob("*.txt") if p.stat().st_mtime <= cutoff),
+        key=lambda p: p.name.lower(),
+    )
@@ -0,0 +1,101 @@
+"""
+Audio decoding helpers built on ffmpeg-python.
+"""
+
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Optional
+
+from src.cache import load_cache, save_cache
+
+SAMPLE_RATE = 16000
+_PROBE_TIMEOUT = 30.0  # seconds; a corrupt file must not hang the queue before it starts
+
+
+def load_audio_window(path: Path, offset: float = 0.0, duration: float = 30.0) -> Any:
+    """
+    Decode only part of an audio file to a mono 16 kHz float32 waveform.
+
+    ffmpeg seeks and stops early, so the cost depends on @duration rather than
+    the length of the recording.
+
+    @path: Audio file to decode.
+    @offset: Start position in seconds.
+    @duration: Maximum number of seconds to decode.
+    @return: 1-D numpy float32 array in [-1, 1].
+    """
+    import ffmpeg  # pylint: disable=import-outside-toplevel
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    try:
+        out, _ = (
+            ffmpeg.input(str(path), ss=offset, t=duration, threads=0)
+            .output("-", format="s16le", acodec="pcm_s16le", ac=1, ar=SAMPLE_RATE)
+            .run(cmd=["ffmpeg", "-nostdin"], capture_stdout=True, capture_stderr=True)
+        )
+    except ffmpeg.Error as e:
+        raise RuntimeError(f"Failed to decode audio: {e.stderr.decode(errors='replace').strip()}") from e
+
+    return np.frombuffer(out, np.int16).astype(np.float32) / 32768.0
+
+
+def probe_duration(path: Path) -> Optional[float]:
+    """
+    Return the duration of an audio file in seconds using ffprobe.
+
+    @path: Audio file to inspect.
+    @return: Duration in seconds, or None if ffprobe cannot determine it.
+    """
+    import ffmpeg  # pylint: disable=import-outside-toplevel
+
+    try:
+        info = ffmpeg.probe(str(path), timeout=_PROBE_TIMEOUT)
+    except (ffmpeg.Error, OSError, subprocess.TimeoutExpired):
+        return None
+
+    duration = info.get("format", {}).get("duration")
+    if duration is None:
+        durations = [s.get("duration") for s in info.get("streams", []) if s.get("duration")]
+        duration = max(durations, key=float) if durations else None
+    try:
+        return float(duration) if duration is not None else None
+    except ValueError:
+        return None
+
+
+def probe_durations(files: list[Path], max_workers: int = 8) -> dict[Path, float]:
+    """
+    Probe durations for many files, cached per path, size, and mtime.
+
+    ffprobe runs concurrently for uncached files since each call is mostly
+    process startup and I/O wait.
+
+    @files: Audio files to inspect.
+    @max_workers: Maximum concurrent ffprobe processes.
+    @return: Mapping of file to duration in seconds (unprobeable files omitted).
+    """
+    cache = load_cache("durations")
+    durations: dict[Path, float] = {}
+    missing: dict[Path, str] = {}
+
+    for f in files:
+        try:
+            st = f.stat()
+        except OSError:
+            continue
+        key = f"{f.resolve()}:{st.st_size}:{st.st_mtime_ns}"
+        if key in cache:
+            durations[f] = cache[key]
+        else:
+            missing[f] = key
+
+    if missing:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for f, duration in zip(missing, pool.map(probe_duration, missing)):
+                if duration is not None:
+                    durations[f] = duration
+                    cache[missing[f]] = duration
+        save_cache("durations", cache)
+
+    return durations
@@ -0,0 +1,198 @@
+"""
+Combined transcribe + translate that runs the audio encoder once per window.
+
+Two model.transcribe() calls (one per task) encode every 30-second window twice.
+Here each 30-second window is encoded once and both decoder tasks run against
+the cached encoder output. Like Whisper, the next window starts at the last
+complete segment rather than a full 30 seconds later, here the earlier of the
+two tasks' cut points so neither loses speech at a window edge.
+"""
+
+from pathlib import Path
+from typing import Any, Optional
+
+from src.config import (
+    COMPRESSION_RATIO_THRESHOLD,
+    LOGPROB_THRESHOLD,
+    NO_SPEECH_THRESHOLD,
+    WHISPER_TEMPERATURES,
+)
+
+_TIME_PRECISION = 0.02  # seconds per timestamp token
+_MAX_PROMPT_TOKENS = 223
+
+
+def _is_silence(result: Any) -> bool:
+    """Whisper's no-speech rule: likely silence and a poor log-probability."""
+    return result.no_speech_prob > NO_SPEECH_THRESHOLD and result.avg_logprob < LOGPROB_THRESHOLD
+
+
+def _decode_with_fallback(
+    model: Any, features: Any, task: str, language: str, prompt: list[int], fp16: bool, decoding: dict,
+) -> Any:
+    """Decode one encoded window, retrying at higher temperatures like Whisper does."""
+    from whisper.decoding import DecodingOptions  # pylint: disable=import-outside-toplevel
+
+    result = None
+    for temperature in decoding.get("temperature", WHISPER_TEMPERATURES):
+        options = DecodingOptions(
+            task=task,
+            language=language,
+            temperature=temperature,
+            prompt=prompt or None,
+            fp16=fp16,
+            # Like Whisper: beam search for the greedy pass, sampling for fallbacks
+            beam_size=decoding.get("beam_size") if temperature == 0 else None,
+            best_of=decoding.get("best_of") if temperature > 0 else None,
+        )
+        result = model.decode(features, options)[0]
+
+        needs_fallback = (
+            result.compression_ratio > COMPRESSION_RATIO_THRESHOLD
+            or result.avg_logprob < LOGPROB_THRESHOLD
+        )
+        if _is_silence(result):
+            needs_fallback = False  # silence; nothing better to find
+        if not needs_fallback:
+            break
+    return result
+
+
+def _consumed(tokenizer: Any, result: Any, window: float) -> float:
+    """
+    Seconds of a decoded window covered by complete segments, as whisper.transcribe() seeks.
+
+    A window ending on a single timestamp, or without consecutive timestamp
+    pairs, is consumed whole; otherwise the text after the last pair was cut
+    off mid-segment and is decoded again from the next window.
+    """
+    tokens = result.tokens
+    is_timestamp = [t >= tokenizer.timestamp_begin for t in tokens]
+    if is_timestamp[-2:] == [False, True]:
+        return window
+    pairs = [i for i in range(1, len(tokens)) if is_timestamp[i - 1] and is_timestamp[i]]
+    if not pairs:
+        return window
+    end = (tokens[pairs[-1] - 1] - tokenizer.timestamp_begin) * _TIME_PRECISION
+    return end if end > 0 else window
+
+
+def _split_segments(tokenizer: Any, result: Any, offset: float, window: float) -> list[dict]:
+    """Split a decoded window into segments at its timestamp tokens."""
+    segments: list[dict] = []
+    start: Optional[float] = None
+    text_tokens: list[int] = []
+
+    def _close(end: float) -> None:
+        segments.append({
+            "start": offset + (start or 0.0),
+            "end": offset + max(end, start or 0.0),
+            "text": tokenizer.decode(text_tokens),
+            "tokens": list(text_tokens),
+            "temperature": result.temperature,
+            "avg_logprob": result.avg_logprob,
+            "compression_ratio": result.compression_ratio,
+            "no_speech_prob": result.no_speech_prob,
+        })
+
+    for token in result.tokens:
+        if token >= tokenizer.timestamp_begin:
+            timestamp = (token - tokenizer.timestamp_begin) * _TIME_PRECISION
+            if text_tokens:
+                _close(timestamp)
+                text_tokens = []
+                start = None
+            else:
+                start = timestamp
+        elif token < tokenizer.eot:
+            text_tokens.append(token)
+
+    if text_tokens:
+        _close(window)
+    return segments
+
+
+def transcribe_and_translate(
+    model: Any,
+    input_path: Path,
+    language: Optional[str],
+    decoding: Optional[dict] = None,
+) -> tuple[dict, dict]:
+    """
+    Produce the original-language transcript and the English translation in one pass.
+
+    @model: Loaded Whisper model instance.
+    @input_path: Path to input audio file.
+    @language: Language of audio, or None to detect from the first window.
+    @decoding: Decode preset options (see config.DECODE_PRESETS); default is
+        greedy with Whisper's full temperature fallback.
+    @return: (transcribe_result, translate_result), each a Whisper-style dict
+        with 'text', 'segments', and 'language'.
+    """
+    import torch  # pylint: disable=import-outside-toplevel
+    import whisper  # pylint: disable=import-outside-toplevel
+    from whisper.audio import HOP_LENGTH, N_FRAMES, N_SAMPLES, SAMPLE_RATE  # pylint: disable=import-outside-toplevel
+    from whisper.tokenizer import get_tokenizer  # pylint: disable=import-outside-toplevel
+
+    audio = whisper.load_audio(str(input_path))
+    mel = whisper.log_mel_spectrogram(audio, model.dims.n_mels, padding=N_SAMPLES)
+    content_frames = mel.shape[-1] - N_FRAMES
+    frames_per_second = SAMPLE_RATE / HOP_LENGTH
+
+    fp16 = model.device.type == "cuda"
+    dtype = torch.float16 if fp16 else torch.float32
+    tokenizer = get_tokenizer(model.is_multilingual, num_languages=model.num_languages)
+
+    decoding = decoding or {}
+    condition = decoding.get("condition_on_previous_text", True)
+    tasks = ("transcribe", "translate")
+    segments: dict[str, list[dict]] = {t: [] for t in tasks}
+    prompts: dict[str, list[int]] = {t: [] for t in tasks}
+
+    seek = 0
+    with torch.no_grad():
+        while seek < max(content_frames, 1):
+            frames = min(N_FRAMES, content_frames - seek)
+            window = whisper.pad_or_trim(mel[:, seek:seek + frames], N_FRAMES)
+            features = model.embed_audio(window.to(model.device).to(dtype).unsqueeze(0))
+
+            if language is None:
+                _, probs = model.detect_language(features)
+                language = max(probs[0], key=probs[0].get)
+
+            offset = seek / frames_per_second
+            duration = frames / frames_per_second
+            decoded = {
+                task: _decode_with_fallback(model, features, task, language, prompts[task], fp16, decoding)
+                for task in tasks
+            }
+            # Both tasks share the encoded window, so they resume together at the
+            # earlier cut; a segment the other task completed past it is kept
+            cut = min(
+                duration if _is_silence(result) else _consumed(tokenizer, result, duration)
+                for result in decoded.values()
+            )
+            for task, result in decoded.items():
+                if _is_silence(result):
+                    continue
+                new = [
+                    s for s in _split_segments(tokenizer, result, offset, duration)
+                    if s["start"] - offset < cut - _TIME_PRECISION / 2
+                ]
+                segments[task].extend(new)
+                if condition and result.temperature <= 0.5:
+                    prompts[task] = (prompts[task] + [t for s in new for t in s["tokens"]])[-_MAX_PROMPT_TOKENS:]
+                else:
+                    prompts[task] = []
+            seek += max(1, min(frames, round(cut * frames_per_second)))
+
+    results = []
+    for task in tasks:
+        for i, segment in enumerate(segments[task]):
+            segment["id"] = i
+        results.append({
+            "text": "".join(s["text"] for s in segments[task]),
+            "segments": segments[task],
+            "language": language,
+        })
+    return results[0], results[1]
@@ -0,0 +1,50 @@
+"""
+Small persistent JSON caches stored under config.CACHE_DIR.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from src import config
+
+def file_key(path: Path) -> str:
+    """
+    Return a key for facts cached about one audio file.
+
+    The key covers the file's resolved path, size and modification time, so it
+    changes whenever the file is replaced or edited. Content samples are not
+    enough: fixed-length recordings with silence at both ends share their size
+    and their first and last bytes.
+
+    @path: Audio file.
+    @return: Hex digest.
+    """
+    st = path.stat()
+    ident = f"{path.resolve()}\0{st.st_size}\0{st.st_mtime_ns}"
+    return hashlib.blake2b(ident.encode("utf-8", "surrogateescape"), digest_size=16).hexdigest()
+
+
+def _cache_path(name: str) -> Path:
+    return config.CACHE_DIR / f"{name}.json"
+
+
+def load_cache(name: str) -> dict:
+    """Read a named cache, returning an empty dict if missing or unreadable."""
+    try:
+        with open(_cache_path(name), encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except Exception:  # pylint: disable=broad-exception-caught
+        return {}
+
+
+def save_cache(name: str, data: dict) -> None:
+    """Atomically write a named cache."""
+    path = _cache_path(name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
@@ -0,0 +1,308 @@
+"""
+Hardware calibration: benchmark this host and pick model, device and parallelism.
+
+Starting from the smallest model meeting the accuracy tier, each larger size is
+benchmarked in turn until one cannot keep up with the real-time target; the
+largest size that did is chosen, with its fastest worker/thread layout.
+
+Each configuration runs in a fresh subprocess (`python -m src.calibrate ...`)
+so its peak memory is measured in isolation. The benchmark decodes a synthetic
+30-second window with end-of-text suppressed, so every run does the same work
+(one encoder pass plus a fixed number of decoder steps, about as many tokens as
+a window of ordinary speech) regardless of what the audio contains.
+"""
+
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Optional
+
+from src import config
+from src.memory import peak_rss_mb, unique_rss_mb
+
+_WINDOW_SECONDS = 30.0
+_BENCH_TOKENS = 100
+_RAM_BUDGET = 0.8   # fraction of total RAM a configuration may use
+_VRAM_BUDGET = 0.9  # fraction of total VRAM
+_RUN_TIMEOUT = 1800.0
+
+
+# ─── Host information ────────────────────────────────────────────────────────
+def _total_ram_mb() -> Optional[float]:
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") / (1024 * 1024)
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def _cpu_name() -> str:
+    try:
+        with open("/proc/cpuinfo", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or platform.machine()
+
+
+def host_info() -> dict:
+    """Describe the CPU, RAM and GPU of this host."""
+    import torch  # pylint: disable=import-outside-toplevel
+
+    info: dict = {
+        "cpu": _cpu_name(),
+        "cpu_count": os.cpu_count() or 1,
+        "ram_mb": round(_total_ram_mb() or 0),
+        "gpu": None,
+        "vram_mb": None,
+    }
+    if torch.cuda.is_available():
+        props = torch.cuda.get_device_properties(0)
+        info["gpu"] = props.name
+        info["vram_mb"] = round(props.total_memory / (1024 * 1024))
+    return info
+
+
+# ─── Benchmark (runs in a subprocess) ────────────────────────────────────────
+def _synthetic_audio() -> Any:
+    """A deterministic 30-second 16 kHz waveform: harmonic tones plus noise."""
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    rng = np.random.default_rng(0)
+    t = np.arange(int(_WINDOW_SECONDS * 16000)) / 16000
+    tone = sum(np.sin(2 * np.pi * f * t * (1 + 0.05 * np.sin(t))) for f in (180, 360, 720))
+    return (0.05 * tone + 0.02 * rng.standard_normal(t.size)).astype(np.float32)
+
+
+def _timed_windows(model: Any, windows: int) -> float:
+    """Decode one warm-up window, then time @windows more; returns seconds."""
+    import whisper  # pylint: disable=import-outside-toplevel
+    from whisper.decoding import DecodingOptions  # pylint: disable=import-outside-toplevel
+    from whisper.tokenizer import get_tokenizer  # pylint: disable=import-outside-toplevel
+
+    tokenizer = get_tokenizer(model.is_multilingual, num_languages=model.num_languages)
+    mel = whisper.log_mel_spectrogram(_synthetic_audio(), model.dims.n_mels).to(model.device)
+    options = DecodingOptions(
+        language="en" if model.is_multilingual else None,
+        without_timestamps=True,
+        sample_len=_BENCH_TOKENS,
+        suppress_tokens=[-1, tokenizer.eot],
+        fp16=model.device.type == "cuda",
+    )
+
+    model.decode(mel, options)
+    start = time.perf_counter()
+    for _ in range(windows):
+        model.decode(mel, options)
+    if model.device.type == "cuda":
+        import torch  # pylint: disable=import-outside-toplevel
+        torch.cuda.synchronize()
+    return time.perf_counter() - start
+
+
+def _forked_worker(model: Any, threads: int, windows: int, barrier: Any, conn: Any) -> None:
+    import torch  # pylint: disable=import-outside-toplevel
+
+    torch.set_num_threads(threads)
+    with torch.inference_mode():
+        _timed_windows(model, 0)  # warm-up only
+        barrier.wait()
+        elapsed = _timed_windows(model, windows)
+    conn.send((elapsed, unique_rss_mb()))
+    conn.close()
+
+
+def run_benchmark(model_size: str, device: str, workers: int, threads: int, windows: int) -> dict:
+    """
+    Measure one configuration in the current process.
+
+    @model_size: Whisper model size.
+    @device: 'cpu' or 'cuda'.
+    @workers: Concurrent forked workers sharing the model (CPU only).
+    @threads: Torch threads per worker.
+    @windows: Timed 30-second windows per worker.
+    @return: Dict with 'rtf' (wall seconds per audio second, all workers
+        combined), 'peak_mb' (RAM) and 'vram_mb'.
+    """
+    import multiprocessing  # pylint: disable=import-outside-toplevel
+    import torch  # pylint: disable=import-outside-toplevel
+    from src.transcriber import _load_whisper  # pylint: disable=import-outside-toplevel
+    from src.workers import _share_weights  # pylint: disable=import-outside-toplevel
+
+    torch.set_num_threads(threads)
+    model = _load_whisper(model_size, device)
+
+    if workers == 1:
+        with torch.inference_mode():
+            elapsed = _timed_windows(model, windows)
+        peak = peak_rss_mb()
+    else:
+        _share_weights(model)
+        ctx = multiprocessing.get_context("fork")
+        barrier = ctx.Barrier(workers + 1)
+        conns, procs = [], []
+        for _ in range(workers):
+            parent_conn, child_conn = ctx.Pipe()
+            proc = ctx.Process(target=_forked_worker, args=(model, threads, windows, barrier, child_conn))
+            proc.start()
+            child_conn.close()
+            conns.append(parent_conn)
+            procs.append(proc)
+        barrier.wait()
+        start = time.perf_counter()
+        reports = [conn.recv() for conn in conns]
+        elapsed = time.perf_counter() - start
+        for proc in procs:
+            proc.join()
+        peak = peak_rss_mb() + sum(uss or 0.0 for _, uss in reports)
+
+    vram = None
+    if device == "cuda":
+        vram = torch.cuda.max_memory_allocated() / (1024 * 1024)
+
+    return {
+        "rtf": elapsed / (workers * windows * _WINDOW_SECONDS),
+        "peak_mb": round(peak),
+        "vram_mb": round(vram) if vram is not None else None,
+    }
+
+
+# ─── Calibration driver ──────────────────────────────────────────────────────
+def _plan(device: str, cpu_count: int) -> list[tuple[int, int]]:
+    """(workers, threads) combinations to try on @device."""
+    if device == "cuda":
+        return [(1, cpu_count)]
+    plan: list[tuple[int, int]] = []
+    workers = 1
+    while workers <= cpu_count:
+        # All logical cores, and half of them (one per physical core with SMT)
+        for threads in sorted({max(1, cpu_count // workers), max(1, cpu_count // (2 * workers))}, reverse=True):
+            plan.append((workers, threads))
+        workers *= 2
+    return plan
+
+
+def _run_isolated(model_size: str, device: str, workers: int, threads: int, windows: int) -> dict:
+    """Run one benchmark in a fresh interpreter and return its measurements."""
+    proc = subprocess.run(
+        [sys.executable, "-m", "src.calibrate", model_size, device, str(workers), str(threads), str(windows)],
+        cwd=config.ROOT, capture_output=True, text=True, timeout=_RUN_TIMEOUT, check=False,
+    )
+    lines = proc.stdout.strip().splitlines()
+    if proc.returncode != 0 or not lines:
+        error = (proc.stderr.strip().splitlines() or [f"exit code {proc.returncode}"])[-1]
+        raise RuntimeError(error)
+    return json.loads(lines[-1])
+
+
+def _choose(results: list[dict], target_rtf: float) -> Optional[dict]:
+    """
+    Pick the configuration to use from benchmark @results.
+
+    The largest model with a configuration that fits in memory and meets
+    @target_rtf wins, in its fastest configuration; when none meets the
+    target, the fastest fitting configuration of any size.
+    """
+    fitting = [r for r in results if r["fits"]]
+    fast = [r for r in fitting if r["rtf"] <= target_rtf]
+    if fast:
+        largest = max(config.MODEL_SIZES.index(r["model"]) for r in fast)
+        fast = [r for r in fast if config.MODEL_SIZES.index(r["model"]) == largest]
+        return min(fast, key=lambda r: r["rtf"])
+    return min(fitting, key=lambda r: r["rtf"]) if fitting else None
+
+
+def calibrate(
+    tier: str,
+    sizes: Optional[list[str]] = None,
+    device: Optional[str] = None,
+    windows: int = 3,
+    on_result: Optional[Callable[[dict], None]] = None,
+    target_rtf: float = config.CALIBRATE_TARGET_RTF,
+) -> dict:
+    """
+    Benchmark candidate model sizes and layouts and choose the best that fits in memory.
+
+    @tier: Key of config.ACCURACY_TIERS. The smallest model meeting it is
+        benchmarked first, then each larger size until one misses @target_rtf.
+    @sizes: Model sizes to benchmark instead, all of them (each must meet @tier).
+    @device: 'cpu' or 'cuda', default CUDA when available else CPU.
+    @windows: Timed 30-second windows per worker per configuration.
+    @on_result: Called with each measurement as it completes.
+    @target_rtf: Real-time factor a model size must reach (at its fastest
+        fitting configuration) to be chosen over a smaller one.
+    @return: Machine profile dict with 'host', 'tier', 'target_rtf', 'results'
+        and 'best' (None if nothing fitted).
+    """
+    host = host_info()
+    device = device or ("cuda" if host["gpu"] else "cpu")
+    floor = config.MODEL_SIZES.index(config.ACCURACY_TIERS[tier])
+    explicit = bool(sizes)
+    sizes = sorted(
+        (s for s in (sizes or config.MODEL_SIZES) if config.MODEL_SIZES.index(s) >= floor),
+        key=config.MODEL_SIZES.index,
+    )
+
+    ram_budget = host["ram_mb"] * _RAM_BUDGET if host["ram_mb"] else float("inf")
+    vram_budget = host["vram_mb"] * _VRAM_BUDGET if host["vram_mb"] else float("inf")
+
+    results: list[dict] = []
+    for size in sizes:
+        best_rtf = float("inf")
+        for workers, threads in _plan(device, host["cpu_count"]):
+            entry = {"model": size, "device": device, "workers": workers, "threads": threads}
+            try:
+                entry.update(_run_isolated(size, device, workers, threads, windows))
+                entry["fits"] = entry["peak_mb"] <= ram_budget and (entry["vram_mb"] or 0) <= vram_budget
+            except (RuntimeError, subprocess.TimeoutExpired, ValueError) as e:
+                entry.update({"rtf": None, "peak_mb": None, "vram_mb": None, "fits": False, "error": str(e)})
+            results.append(entry)
+            if on_result:
+                on_result(entry)
+
+            # More workers will not help once throughput stops improving or memory runs out
+            if not entry["fits"]:
+                break
+            if threads == max(1, host["cpu_count"] // workers):
+                if entry["rtf"] > best_rtf * 0.95:
+                    break
+                best_rtf = min(best_rtf, entry["rtf"])
+
+        # Larger models are slower still, so stop at the first size too slow
+        if not explicit and not any(
+            r["fits"] and r["rtf"] <= target_rtf for r in results if r["model"] == size
+        ):
+            break
+
+    return {
+        "calibrated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "host": host,
+        "tier": tier,
+        "target_rtf": target_rtf,
+        "bench_tokens_per_window": _BENCH_TOKENS,
+        "results": results,
+        "best": _choose(results, target_rtf),
+    }
+
+
+def apply_profile(profile: dict) -> None:
+    """Write the profile's best configuration and measurements into config.yaml."""
+    best = profile["best"]
+    updates: dict = {"machine_profile": profile}
+    if best is not None:
+        updates.update({
+            "model_size": best["model"],
+            "device": best["device"],
+            "workers": best["workers"],
+            "threads": best["threads"] if best["device"] == "cpu" else 0,
+        })
+    config.save_config(updates)
+
+
+if __name__ == "__main__":
+    _size, _device, _workers, _threads, _windows = sys.argv[1:6]
+    print(json.dumps(run_benchmark(_size, _device, int(_workers), int(_threads), int(_windows))))
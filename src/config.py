@@ -1,19 +1,26 @@
 # src/config.py
 
+import json
+import os
 from pathlib import Path
 
-import yaml
-
 # ─── Fixed paths (not user-configurable) ─────────────────────────────────────
 ROOT: Path = Path(__file__).resolve().parent.parent
 DEFAULT_INPUT_DIR: Path = ROOT / "audio"
 DEFAULT_OUTPUT_DIR: Path = ROOT / "transcripts"
 CONFIG_PATH: Path = ROOT / "config.yaml"
+CACHE_DIR: Path = ROOT / ".cache"
+SEARCH_INDEX_PATH: Path = CACHE_DIR / "search.db"
+FINGERPRINT_INDEX_PATH: Path = CACHE_DIR / "fingerprints.db"
+# config.yaml as parsed on a previous run, reused while the file is unchanged
+CONFIG_CACHE_PATH: Path = CACHE_DIR / "config.json"
 
 # ─── Structural constants (not user-configurable) ────────────────────────────
 MODEL_SIZES: list[str] = ["tiny", "base", "small", "medium", "large"]
+TIERED_MODEL: str = "tiered"
 AUTO_DETECT: str = "Auto (detect)"
-TASKS: list[str] = ["transcribe", "translate"]
+DUAL_TASK: str = "transcribe + translate"
+TASKS: list[str] = ["transcribe", "translate", DUAL_TASK]
 SUMMARY_TASKS: list[str] = ["transcribe + summarize", "translate + summarize"]
 STANDALONE_SUMMARY_TASK: str = "summarize"
 SUMMARY_STYLES: list[str] = ["Concise summary", "Bullet points"]
@@ -21,6 +28,47 @@ SUMMARY_STYLE_MAP: dict[str, str] = {
     "Concise summary": "concise",
     "Bullet points": "bullet_points",
 }
+OUTPUT_FORMAT_CHOICES: list[str] = ["txt", "json", "srt", "vtt", "tsv"]
+SUMMARIZER_BACKENDS: list[str] = ["gemini", "extractive"]
+DEVICES: list[str] = ["auto", "cpu", "cuda"]
+# Whisper's default temperature fallback schedule, and the thresholds past which
+# it retries a window at the next temperature or treats it as silence
+WHISPER_TEMPERATURES: tuple[float, ...] = (0.0, 0.2, 0.4, 0.6, 0.8, 1.0)
+COMPRESSION_RATIO_THRESHOLD: float = 2.4
+LOGPROB_THRESHOLD: float = -1.0
+NO_SPEECH_THRESHOLD: float = 0.6
+# Whisper decoding presets: beam search width, samples per fallback temperature,
+# the temperature fallback schedule, and conditioning on the previous window
+DECODE_PRESETS: dict[str, dict] = {
+    "fast": {
+        "beam_size": None,
+        "best_of": None,
+        "temperature": [0.0, 0.5],
+        "condition_on_previous_text": False,
+    },
+    "balanced": {
+        "beam_size": None,
+        "best_of": None,
+        "temperature": list(WHISPER_TEMPERATURES),
+        "condition_on_previous_text": True,
+    },
+    "accurate": {
+        "beam_size": 5,
+        "best_of": 5,
+        "temperature": list(WHISPER_TEMPERATURES),
+        "condition_on_previous_text": True,
+    },
+}
+# `transcriber calibrate`: real-time factor a larger model must reach to be chosen
+CALIBRATE_TARGET_RTF: float = 1.0
+# `transcriber calibrate --tier`: smallest model size meeting each accuracy tier
+ACCURACY_TIERS: dict[str, str] = {
+    "draft": "tiny",
+    "basic": "base",
+    "standard": "small",
+    "high": "medium",
+    "max": "large",
+}
 
 # ─── Defaults (used when config.yaml is missing or has invalid values) ───────
 _DEFAULTS: dict = {
@@ -28,19 +76,58 @@ _DEFAULTS: dict = {
     "language": "auto",
     "task": "transcribe",
     "summary_style": "concise",
+    "decode_preset": "balanced",
     "gemini_model": "gemini-3.1-flash-lite-preview",
+    "summarizer_backend": "gemini",
+    "summary_pack_tokens": 0,
     "languages": [
         "English", "Japanese", "Chinese", "Korean", "Spanish", "French",
         "German", "Portuguese", "Italian", "Dutch", "Russian", "Arabic",
         "Hindi", "Turkish", "Vietnamese", "Thai", "Indonesian",
     ],
     "file_extensions": [".m4a", ".mp3", ".wav", ".flac", ".ogg", ".aac", ".opus", ".webm"],
+    "output_formats": ["txt"],
+    "word_timestamps": False,
+    "language_prepass": False,
+    "preload_model": True,
+    "mmap_weights": False,
+    "device": "auto",
+    "workers": 1,
+    "threads": 0,
+    "lease_ttl": 120,
+    "lease_max_attempts": 3,
+    "segment_store": True,
+    "dedup": False,
+    "repetition_guard": {
+        "enabled": True,
+        "max_compression_ratio": 3.0,
+    },
+    "watchdog": {
+        "enabled": False,
+        "base_seconds": 300,
+        "realtime_factor": 4.0,
+    },
+    "memory_guard": {
+        "enabled": True,
+        "reserve_mb": 1024,
+        "chunk_seconds": 600,
+        "fallback_model": "base",
+    },
+    "tiered": {
+        "draft_model": "tiny",
+        "refine_model": "medium",
+        "logprob_threshold": LOGPROB_THRESHOLD,
+        "no_speech_threshold": NO_SPEECH_THRESHOLD,
+        "compression_ratio_threshold": COMPRESSION_RATIO_THRESHOLD,
+    },
 }
 
 
 def _load_yaml() -> dict:
     """Read config.yaml, returning empty dict on any error."""
     try:
+        import yaml  # pylint: disable=import-outside-toplevel
+
         with open(CONFIG_PATH, encoding="utf-8") as f:
             data = yaml.safe_load(f)
         return data if isinstance(data, dict) else {}
@@ -48,12 +135,44 @@ def _load_yaml() -> dict:
         return {}
 
 
+def _load_cached() -> dict:
+    """
+    Read config.yaml through a JSON cache keyed by its mtime and size.
+
+    Importing PyYAML and parsing the file dominate start-up for short commands;
+    the JSON copy is only rewritten when config.yaml changes.
+    """
+    try:
+        st = CONFIG_PATH.stat()
+    except OSError:
+        return {}
+    stamp = [st.st_mtime_ns, st.st_size]
+    try:
+        with open(CONFIG_CACHE_PATH, encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached["stamp"] == stamp and isinstance(cached["config"], dict):
+            return cached["config"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    data = _load_yaml()
+    try:
+        payload = json.dumps({"stamp": stamp, "config": data})
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = CONFIG_CACHE_PATH.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(payload, encoding="utf-8")
+        os.replace(tmp, CONFIG_CACHE_PATH)
+    except (OSError, TypeError, ValueError):
+        pass  # not JSON-representable or not writable: parse again next time
+    return data
+
+
 # Module-level config: defaults merged with user YAML
-_cfg: dict = {**_DEFAULTS, **_load_yaml()}
+_cfg: dict = {**_DEFAULTS, **_load_cached()}
 
 # ─── Derived values (read from _cfg with validation) ─────────────────────────
 _ms = _cfg.get("model_size", _DEFAULTS["model_size"])
-DEFAULT_MODEL_SIZE: str = _ms if _ms in MODEL_SIZES else _DEFAULTS["model_size"]
+DEFAULT_MODEL_SIZE: str = _ms if _ms in MODEL_SIZES + [TIERED_MODEL] else _DEFAULTS["model_size"]
 
 LANGUAGES: list[str] = _cfg.get("languages", _DEFAULTS["languages"])
 LANGUAGE_MAP: dict[str, str] = {name: name.lower() for name in LANGUAGES}
@@ -68,10 +187,78 @@ _style = _cfg.get("summary_style", _DEFAULTS["summary_style"])
 _REVERSE_STYLE_MAP: dict[str, str] = {v: k for k, v in SUMMARY_STYLE_MAP.items()}
 DEFAULT_SUMMARY_STYLE: str = _REVERSE_STYLE_MAP.get(_style, "Concise summary")
 
+_preset = _cfg.get("decode_preset", _DEFAULTS["decode_preset"])
+DECODE_PRESET: str = _preset if _preset in DECODE_PRESETS else _DEFAULTS["decode_preset"]
+
 FILE_EXTENSIONS: list[str] = _cfg.get("file_extensions", _DEFAULTS["file_extensions"])
 
 GEMINI_MODEL: str = _cfg.get("gemini_model", _DEFAULTS["gemini_model"])
 
+_backend = _cfg.get("summarizer_backend", _DEFAULTS["summarizer_backend"])
+SUMMARIZER_BACKEND: str = _backend if _backend in SUMMARIZER_BACKENDS else _DEFAULTS["summarizer_backend"]
+
+_pack = _cfg.get("summary_pack_tokens", _DEFAULTS["summary_pack_tokens"])
+SUMMARY_PACK_TOKENS: int = _pack if isinstance(_pack, int) and _pack >= 0 else _DEFAULTS["summary_pack_tokens"]
+
+# The .txt transcript is always written; other formats are added alongside it
+_formats = _cfg.get("output_formats", _DEFAULTS["output_formats"])
+_formats = _formats if isinstance(_formats, list) else _DEFAULTS["output_formats"]
+OUTPUT_FORMATS: list[str] = ["txt"] + [
+    f for f in OUTPUT_FORMAT_CHOICES if f != "txt" and f in _formats
+]
+
+WORD_TIMESTAMPS: bool = bool(_cfg.get("word_timestamps", _DEFAULTS["word_timestamps"]))
+
+LANGUAGE_PREPASS: bool = bool(_cfg.get("language_prepass", _DEFAULTS["language_prepass"]))
+
+PRELOAD_MODEL: bool = bool(_cfg.get("preload_model", _DEFAULTS["preload_model"]))
+
+MMAP_WEIGHTS: bool = bool(_cfg.get("mmap_weights", _DEFAULTS["mmap_weights"]))
+
+_workers = _cfg.get("workers", _DEFAULTS["workers"])
+WORKERS: int = _workers if isinstance(_workers, int) and _workers >= 1 else _DEFAULTS["workers"]
+
+_device = _cfg.get("device", _DEFAULTS["device"])
+DEVICE: str = _device if _device in DEVICES else _DEFAULTS["device"]
+
+# Torch threads per process; 0 splits the CPU cores evenly across workers
+_threads = _cfg.get("threads", _DEFAULTS["threads"])
+THREADS: int = _threads if isinstance(_threads, int) and _threads >= 0 else _DEFAULTS["threads"]
+
+LEASE_TTL: float = float(_cfg.get("lease_ttl", _DEFAULTS["lease_ttl"]))
+
+_attempts = _cfg.get("lease_max_attempts", _DEFAULTS["lease_max_attempts"])
+LEASE_MAX_ATTEMPTS: int = (
+    _attempts if isinstance(_attempts, int) and _attempts >= 1 else _DEFAULTS["lease_max_attempts"]
+)
+
+SEGMENT_STORE: bool = bool(_cfg.get("segment_store", _DEFAULTS["segment_store"]))
+
+DEDUP: bool = bool(_cfg.get("dedup", _DEFAULTS["dedup"]))
+
+# Skip windows where Whisper loops on a repeated phrase
+_guard = _cfg.get("repetition_guard", {})
+REPETITION_GUARD: dict = {**_DEFAULTS["repetition_guard"], **(_guard if isinstance(_guard, dict) else {})}
+
+# Per-file timeout: base_seconds + realtime_factor × audio duration
+_watchdog = _cfg.get("watchdog", {})
+WATCHDOG: dict = {**_DEFAULTS["watchdog"], **(_watchdog if isinstance(_watchdog, dict) else {})}
+
+# Fit batches into available memory: fewer workers, then chunking, then fallback_model
+_memory_guard = _cfg.get("memory_guard", {})
+MEMORY_GUARD: dict = {
+    **_DEFAULTS["memory_guard"], **(_memory_guard if isinstance(_memory_guard, dict) else {})
+}
+if MEMORY_GUARD["fallback_model"] not in MODEL_SIZES:
+    MEMORY_GUARD["fallback_model"] = None
+
+# Tiered mode: draft everything with a small model, re-decode low-confidence segments
+_tiered = _cfg.get("tiered", {})
+TIERED: dict = {**_DEFAULTS["tiered"], **(_tiered if isinstance(_tiered, dict) else {})}
+for _key in ("draft_model", "refine_model"):
+    if TIERED[_key] not in MODEL_SIZES:
+        TIERED[_key] = _DEFAULTS["tiered"][_key]
+
 
 # ─── Config access / persistence ─────────────────────────────────────────────
 def get_config() -> dict:
@@ -80,14 +267,26 @@ def get_config() -> dict:
 
 
 def save_config(updates: dict) -> None:
-    """Merge updates into config.yaml and update the in-memory config."""
+    """
+    Merge updates into config.yaml and update the in-memory config.
+
+    Settings read at transcription time (the decoding preset) take effect
+    immediately; the rest apply from the next start.
+    """
+    global DECODE_PRESET
+    import yaml  # pylint: disable=import-outside-toplevel
+
     current = _load_yaml()
     current.update(updates)
     with open(CONFIG_PATH, "w", encoding="utf-8") as f:
         yaml.safe_dump(current, f, default_flow_style=False, sort_keys=False)
     _cfg.update(updates)
+    if updates.get("decode_preset") in DECODE_PRESETS:
+        DECODE_PRESET = updates["decode_preset"]
 
 
 def get_whisper_task(task: str) -> str:
     """Extract the base Whisper task from a combined task string."""
+    if task.startswith(DUAL_TASK):
+        return DUAL_TASK
     return task.split(" + ")[0]
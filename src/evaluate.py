@@ -0,0 +1,276 @@
+"""
+Accuracy-vs-speed evaluation: transcribe a reference set under several settings
+and score each run by word and character error rate, speed, and memory.
+
+A dataset is a directory of audio files, each with a reference transcript
+`<stem>.ref.txt` beside it (plain text, or the '[HH:MM:SS.mmm] text' transcript
+format). Each variant runs in a fresh subprocess (`python -m src.evaluate ...`)
+so model load time and peak memory are measured in isolation.
+"""
+
+import itertools
+import json
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import wave
+from pathlib import Path
+from typing import Any, Callable, Optional, Sequence
+
+from src import config
+from src.memory import peak_rss_mb
+
+REFERENCE_SUFFIX = ".ref.txt"
+_TIMESTAMP_RE = re.compile(r"^\[[^\]]*\]\s?", re.MULTILINE)
+_PUNCTUATION_RE = re.compile(r"[^\w\s']")
+_RUN_TIMEOUT = 3600.0
+
+
+# ─── Scoring ─────────────────────────────────────────────────────────────────
+def normalize_text(text: str) -> str:
+    """Strip transcript timestamps, case, and punctuation; collapse whitespace."""
+    text = _TIMESTAMP_RE.sub("", text).lower()
+    return " ".join(_PUNCTUATION_RE.sub(" ", text).split())
+
+
+def edit_distance(ref: Sequence, hyp: Sequence) -> int:
+    """
+    Levenshtein distance between two token sequences.
+
+    Each dynamic-programming row is computed in NumPy: substitutions and
+    deletions element-wise from the previous row, then the chain of insertions
+    along the row as a running minimum (new[j] = j + min(k<=j) of tmp[k] - k).
+
+    @ref: Reference tokens (words or characters).
+    @hyp: Hypothesis tokens.
+    @return: Minimum number of substitutions, deletions, and insertions.
+    """
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    if len(ref) < len(hyp):
+        ref, hyp = hyp, ref  # distance is symmetric; iterate over the shorter one
+    if not hyp:
+        return len(ref)
+
+    vocab: dict = {}
+    ref_ids = np.array([vocab.setdefault(t, len(vocab)) for t in ref])
+    hyp_ids = np.array([vocab.setdefault(t, len(vocab)) for t in hyp])
+
+    cols = np.arange(len(ref_ids) + 1)
+    row = cols.copy()
+    for i, token in enumerate(hyp_ids, 1):
+        tmp = np.empty_like(row)
+        tmp[0] = i
+        np.minimum(row[1:] + 1, row[:-1] + (ref_ids != token), out=tmp[1:])
+        row = np.minimum.accumulate(tmp - cols) + cols
+    return int(row[-1])
+
+
+def score(reference: str, hypothesis: str) -> dict:
+    """
+    Word and character edit counts for one file.
+
+    @return: Dict with 'word_errors', 'words', 'char_errors', 'chars'.
+    """
+    ref, hyp = normalize_text(reference), normalize_text(hypothesis)
+    return {
+        "word_errors": edit_distance(ref.split(), hyp.split()),
+        "words": len(ref.split()),
+        "char_errors": edit_distance(ref, hyp),
+        "chars": len(ref),
+    }
+
+
+# ─── Fixtures ────────────────────────────────────────────────────────────────
+def _write_wav(path: Path, samples: Any) -> None:
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(16000)
+        f.writeframes((np.clip(samples, -1.0, 1.0) * 32767).astype(np.int16).tobytes())
+
+
+def synthetic_fixture(directory: Optional[Path] = None) -> Path:
+    """
+    Create an offline smoke-test fixture of non-speech audio with empty references.
+
+    Any words transcribed from silence, noise, or tones are hallucinations, so
+    this measures how much each setting invents and how much time it wastes on
+    audio with nothing to transcribe. It has no speech, so it yields no WER or
+    CER; accuracy comparisons need a real dataset (`transcriber eval DATASET`).
+
+    @directory: Where to write the fixture, default .cache/eval/synthetic.
+    @return: The fixture directory.
+    """
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    directory = directory or config.CACHE_DIR / "eval" / "synthetic"
+    directory.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(0)
+    t = np.arange(45 * 16000) / 16000
+
+    clips = {
+        "silence": np.zeros_like(t),
+        "noise": 0.05 * rng.standard_normal(t.size),
+        # A repeating four-note phrase: the kind of input that sends Whisper into loops
+        "tones": 0.2 * np.sin(2 * np.pi * np.array([262, 330, 392, 523])[(t * 2).astype(int) % 4] * t),
+    }
+    for name, samples in clips.items():
+        if not (directory / f"{name}.wav").exists():
+            _write_wav(directory / f"{name}.wav", samples)
+        (directory / f"{name}{REFERENCE_SUFFIX}").write_text("", encoding="utf-8")
+    return directory
+
+
+def load_dataset(directory: Path) -> list[tuple[Path, str]]:
+    """Return (audio_path, reference_text) for every audio file with a reference."""
+    pairs = []
+    for f in sorted(directory.iterdir()):
+        reference = f.with_name(f"{f.stem}{REFERENCE_SUFFIX}")
+        if f.suffix.lower() in config.FILE_EXTENSIONS and reference.exists():
+            pairs.append((f, reference.read_text(encoding="utf-8")))
+    return pairs
+
+
+# ─── Running variants ────────────────────────────────────────────────────────
+def run_variant(spec: dict) -> dict:
+    """
+    Transcribe the files in @spec in the current process under its settings.
+
+    @spec: Dict with 'model', 'preset', 'guard', 'language', and 'files'.
+    @return: Dict with per-file 'hypotheses' and 'errors', 'load_seconds',
+        'transcribe_seconds', 'audio_seconds', 'fallbacks', 'peak_mb', 'vram_mb'.
+    """
+    import torch  # pylint: disable=import-outside-toplevel
+    from src.audio import probe_durations  # pylint: disable=import-outside-toplevel
+    from src.transcriber import load_model, transcribe_file  # pylint: disable=import-outside-toplevel
+
+    # transcribe_file() reads these at call time
+    config.DECODE_PRESET = spec["preset"]
+    config.REPETITION_GUARD = {**config.REPETITION_GUARD, "enabled": spec["guard"]}
+
+    start = time.perf_counter()
+    model = load_model(spec["model"])
+    load_seconds = time.perf_counter() - start
+
+    files = [Path(f) for f in spec["files"]]
+    hypotheses: dict[str, str] = {}
+    errors: dict[str, str] = {}
+    fallbacks = 0
+    with tempfile.TemporaryDirectory() as out_dir:
+        start = time.perf_counter()
+        for f in files:
+            output_path = Path(out_dir) / f"{f.stem}.txt"
+            stats: dict = {}
+            success, error = transcribe_file(model, f, output_path, spec["language"], "transcribe", stats=stats)
+            fallbacks += stats.get("fallbacks", 0)
+            if success:
+                hypotheses[f.name] = output_path.read_text(encoding="utf-8")
+            else:
+                errors[f.name] = error or "failed"
+        transcribe_seconds = time.perf_counter() - start
+
+    vram = None
+    if torch.cuda.is_available() and config.DEVICE != "cpu":
+        vram = torch.cuda.max_memory_allocated() / (1024 * 1024)
+
+    return {
+        "hypotheses": hypotheses,
+        "errors": errors,
+        "load_seconds": load_seconds,
+        "transcribe_seconds": transcribe_seconds,
+        "audio_seconds": sum(probe_durations(files).values()),
+        "fallbacks": fallbacks,
+        "peak_mb": round(peak_rss_mb()),
+        "vram_mb": round(vram) if vram is not None else None,
+    }
+
+
+def _run_isolated(spec: dict) -> dict:
+    proc = subprocess.run(
+        [sys.executable, "-m", "src.evaluate", json.dumps(spec)],
+        cwd=config.ROOT, capture_output=True, text=True, timeout=_RUN_TIMEOUT, check=False,
+    )
+    lines = proc.stdout.strip().splitlines()
+    if proc.returncode != 0 or not lines:
+        error = (proc.stderr.strip().splitlines() or [f"exit code {proc.returncode}"])[-1]
+        raise RuntimeError(error)
+    return json.loads(lines[-1])
+
+
+def evaluate(
+    dataset: list[tuple[Path, str]],
+    models: list[str],
+    presets: list[str],
+    guards: list[bool],
+    language: Optional[str] = None,
+    on_result: Optional[Callable[[dict], None]] = None,
+) -> list[dict]:
+    """
+    Run every combination of settings over @dataset and score it.
+
+    @dataset: (audio_path, reference_text) pairs (see load_dataset()).
+    @models: Model sizes (including config.TIERED_MODEL).
+    @presets: Keys of config.DECODE_PRESETS.
+    @guards: Repetition guard settings to compare (True/False).
+    @language: Language code, or None for auto-detection.
+    @on_result: Called with each variant's row as it completes.
+    @return: One row per variant with 'wer', 'cer', 'rtf', 'hallucinated_words',
+        timing, memory, and per-file scores.
+    """
+    references = {f.name: text for f, text in dataset}
+    rows: list[dict] = []
+
+    for model, preset, guard in itertools.product(models, presets, guards):
+        row: dict = {"model": model, "preset": preset, "guard": guard}
+        spec = {**row, "language": language, "files": [str(f) for f, _ in dataset]}
+        try:
+            run = _run_isolated(spec)
+        except (RuntimeError, subprocess.TimeoutExpired, ValueError) as e:
+            row.update({"error": str(e), "wer": None, "cer": None, "rtf": None})
+            rows.append(row)
+            if on_result:
+                on_result(row)
+            continue
+
+        files: dict[str, dict] = {}
+        hallucinated = 0
+        for name, reference in references.items():
+            if name in run["errors"]:
+                files[name] = {"error": run["errors"][name]}
+                continue
+            files[name] = score(reference, run["hypotheses"][name])
+            if not files[name]["words"]:
+                hallucinated += len(normalize_text(run["hypotheses"][name]).split())
+
+        # Empty references only count towards hallucinated words
+        scored = [s for s in files.values() if s.get("words")]
+        words = sum(s["words"] for s in scored)
+        chars = sum(s["chars"] for s in scored)
+        row.update({
+            "wer": sum(s["word_errors"] for s in scored) / words if words else None,
+            "cer": sum(s["char_errors"] for s in scored) / chars if chars else None,
+            "hallucinated_words": hallucinated,
+            "failed": len(run["errors"]),
+            "rtf": run["transcribe_seconds"] / run["audio_seconds"] if run["audio_seconds"] else None,
+            "load_seconds": run["load_seconds"],
+            "transcribe_seconds": run["transcribe_seconds"],
+            "audio_seconds": run["audio_seconds"],
+            "fallbacks": run["fallbacks"],
+            "peak_mb": run["peak_mb"],
+            "vram_mb": run["vram_mb"],
+            "files": files,
+        })
+        rows.append(row)
+        if on_result:
+            on_result(row)
+
+    return rows
+
+
+if __name__ == "__main__":
+    print(json.dumps(run_variant(json.loads(sys.argv[1]))))
@@ -0,0 +1,133 @@
+"""
+Offline extractive summarization: TF-IDF sentence vectors ranked with TextRank.
+
+Everything is vectorised in NumPy over a sparse (row, column, value) layout, so a
+typical transcript summarizes in milliseconds with no network access.
+"""
+
+import re
+from typing import Any
+
+_TIMESTAMP_RE = re.compile(r"^\[(\d+):(\d{2}):(\d{2})\.(\d{3})\]\s*")
+_SENTENCE_RE = re.compile(r"(?<=[.!?。！？])\s+")
+_WORD_RE = re.compile(r"\w+")
+
+# Above this many sentences, or this many dense matrix cells, pairwise TextRank
+# is replaced by cosine similarity to the document centroid
+_MAX_TEXTRANK_SENTENCES = 2000
+_MAX_DENSE_CELLS = 20_000_000
+
+_SENTENCE_COUNTS = {"concise": 5, "bullet_points": 8}
+
+_STOPWORDS = frozenset("""
+a about above after again all also am an and any are as at be because been before being
+below between both but by can could did do does doing down during each few for from further
+had has have having he her here hers him his how i if in into is it its itself just me more
+most my no nor not now of off on once only or other our ours out over own same she should so
+some such than that the their theirs them then there these they this those through to too
+under until up very was we were what when where which while who whom why will with would
+you your yours yeah okay ok um uh like know really right gonna got get
+""".split())
+
+
+def split_sentences(transcript: str) -> list[tuple[float, str]]:
+    """
+    Split a timestamped transcript into sentences.
+
+    @transcript: Transcript text in '[HH:MM:SS.mmm] text' format (plain text also works).
+    @return: List of (segment_start_seconds, sentence) pairs.
+    """
+    sentences: list[tuple[float, str]] = []
+    for line in transcript.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        start = 0.0
+        match = _TIMESTAMP_RE.match(line)
+        if match:
+            h, m, s, ms = (int(g) for g in match.groups())
+            start = h * 3600 + m * 60 + s + ms / 1000
+            line = line[match.end():]
+        elif sentences:
+            start = sentences[-1][0]
+        sentences.extend((start, part) for part in _SENTENCE_RE.split(line) if part.strip())
+    return sentences
+
+
+def rank_sentences(sentences: list[str]) -> Any:
+    """
+    Score sentences by centrality (higher is more representative).
+
+    @sentences: Sentence strings.
+    @return: NumPy float array of scores, one per sentence.
+    """
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    n = len(sentences)
+    vocab: dict[str, int] = {}
+    rows: list[int] = []
+    cols: list[int] = []
+    for i, sentence in enumerate(sentences):
+        for word in _WORD_RE.findall(sentence.lower()):
+            if len(word) > 1 and word not in _STOPWORDS:
+                rows.append(i)
+                cols.append(vocab.setdefault(word, len(vocab)))
+
+    if not rows:
+        return np.zeros(n)
+
+    # Sparse TF-IDF with sublinear term frequency, L2-normalised per sentence
+    v = len(vocab)
+    keys, counts = np.unique(np.asarray(rows, np.int64) * v + np.asarray(cols, np.int64), return_counts=True)
+    r, c = keys // v, keys % v
+    idf = np.log((1 + n) / (1 + np.bincount(c, minlength=v))) + 1.0
+    w = (1.0 + np.log(counts)) * idf[c]
+    norms = np.sqrt(np.bincount(r, weights=w * w, minlength=n))
+    w /= norms[r]
+
+    if n > _MAX_TEXTRANK_SENTENCES or n * v > _MAX_DENSE_CELLS:
+        centroid = np.bincount(c, weights=w, minlength=v) / n
+        return np.bincount(r, weights=w * centroid[c], minlength=n)
+
+    x = np.zeros((n, v), dtype=np.float32)
+    x[r, c] = w
+    sim = x @ x.T
+    np.fill_diagonal(sim, 0.0)
+
+    # TextRank: PageRank over the cosine-similarity graph
+    out = sim.sum(axis=1, keepdims=True)
+    transition = np.divide(sim, out, out=np.full_like(sim, 1.0 / n), where=out > 0)
+    scores = np.full(n, 1.0 / n, dtype=np.float32)
+    for _ in range(100):
+        updated = 0.15 / n + 0.85 * (transition.T @ scores)
+        if np.abs(updated - scores).sum() < 1e-6:
+            return updated
+        scores = updated
+    return scores
+
+
+def summarize_text(transcript: str, style: str) -> str:
+    """
+    Build an extractive summary from the most central transcript sentences.
+
+    @transcript: Transcript text.
+    @style: Either 'concise' (one paragraph) or 'bullet_points' (timestamped list).
+    @return: Summary text, in original transcript order.
+    """
+    import numpy as np  # pylint: disable=import-outside-toplevel
+    from src.writers import format_timestamp  # pylint: disable=import-outside-toplevel
+
+    sentences = split_sentences(transcript)
+    if not sentences:
+        return ""
+
+    # Never return more than half of a short transcript
+    k = min((len(sentences) + 1) // 2, _SENTENCE_COUNTS.get(style, _SENTENCE_COUNTS["concise"]))
+    scores = rank_sentences([text for _, text in sentences])
+    chosen = sorted(np.argsort(-scores, kind="stable")[:k])
+
+    if style == "bullet_points":
+        return "\n".join(
+            f"- [{format_timestamp(sentences[i][0])[:8]}] {sentences[i][1].strip()}" for i in chosen
+        ) + "\n"
+    return " ".join(sentences[i][1].strip() for i in chosen) + "\n"
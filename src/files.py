@@ -8,15 +8,27 @@ import questionary
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
+from rich.markup import escape
 
-from src import config
-from src.ui import clear_screen, format_size
+from src import archive, config, search
+from src.pager import TranscriptPager, parse_time
+from src.ui import clear_screen, format_size, select_path_paged, select_paths_paged
+from src.writers import format_timestamp
 
 console = Console()
 
 _BACK = "BACK"
 _BACK_LABEL = [("bold", "BACK")]
 
+# Transcript pager actions
+_NEXT = "NEXT"
+_PREV = "PREV"
+_JUMP = "JUMP"
+_FIND = "FIND"
+_FIND_NEXT = "FIND_NEXT"
+_RESTORE = "RESTORE"
+_EDIT = "EDIT"
+
 
 def _scan_all_files() -> tuple[list[Path], list[Path]]:
     """Return (audio_files, transcript_files) from their respective directories."""
@@ -45,6 +57,13 @@ def _show_file_listing(audio_files: list[Path], transcript_files: list[Path]) ->
 
     table.add_row("audio/", str(len(audio_files)), format_size(audio_size))
     table.add_row("transcripts/", str(len(transcript_files)), format_size(transcript_size))
+    archived = archive.list_entries()
+    if archived:
+        table.add_row(
+            f"transcripts/{archive.ARCHIVE_DIR_NAME}/",
+            str(len(archived)),
+            format_size(sum(size for _, size in archived.values())),
+        )
 
     console.print()
     console.print(table)
@@ -53,56 +72,197 @@ def _show_file_listing(audio_files: list[Path], transcript_files: list[Path]) ->
 
 def _view_transcript() -> None:
     """Select and preview a transcript file, with option to open in editor."""
-    transcripts = sorted(
-        config.DEFAULT_OUTPUT_DIR.glob("*.txt"),
-        key=lambda p: p.name.lower(),
-    )
-
-    if not transcripts:
+    directory = config.DEFAULT_OUTPUT_DIR
+    archived = archive.list_entries()
+    names = set(archived)
+    if directory.exists():
+        with os.scandir(directory) as it:
+            names.update(e.name for e in it if e.name.endswith(".txt") and e.is_file())
+
+    if not names:
         console.print("\n[yellow]No transcript files found.[/yellow]")
         input("\nPress Enter to go back...")
         return
 
-    choices = [
-        questionary.Choice(f"{f.name} ({format_size(f.stat().st_size)})", value=str(f))
-        for f in transcripts
-    ]
-    choices.append(questionary.Choice(title=_BACK_LABEL, value=_BACK))
+    # Only the visible page is stat()ed (see select_path_paged)
+    def _label(f: Path) -> str:
+        try:
+            return f"{f.name} ({format_size(f.stat().st_size)})"
+        except FileNotFoundError:
+            return f"{f.name} ({format_size(archived[f.name][1])}) [archived]"
 
-    answer = questionary.select(
+    answer = select_path_paged(
         "Select a transcript to view:",
-        choices=choices,
-        instruction="",
-    ).ask()
+        [directory / name for name in sorted(names, key=str.lower)],
+        lambda page: [_label(f) for f in page],
+        allow_exit=False,
+    )
+    if answer == _BACK:
+        return
 
-    if answer is None:
+    _show_transcript(answer)
+
+
+def _show_transcript(filepath: Path, start: float = 0.0) -> None:
+    """
+    Page through a transcript (on disk or archived), with option to open in editor.
+
+    Only the visible page is read (see pager.TranscriptPager), so transcripts
+    of any size open instantly.
+
+    @filepath: Transcript path in the transcript directory.
+    @start: Time in seconds to open at.
+    """
+    try:
+        pager = TranscriptPager.open(filepath)
+    except (OSError, RuntimeError) as e:
+        console.print(f"\n[red]Cannot read {escape(filepath.name)}: {escape(str(e))}[/red]")
+        input("\nPress Enter to go back...")
+        return
+    archived = not filepath.exists()
+
+    with pager:
+        top = pager.find_time(start) if start else 0
+        query = ""
+        message = ""
+        while True:
+            page_lines = max(10, console.height - 14)
+            lines = pager.read_lines(top, page_lines)
+            offset = pager.offset_of(top) or 0
+            total = f" of {pager.line_count}" if pager.line_count is not None else ""
+            status = (
+                f"lines {top + 1}-{top + len(lines)}{total} "
+                f"| {100 * offset / pager.size if pager.size else 100:.0f}%"
+            )
+
+            clear_screen()
+            console.print()
+            console.print(Panel(
+                escape("\n".join(lines)) or "[dim](empty)[/dim]",
+                title=f"[bold]{escape(filepath.name)}[/bold]",
+                subtitle=f"[dim]{status}[/dim]",
+                border_style="cyan",
+            ))
+            if message:
+                console.print(message)
+                message = ""
+
+            choices = []
+            if pager.has_line(top + page_lines):
+                choices.append(questionary.Choice("Next page", value=_NEXT))
+            if top > 0:
+                choices.append(questionary.Choice("Previous page", value=_PREV))
+            choices.append(questionary.Choice("Jump to time...", value=_JUMP))
+            choices.append(questionary.Choice("Find...", value=_FIND))
+            if query:
+                choices.append(questionary.Choice(f"Find next '{query}'", value=_FIND_NEXT))
+            choices.append(questionary.Choice(
+                "Restore from archive" if archived else "Open in editor",
+                value=_RESTORE if archived else _EDIT,
+            ))
+            choices.append(questionary.Choice(title=_BACK_LABEL, value=_BACK))
+
+            action = questionary.select("What next?", choices=choices, instruction="").ask()
+            if action is None:
+                raise KeyboardInterrupt
+
+            if action == _NEXT:
+                top += page_lines
+            elif action == _PREV:
+                top = max(0, top - page_lines)
+            elif action == _JUMP:
+                answer = questionary.text("Time (HH:MM:SS, MM:SS or seconds):").ask()
+                seconds = parse_time(answer) if answer else None
+                if seconds is None:
+                    message = "[yellow]Not a time.[/yellow]" if answer else ""
+                else:
+                    top = pager.find_time(seconds)
+            elif action in (_FIND, _FIND_NEXT):
+                if action == _FIND:
+                    query = (questionary.text("Find:", default=query).ask() or "").strip()
+                    if not query:
+                        continue
+                first = top if action == _FIND else top + 1
+                with console.status("Searching..."):
+                    match = pager.search(query, first)
+                    wrapped = match is None and first > 0
+                    if wrapped:
+                        match = pager.search(query, 0)
+                if match is None:
+                    message = f"[yellow]No match for '{escape(query)}'.[/yellow]"
+                else:
+                    top = match
+                    if wrapped:
+                        message = "[dim]Search wrapped to the beginning.[/dim]"
+            elif action == _RESTORE:
+                archive.extract_files([filepath.name])
+                console.print(f"[green]Restored {escape(filepath.name)} to transcripts/.[/green]")
+                input("\nPress Enter to continue...")
+                return
+            elif action == _EDIT:
+                editor = os.environ.get("EDITOR", "nano")
+                try:
+                    subprocess.run([editor, str(filepath)], check=False)
+                except FileNotFoundError:
+                    console.print(f"[red]Editor '{editor}' not found. Set $EDITOR to your preferred editor.[/red]")
+                    input("\nPress Enter to continue...")
+                    return
+                # An edit in place leaves the directory mtime alone, so sync_if_changed() would miss it
+                try:
+                    search.index_transcript(filepath)
+                except Exception:  # pylint: disable=broad-exception-caught
+                    pass
+                return
+            else:
+                return
+
+
+def _search_transcripts() -> None:
+    """Search all transcripts and open a matching file."""
+    query = questionary.text("Search transcripts for:").ask()
+    if query is None:
         raise KeyboardInterrupt
-    if answer == _BACK:
+    if not query.strip():
         return
 
-    filepath = Path(answer)
-    lines = filepath.read_text(encoding="utf-8").splitlines()
-    preview = "\n".join(lines[:20])
-    if len(lines) > 20:
-        preview += f"\n\n[dim]... {len(lines) - 20} more lines[/dim]"
+    with console.status("Updating search index..."):
+        search.sync_if_changed()
+    hits = search.search(query, limit=50)
 
+    if not hits:
+        console.print(f"\n[yellow]No matches for '{escape(query)}'.[/yellow]")
+        input("\nPress Enter to go back...")
+        return
+
+    table = Table(title=f"Matches for '{escape(query)}'")
+    table.add_column("File", style="cyan")
+    table.add_column("Time", style="green")
+    table.add_column("Text")
+    for hit in hits:
+        table.add_row(hit["file"], format_timestamp(hit["start"]), search.format_snippet(hit["snippet"]))
     console.print()
-    console.print(Panel(preview, title=f"[bold]{filepath.name}[/bold]", border_style="cyan"))
+    console.print(table)
     console.print()
 
-    action = questionary.select(
-        "What next?",
-        choices=["Open in editor", "Back"],
+    # Open each file at its best-ranked hit
+    starts: dict[str, float] = {}
+    for hit in hits:
+        starts.setdefault(hit["file"], hit["start"])
+    choices = [questionary.Choice(name, value=name) for name in starts]
+    choices.append(questionary.Choice(title=_BACK_LABEL, value=_BACK))
+
+    answer = questionary.select(
+        "Open a matching transcript:",
+        choices=choices,
         instruction="",
     ).ask()
 
-    if action == "Open in editor":
-        editor = os.environ.get("EDITOR", "nano")
-        try:
-            subprocess.run([editor, str(filepath)], check=False)
-        except FileNotFoundError:
-            console.print(f"[red]Editor '{editor}' not found. Set $EDITOR to your preferred editor.[/red]")
-            input("\nPress Enter to continue...")
+    if answer is None:
+        raise KeyboardInterrupt
+    if answer == _BACK:
+        return
+
+    _show_transcript(config.DEFAULT_OUTPUT_DIR / answer, start=starts[answer])
 
 
 def _delete_files() -> None:
@@ -114,28 +274,21 @@ def _delete_files() -> None:
         input("\nPress Enter to go back...")
         return
 
-    choices = []
-    for f in audio_files:
-        label = f"[audio] {f.name} ({format_size(f.stat().st_size)})"
-        choices.append(questionary.Choice(label, value=str(f)))
-    for f in transcript_files:
-        label = f"[transcripts] {f.name} ({format_size(f.stat().st_size)})"
-        choices.append(questionary.Choice(label, value=str(f)))
-    choices.append(questionary.Choice(title=_BACK_LABEL, value=_BACK))
+    def _label(f: Path) -> str:
+        prefix = "[audio]" if f.parent == config.DEFAULT_INPUT_DIR else "[transcripts]"
+        return f"{prefix} {f.name} ({format_size(f.stat().st_size)})"
 
-    answer = questionary.checkbox(
+    answer = select_paths_paged(
         "Select files to delete (space to toggle, enter to confirm):",
-        choices=choices,
-        instruction="",
-    ).ask()
-
-    if answer is None:
-        raise KeyboardInterrupt
+        audio_files + transcript_files,
+        lambda page: [_label(f) for f in page],
+        allow_exit=False,
+    )
 
-    if _BACK in answer or not answer:
+    if answer == _BACK:
         return
 
-    to_delete = [Path(p) for p in answer if p != _BACK]
+    to_delete = answer
     console.print(f"\n[bold yellow]About to delete {len(to_delete)} file(s).[/bold yellow]")
 
     confirm = questionary.confirm("This cannot be undone. Proceed?", default=False).ask()
@@ -167,6 +320,7 @@ def run_manage_files() -> None:
 
         choices = [
             "View transcript",
+            "Search transcripts",
             "Delete file(s)",
             questionary.Separator(),
             questionary.Choice("Back", value="Back"),
@@ -185,5 +339,7 @@ def run_manage_files() -> None:
             return
         elif answer == "View transcript":
             _view_transcript()
+        elif answer == "Search transcripts":
+            _search_transcripts()
         elif answer == "Delete file(s)":
             _delete_files()
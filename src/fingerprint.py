@@ -0,0 +1,338 @@
+"""
+Acoustic fingerprints for spotting the same recording in a different encoding.
+
+A few short windows spread across the file are decoded, reduced to band
+energies on a coarse spectrogram, and turned into one 16-bit word per frame:
+each bit is the sign of an energy difference across neighbouring bands and
+consecutive frames. Those signs survive re-encoding at another bitrate or in
+another container, while unrelated audio disagrees on about half the bits.
+
+Fingerprints of transcribed files are kept in an SQLite index (.cache/
+fingerprints.db) with the transcript they produced, so a later copy can reuse
+that transcript instead of running Whisper again.
+"""
+
+import bisect
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from src import config
+from src.audio import SAMPLE_RATE, load_audio_window
+
+_WINDOWS = 6                 # at least this many windows sampled across the file
+_WINDOW_SECONDS = 8.0
+_FRAME = SAMPLE_RATE // 5    # 200 ms frames ...
+_HOP = SAMPLE_RATE // 100    # ... every 10 ms, so any offset is within 5 ms of a frame
+_BANDS = 17                  # log-spaced 300-3000 Hz bands -> 16 bits per frame
+_MAX_LAG = 10                # hops of misalignment tolerated (encoder delay, seek rounding)
+_DURATION_TOLERANCE = 1.0    # seconds, or 0.5% of the duration if larger
+MAX_BIT_ERROR = 0.2          # re-encodings score about 0.1, unrelated audio about 0.5
+_SCHEMA_VERSION = 3          # 2: absolute window offsets, model and decode_preset
+                             # 3: keyed per file (path, size, mtime), not sampled content
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS fingerprints (
+    key TEXT PRIMARY KEY,
+    duration REAL NOT NULL,
+    bits BLOB NOT NULL,
+    file TEXT,
+    transcript TEXT,
+    task TEXT,
+    language TEXT,
+    model TEXT,
+    decode_preset TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS fingerprints_duration ON fingerprints(duration);
+"""
+
+
+# ─── Fingerprints ────────────────────────────────────────────────────────────
+def _band_edges() -> Any:
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    freqs = np.geomspace(300.0, 3000.0, _BANDS + 1)
+    return np.round(freqs * _FRAME / SAMPLE_RATE).astype(int)
+
+
+def fingerprint_samples(samples: Any) -> Any:
+    """
+    Fingerprint a 16 kHz mono waveform.
+
+    @samples: 1-D float32 array.
+    @return: uint16 array with one word per 10 ms hop.
+    """
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    n = 1 + (len(samples) - _FRAME) // _HOP
+    if n < 2:
+        return np.zeros(0, dtype=np.uint16)
+    idx = np.arange(_FRAME)[None, :] + _HOP * np.arange(n)[:, None]
+    power = np.abs(np.fft.rfft(samples[idx] * np.hanning(_FRAME), axis=1)) ** 2
+
+    edges = _band_edges()
+    cumulative = np.concatenate([np.zeros((n, 1)), np.cumsum(power, axis=1)], axis=1)
+    energy = np.log(cumulative[:, edges[1:]] - cumulative[:, edges[:-1]] + 1e-10)
+
+    band_diff = energy[:, :-1] - energy[:, 1:]
+    bits = (band_diff[1:] - band_diff[:-1]) > 0
+    packed = np.ascontiguousarray(np.packbits(bits, axis=1, bitorder="little"))
+    return packed.view(np.uint16).ravel()
+
+
+def _is_whole(duration: float) -> bool:
+    """Short files are fingerprinted whole rather than in windows."""
+    return duration <= _WINDOWS * _WINDOW_SECONDS
+
+
+def _spacing(duration: float) -> float:
+    """Window spacing: _WINDOW_SECONDS doubled until at most 2 * _WINDOWS windows fit."""
+    spacing = _WINDOW_SECONDS
+    while (duration - _WINDOW_SECONDS) // spacing > 2 * _WINDOWS:
+        spacing *= 2
+    return spacing
+
+
+def _window_offsets(duration: float) -> list[float]:
+    if _is_whole(duration):
+        return [0.0]
+    spacing = _spacing(duration)
+    return [k * spacing for k in range(1, int((duration - _WINDOW_SECONDS) // spacing) + 1)]
+
+
+def _window_length(duration: float) -> float:
+    return duration if _is_whole(duration) else _WINDOW_SECONDS
+
+
+def _word_count(seconds: float) -> int:
+    """Words fingerprint_samples() returns for @seconds of audio."""
+    return max(0, (int(seconds * SAMPLE_RATE) - _FRAME) // _HOP)
+
+
+def compute_fingerprint(path: Path, duration: float) -> Any:
+    """
+    Fingerprint an audio file from a few windows spread across its @duration.
+
+    Windows start at absolute offsets, multiples of a power-of-two spacing
+    (see _spacing()), so two encodings of the same recording are sampled at
+    the same moments however much their durations differ; where the
+    durations pick different spacings, the finer windows include the
+    coarser ones. Files short enough are fingerprinted whole.
+
+    @path: Audio file.
+    @duration: Its duration in seconds (see audio.probe_durations()).
+    @return: uint16 array (windows concatenated, each padded or cut to the
+        length its duration implies).
+    """
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    length = _window_length(duration)
+    size = _word_count(length)
+    windows = []
+    for offset in _window_offsets(duration):
+        words = fingerprint_samples(load_audio_window(path, offset, length))[:size]
+        windows.append(np.pad(words, (0, size - len(words))))
+    return np.concatenate(windows).astype(np.uint16)
+
+
+def _window_at(bits: Any, duration: float, offset: float) -> Any:
+    """Words of @bits (fingerprinted at @duration) covering _WINDOW_SECONDS from @offset."""
+    length = _window_length(duration)
+    size = _word_count(length)
+    for i, start in enumerate(_window_offsets(duration)):
+        if start <= offset and offset + _WINDOW_SECONDS <= start + length + 1e-6:
+            first = i * size + round((offset - start) * SAMPLE_RATE / _HOP)
+            return bits[first:first + _word_count(_WINDOW_SECONDS)]
+    return bits[:0]
+
+
+def bit_error_rate(a: Any, a_duration: float, b: Any, b_duration: float) -> float:
+    """
+    Fraction of differing bits between two fingerprints at their best alignment.
+
+    Only windows both files sampled at the same absolute offset are compared,
+    each aligned separately at lags up to ±_MAX_LAG hops to absorb encoder
+    delay. Two short files fingerprinted whole are compared whole.
+
+    @a, @b: Fingerprints from compute_fingerprint().
+    @a_duration, @b_duration: Durations they were computed for.
+    """
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    if _is_whole(a_duration) and _is_whole(b_duration):
+        pairs = [(a, b)]
+    else:
+        spacing = max(_spacing(d) for d in (a_duration, b_duration) if not _is_whole(d))
+        offsets = [
+            k * spacing
+            for k in range(1, int((min(a_duration, b_duration) - _WINDOW_SECONDS) // spacing) + 1)
+        ]
+        pairs = [(_window_at(a, a_duration, o), _window_at(b, b_duration, o)) for o in offsets]
+
+    differing = compared = 0
+    for wa, wb in pairs:
+        n = min(len(wa), len(wb))
+        if n <= 2 * _MAX_LAG:
+            continue
+        best: Optional[tuple[int, int]] = None
+        for lag in range(-_MAX_LAG, _MAX_LAG + 1):
+            x = wa[max(0, lag):n + min(0, lag)]
+            y = wb[max(0, -lag):n - max(0, lag)]
+            bits = int(np.unpackbits((x ^ y).view(np.uint8)).sum())
+            if best is None or bits * best[1] < best[0] * 16 * len(x):
+                best = (bits, 16 * len(x))
+        differing += best[0]
+        compared += best[1]
+    return differing / compared if compared else 1.0
+
+
+# ─── Index ───────────────────────────────────────────────────────────────────
+def open_index(path: Optional[Path] = None) -> sqlite3.Connection:
+    """
+    Open (creating if needed) the fingerprint index.
+
+    @path: Database location, defaults to config.FINGERPRINT_INDEX_PATH.
+    @return: Open SQLite connection.
+    """
+    path = path or config.FINGERPRINT_INDEX_PATH
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.executescript(_SCHEMA)
+    if conn.execute("PRAGMA user_version").fetchone()[0] < _SCHEMA_VERSION:
+        with conn:
+            for column in ("model", "decode_preset"):
+                try:
+                    conn.execute(f"ALTER TABLE fingerprints ADD COLUMN {column} TEXT")
+                except sqlite3.OperationalError:
+                    pass  # created by _SCHEMA
+            # Old window layouts do not compare with new ones, and rows keyed on
+            # sampled content can belong to a different recording
+            conn.execute("DELETE FROM fingerprints")
+            conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+    return conn
+
+
+def cached_fingerprint(conn: sqlite3.Connection, key: str) -> Optional[Any]:
+    """Stored fingerprint for the audio file @key (cache.file_key()), if any."""
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    row = conn.execute("SELECT bits FROM fingerprints WHERE key = ?", (key,)).fetchone()
+    return np.frombuffer(row[0], dtype=np.uint16) if row else None
+
+
+def remember(
+    conn: sqlite3.Connection,
+    key: str,
+    duration: float,
+    bits: Any,
+    file: Optional[str] = None,
+    transcript: Optional[Path] = None,
+    task: Optional[str] = None,
+    language: Optional[str] = None,
+    model: Optional[str] = None,
+    decode_preset: Optional[str] = None,
+) -> None:
+    """
+    Store a fingerprint, with the transcript it produced once there is one.
+
+    @key: Audio file key (cache.file_key()).
+    @duration: Duration in seconds.
+    @bits: Fingerprint from compute_fingerprint().
+    @file: Audio file name.
+    @transcript: Path of the .txt transcript written for this audio.
+    @task: Whisper task the transcript was produced with.
+    @language: Language passed to Whisper (None for auto-detection).
+    @model: Model size the transcript was produced with.
+    @decode_preset: Decoding preset the transcript was produced with.
+    """
+    with conn:
+        conn.execute(
+            "INSERT INTO fingerprints "
+            "(key, duration, bits, file, transcript, task, language, model, decode_preset, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT(key) DO UPDATE SET "
+            "duration = excluded.duration, bits = excluded.bits, updated_at = excluded.updated_at, "
+            "file = COALESCE(excluded.file, file), transcript = COALESCE(excluded.transcript, transcript), "
+            "task = COALESCE(excluded.task, task), language = COALESCE(excluded.language, language), "
+            "model = COALESCE(excluded.model, model), "
+            "decode_preset = COALESCE(excluded.decode_preset, decode_preset)",
+            (
+                key, duration, bits.astype("uint16").tobytes(), file,
+                str(transcript) if transcript else None, task, language, model, decode_preset, time.time(),
+            ),
+        )
+
+
+def find_transcribed(
+    conn: sqlite3.Connection,
+    duration: float,
+    bits: Any,
+    task: str,
+    model: Optional[str],
+    decode_preset: str,
+    exclude_key: Optional[str] = None,
+) -> Optional[dict]:
+    """
+    Find an already transcribed recording acoustically matching @bits.
+
+    Only entries with a similar duration, transcribed with the same @task,
+    @model and @decode_preset, are compared.
+
+    @conn: Open fingerprint index.
+    @duration: Duration of the new file in seconds.
+    @bits: Its fingerprint.
+    @task: Whisper task the new file would be transcribed with.
+    @model: Model size it would be transcribed with.
+    @decode_preset: Decoding preset it would be transcribed with.
+    @exclude_key: File key to ignore (the new file itself, being re-transcribed).
+    @return: Dict with 'transcript' (Path), 'file', 'language' and
+        'bit_error_rate' of the closest match, or None.
+    """
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    tolerance = max(_DURATION_TOLERANCE, 0.005 * duration)
+    rows = conn.execute(
+        "SELECT key, duration, bits, transcript, file, language FROM fingerprints "
+        "WHERE transcript IS NOT NULL AND task = ? AND model = ? AND decode_preset = ? "
+        "AND duration BETWEEN ? AND ?",
+        (task, model, decode_preset, duration - tolerance, duration + tolerance),
+    ).fetchall()
+
+    best: Optional[dict] = None
+    for key, other_duration, blob, transcript, file, language in rows:
+        if key == exclude_key:
+            continue
+        ber = bit_error_rate(bits, duration, np.frombuffer(blob, dtype=np.uint16), other_duration)
+        if ber <= MAX_BIT_ERROR and (best is None or ber < best["bit_error_rate"]):
+            best = {"transcript": Path(transcript), "file": file, "language": language, "bit_error_rate": ber}
+    return best
+
+
+def find_in_batch(prints: dict[Path, tuple[float, Any]]) -> dict[Path, tuple[Path, float]]:
+    """
+    Group acoustically identical files within one batch.
+
+    @prints: {file: (duration, fingerprint)}.
+    @return: {duplicate: (first_file, bit_error_rate)} for every file that
+        matches an earlier file in @prints; first files are not included.
+    """
+    # Leaders sorted by duration, so each file is only compared with those
+    # inside its duration tolerance instead of with every earlier leader
+    leaders: list[tuple[float, int, Path]] = []
+    duplicates: dict[Path, tuple[Path, float]] = {}
+    for order, (f, (duration, bits)) in enumerate(prints.items()):
+        # Widest window any leader can match in: a longer leader's own 0.5% counts
+        span = max(_DURATION_TOLERANCE, 0.005 * duration / 0.995)
+        lo = bisect.bisect_left(leaders, (duration - span,))
+        hi = bisect.bisect_right(leaders, (duration + span, len(prints)))
+        for lead_duration, _, leader in sorted(leaders[lo:hi], key=lambda lead: lead[1]):
+            if abs(duration - lead_duration) > max(_DURATION_TOLERANCE, 0.005 * max(duration, lead_duration)):
+                continue
+            ber = bit_error_rate(bits, duration, prints[leader][1], lead_duration)
+            if ber <= MAX_BIT_ERROR:
+                duplicates[f] = (leader, ber)
+                break
+        else:
+            bisect.insort(leaders, (duration, order, f))
+    return duplicates
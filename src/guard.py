@@ -0,0 +1,185 @@
+"""
+Guard against Whisper hallucination loops on silence or music.
+
+Whisper can emit the same phrase until it hits the token limit, then retry the
+window at every fallback temperature. The guard wraps a model's decode(): a
+logit filter ends a decode as soon as its text starts repeating, and a window
+whose output is still repetitive (or extremely compressible) is reported back
+as silence, so Whisper skips ahead to the next window instead of retrying it.
+
+The same wrapper counts temperature fallbacks and the time spent on them, and
+can stop a transcription between windows (see DecodeGuard.abort_if).
+"""
+
+import dataclasses
+import math
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
+
+from src.config import WHISPER_TEMPERATURES
+
+_WINDOW_SECONDS = 30.0
+
+# A tail repeating a phrase of up to _MAX_PERIOD tokens at least _MIN_REPEATS
+# times, covering at least _MIN_REPEAT_TOKENS tokens, counts as a loop
+_MAX_PERIOD = 32
+_MIN_REPEATS = 4
+_MIN_REPEAT_TOKENS = 24
+
+
+def find_repetition(tokens: list[int]) -> Optional[tuple[int, int]]:
+    """
+    Check whether @tokens end in a runaway repetition.
+
+    @tokens: Text tokens (timestamps and special tokens removed).
+    @return: (phrase_length, repeats) of the repeated tail, or None.
+    """
+    n = len(tokens)
+    for period in range(1, min(_MAX_PERIOD, n // _MIN_REPEATS) + 1):
+        tail = tokens[n - period:]
+        repeats = 1
+        start = n - 2 * period
+        while start >= 0 and tokens[start:start + period] == tail:
+            repeats += 1
+            start -= period
+        if repeats >= _MIN_REPEATS and repeats * period >= _MIN_REPEAT_TOKENS:
+            return period, repeats
+    return None
+
+
+def _repetition_stop(sample_begin: int, eot: int, on_stop: Any) -> Any:
+    """Build a logit filter that forces end-of-text once a sequence starts looping."""
+    from whisper.decoding import LogitFilter  # pylint: disable=import-outside-toplevel
+
+    class RepetitionStop(LogitFilter):
+        def apply(self, logits: Any, tokens: Any) -> None:
+            for row, sequence in enumerate(tokens[:, sample_begin:].tolist()):
+                if not sequence or sequence[-1] >= eot:
+                    continue
+                if find_repetition([t for t in sequence if t < eot]):
+                    logits[row, :] = -math.inf
+                    logits[row, eot] = 0.0
+                    on_stop()
+
+    return RepetitionStop()
+
+
+class DecodeAborted(Exception):
+    """A transcription was stopped between windows by DecodeGuard.abort_if."""
+
+
+class DecodeGuard:
+    """
+    Per-file hallucination guard and decode counters.
+
+    Attach it to a Whisper model for the duration of one transcription with
+    attach(); the counters then describe what was skipped, saved, and retried.
+    """
+
+    def __init__(
+        self,
+        max_compression_ratio: float,
+        temperatures: tuple[float, ...] = WHISPER_TEMPERATURES,
+        detect_loops: bool = True,
+        abort_if: Optional[Callable[[], Optional[str]]] = None,
+    ):
+        """
+        @max_compression_ratio: Windows whose decoded text compresses better
+            than this are treated as loops even without an exact repeat.
+        @temperatures: The fallback schedule in use, to count skipped retries.
+        @detect_loops: False to only count decodes and fallbacks.
+        @abort_if: Called before each decode; a returned reason stops the
+            transcription with DecodeAborted.
+        """
+        self.max_compression_ratio = max_compression_ratio
+        self.temperatures = temperatures
+        self.detect_loops = detect_loops
+        self.abort_if = abort_if
+        self.skipped_windows = 0
+        self.stopped_decodes = 0
+        self.decodes_saved = 0
+        self.tokens_saved = 0
+        self.fallbacks = 0
+        self.fallback_seconds = 0.0
+
+    def _is_loop(self, result: Any, eot: int) -> bool:
+        text = [t for t in result.tokens if t < eot]
+        return result.compression_ratio > self.max_compression_ratio or find_repetition(text) is not None
+
+    def decode(self, model: Any, mel: Any, options: Any = None, **kwargs: Any) -> Any:
+        """Drop-in replacement for whisper.decoding.decode() with the guard applied."""
+        from whisper.decoding import DecodingOptions, DecodingTask  # pylint: disable=import-outside-toplevel
+
+        reason = self.abort_if() if self.abort_if else None
+        if reason:
+            raise DecodeAborted(reason)
+        options = options or DecodingOptions()
+        if kwargs:
+            options = dataclasses.replace(options, **kwargs)
+        single = mel.ndim == 2
+        if single:
+            mel = mel.unsqueeze(0)
+
+        stopped = False
+
+        def _on_stop() -> None:
+            nonlocal stopped
+            stopped = True
+
+        task = DecodingTask(model, options)
+        eot = task.tokenizer.eot
+        if self.detect_loops:
+            task.logit_filters.append(_repetition_stop(task.sample_begin, eot, _on_stop))
+        start = time.perf_counter()
+        results = task.run(mel)
+        if options.temperature > 0:
+            self.fallbacks += 1
+            self.fallback_seconds += time.perf_counter() - start
+
+        if not self.detect_loops:
+            return results[0] if single else results
+
+        if stopped:
+            self.stopped_decodes += 1
+        for i, result in enumerate(results):
+            if not self._is_loop(result, eot):
+                continue
+            self.skipped_windows += 1
+            self.tokens_saved += max(0, task.sample_len - len(result.tokens)) if stopped else 0
+            self.decodes_saved += sum(1 for t in self.temperatures if t > options.temperature)
+            # High no-speech probability with a hopeless log-probability is what
+            # Whisper treats as silence: no temperature fallback, skip the window
+            results[i] = dataclasses.replace(
+                result, tokens=[], text="", avg_logprob=-math.inf,
+                no_speech_prob=1.0, compression_ratio=0.0,
+            )
+        return results[0] if single else results
+
+    @contextmanager
+    def attach(self, model: Any) -> Iterator["DecodeGuard"]:
+        """Route @model.decode through this guard until the block exits."""
+        if not hasattr(model, "dims"):
+            yield self  # not a Whisper model
+            return
+        model.decode = lambda mel, options=None, **kwargs: self.decode(model, mel, options, **kwargs)
+        try:
+            yield self
+        finally:
+            del model.decode
+
+    def summary(self) -> Optional[str]:
+        """Human-readable note for the results table, or None if nothing was skipped."""
+        if not self.skipped_windows:
+            return None
+        return (
+            f"repetition guard skipped {self.skipped_windows} window(s) "
+            f"(~{self.skipped_windows * _WINDOW_SECONDS:.0f}s); saved {self.decodes_saved} "
+            f"fallback decode(s), ~{self.tokens_saved} tokens"
+        )
+
+    def fallback_summary(self) -> Optional[str]:
+        """Human-readable note on temperature fallbacks, or None if none fired."""
+        if not self.fallbacks:
+            return None
+        return f"{self.fallbacks} temperature fallback(s), {self.fallback_seconds:.1f}s"
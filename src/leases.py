@@ -0,0 +1,194 @@
+"""
+Lease-based work claiming so several transcriber processes, on one or many hosts,
+can cooperatively drain one shared audio directory (e.g. over NFS).
+
+Each audio file is claimed by atomically creating `<name>.lease` in a `.leases/`
+directory next to the audio. The owner refreshes the lease's mtime on a heartbeat;
+a lease whose mtime is older than the TTL belongs to a crashed worker and is
+reclaimed by atomically renaming it away. Expiry is judged against the shared
+filesystem's own clock, so hosts do not need synchronised clocks.
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Optional
+
+LEASE_DIR_NAME = ".leases"
+_RECHECK_SECONDS = 1.0  # before a lease found missing is given up as lost
+
+
+def new_owner_id() -> str:
+    """Return a unique id for this worker process: host:pid:random."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def fs_now(lease_dir: Path, owner: str) -> float:
+    """
+    Return the current time as seen by the filesystem holding @lease_dir.
+
+    Touches a per-owner clock file and reads back its mtime, which the file
+    server sets, so lease ages are comparable across hosts.
+    """
+    clock = _clock_path(lease_dir, owner)
+    clock.touch()
+    return clock.stat().st_mtime
+
+
+def _clock_path(lease_dir: Path, owner: str) -> Path:
+    return lease_dir / f".clock-{owner.replace(':', '_')}"
+
+
+def cleanup(lease_dir: Path, owner: str) -> None:
+    """Remove this worker's clock file when it stops."""
+    try:
+        _clock_path(lease_dir, owner).unlink()
+    except FileNotFoundError:
+        pass
+
+
+class Lease:
+    """
+    A claimed lease on one audio file, kept alive by a heartbeat thread.
+
+    Use as a context manager: the heartbeat starts on enter and the lease is
+    released on exit.
+    """
+
+    def __init__(self, path: Path, owner: str, ttl: float):
+        self.path = path
+        self.owner = owner
+        self.ttl = ttl
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._heartbeat, name=f"lease-{path.stem}", daemon=True)
+
+    def _heartbeat(self) -> None:
+        while not self._stop.wait(self.ttl / 3):
+            if not self.is_owned():
+                # A reclaimer racing on a stale stat renames a live lease away
+                # and links it straight back (see try_claim()); look once more
+                if self._stop.wait(_RECHECK_SECONDS):
+                    return
+                if not self.is_owned():
+                    self.lost = True
+                    return
+            try:
+                os.utime(self.path)
+            except OSError:
+                self.lost = True
+                return
+
+    def is_owned(self) -> bool:
+        """Check the lease file still exists and names this owner."""
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8")).get("owner") == self.owner
+        except (OSError, ValueError):
+            return False
+
+    def release(self) -> None:
+        """Stop the heartbeat and remove the lease if it is still ours."""
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        if self.is_owned():
+            try:
+                self.path.unlink()
+            except OSError:
+                pass
+
+    def __enter__(self) -> "Lease":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.release()
+
+
+def _create(path: Path, owner: str) -> bool:
+    """Atomically create a lease file; False if it already exists."""
+    try:
+        fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+    except FileExistsError:
+        return False
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump({"owner": owner, "claimed_at": time.time()}, f)
+    return True
+
+
+def try_claim(lease_dir: Path, name: str, owner: str, ttl: float, now: float) -> Optional[Lease]:
+    """
+    Try to claim the lease for @name, reclaiming it if its holder has expired.
+
+    @lease_dir: Shared lease directory.
+    @name: Audio file name being claimed.
+    @owner: This worker's id (see new_owner_id()).
+    @ttl: Seconds without a heartbeat after which a lease is considered dead.
+    @now: Current filesystem time (see fs_now()).
+    @return: Lease on success, None if another live worker holds it.
+    """
+    path = lease_dir / f"{name}.lease"
+    if _create(path, owner):
+        return Lease(path, owner, ttl)
+
+    try:
+        expired = now - path.stat().st_mtime > ttl
+    except FileNotFoundError:
+        expired = True  # released between our create attempt and stat
+    if not expired:
+        return None
+
+    # Rename is atomic, so exactly one reclaimer wins a dead lease
+    stale = path.with_name(f"{path.name}.stale-{uuid.uuid4().hex[:8]}")
+    try:
+        path.rename(stale)
+    except FileNotFoundError:
+        return Lease(path, owner, ttl) if _create(path, owner) else None
+
+    # Another reclaimer may have replaced the dead lease after our stat; if we
+    # just moved a live lease, put it back (link fails if the path is taken)
+    if now - stale.stat().st_mtime <= ttl:
+        try:
+            os.link(stale, path)
+        except OSError:
+            pass
+        stale.unlink()
+        return None
+
+    stale.unlink()
+    return Lease(path, owner, ttl) if _create(path, owner) else None
+
+
+def mark_failed(lease_dir: Path, name: str, owner: str, error: str) -> int:
+    """
+    Record a failed attempt at @name.
+
+    @return: Number of failed attempts recorded so far, by any worker.
+    """
+    path = lease_dir / f"{name}.failed"
+    attempts = failed_attempts(lease_dir, name) + 1
+    tmp = path.with_name(f"{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"owner": owner, "error": error, "failed_at": time.time(), "attempts": attempts}, f)
+    os.replace(tmp, path)
+    return attempts
+
+
+def failed_attempts(lease_dir: Path, name: str) -> int:
+    """Number of failed attempts recorded for @name (0 if none)."""
+    try:
+        record = json.loads((lease_dir / f"{name}.failed").read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return 0
+    except (OSError, ValueError):
+        return 1  # half-read or foreign record: count it once
+    return int(record.get("attempts", 1))
+
+
+def is_failed(lease_dir: Path, name: str, max_attempts: int) -> bool:
+    """Return True once @name has failed @max_attempts times, so no worker retries it."""
+    return failed_attempts(lease_dir, name) >= max_attempts
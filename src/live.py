@@ -0,0 +1,232 @@
+"""
+Live transcription of an audio stream (stdin, a named pipe, or anything ffmpeg reads).
+
+Audio accumulates in a rolling buffer that is re-transcribed every `step`
+seconds of new audio. A segment is finalised once two consecutive passes agree
+on it and it ends clear of the buffer's growing edge; finalised audio is then
+dropped from the buffer, so each pass overlaps the previous one by exactly the
+still-unconfirmed audio. Whatever is not final yet is the partial hypothesis,
+revised on every pass. When the buffer reaches `max_buffer` seconds everything
+but the last segment is finalised regardless, which bounds the latency.
+"""
+
+import queue
+import subprocess
+import sys
+import threading
+from typing import IO, Any, Callable, Optional
+
+from src.audio import SAMPLE_RATE
+from src.writers import format_timestamp
+
+_CHUNK_BYTES = 3200          # 0.1 s of 16-bit mono audio at 16 kHz
+_AGREEMENT_TOLERANCE = 0.5   # seconds a segment's start may move between passes
+_PROMPT_CHARS = 200
+
+
+def _same_segment(a: dict, b: dict) -> bool:
+    return a["text"].strip() == b["text"].strip() and abs(a["start"] - b["start"]) <= _AGREEMENT_TOLERANCE
+
+
+class LiveTranscriber:
+    """
+    Incremental transcription state: feed audio, get finalised segments and a partial.
+
+    Segment times are absolute seconds from the start of the stream.
+    """
+
+    def __init__(
+        self,
+        model: Any,
+        language: Optional[str] = None,
+        task: str = "transcribe",
+        step: float = 1.0,
+        margin: float = 1.0,
+        max_buffer: float = 20.0,
+    ):
+        """
+        @model: Loaded Whisper model (or TieredModel).
+        @language: Language code, or None to detect on the first pass and keep it.
+        @task: 'transcribe' or 'translate'.
+        @step: Seconds of new audio between passes.
+        @margin: A segment must end this far before the buffer's end to be finalised.
+        @max_buffer: Buffer length (seconds) at which segments are finalised without agreement.
+        """
+        import numpy as np  # pylint: disable=import-outside-toplevel
+
+        self.model = model
+        self.language = language
+        self.task = task
+        self.step = step
+        self.margin = margin
+        self.max_buffer = max_buffer
+        self._buffer = np.zeros(0, dtype=np.float32)
+        self._offset = 0.0       # stream time of the buffer's first sample
+        self._pending = 0        # samples received since the last pass
+        self._previous: list[dict] = []
+        self._committed_text = ""
+        self.partial = ""
+
+    def _transcribe(self) -> list[dict]:
+        result = self.model.transcribe(
+            self._buffer,
+            language=self.language,
+            task=self.task,
+            temperature=0.0,
+            condition_on_previous_text=False,
+            initial_prompt=self._committed_text[-_PROMPT_CHARS:] or None,
+            verbose=None,
+        )
+        if self.language is None and result.get("language"):
+            self.language = result["language"]  # keep it stable across passes
+        return [
+            {"start": self._offset + s["start"], "end": self._offset + s["end"], "text": s["text"].strip()}
+            for s in result["segments"]
+            if s["text"].strip()
+        ]
+
+    def _commit(self, segments: list[dict]) -> None:
+        end = segments[-1]["end"]
+        drop = min(len(self._buffer), max(0, int((end - self._offset) * SAMPLE_RATE)))
+        self._buffer = self._buffer[drop:]
+        self._offset += drop / SAMPLE_RATE
+        self._committed_text += " " + " ".join(s["text"] for s in segments)
+
+    def _pass(self, final: bool) -> list[dict]:
+        self._pending = 0
+        segments = self._transcribe() if len(self._buffer) else []
+        buffer_end = self._offset + len(self._buffer) / SAMPLE_RATE
+
+        if final:
+            done = segments
+        elif len(self._buffer) / SAMPLE_RATE >= self.max_buffer:
+            done = segments[:-1] if len(segments) > 1 else segments
+            if not segments:
+                # Nothing recognisable in a full buffer (silence, music): drop all but the margin
+                keep = int(self.margin * SAMPLE_RATE)
+                self._offset += (len(self._buffer) - keep) / SAMPLE_RATE
+                self._buffer = self._buffer[-keep:]
+        else:
+            done = []
+            for i, segment in enumerate(segments):
+                agreed = i < len(self._previous) and _same_segment(segment, self._previous[i])
+                if not agreed or segment["end"] > buffer_end - self.margin:
+                    break
+                done.append(segment)
+
+        if done:
+            self._commit(done)
+        self._previous = segments[len(done):]
+        self.partial = " ".join(s["text"] for s in self._previous)
+        return done
+
+    def feed(self, samples: Any) -> list[dict]:
+        """
+        Add audio and re-transcribe once `step` seconds have accumulated.
+
+        @samples: 16 kHz mono float32 samples.
+        @return: Segments finalised by this call (possibly empty).
+        """
+        import numpy as np  # pylint: disable=import-outside-toplevel
+
+        self._buffer = np.concatenate([self._buffer, samples])
+        self._pending += len(samples)
+        if self._pending < self.step * SAMPLE_RATE:
+            return []
+        return self._pass(final=False)
+
+    def finish(self) -> list[dict]:
+        """Transcribe and finalise whatever is left at the end of the stream."""
+        done = self._pass(final=True)
+        self.partial = ""
+        return done
+
+
+def open_stream(source: str, raw: bool = False, realtime: bool = False) -> tuple[IO[bytes], Optional[subprocess.Popen]]:
+    """
+    Open an audio source as a stream of 16 kHz mono s16le bytes.
+
+    @source: '-' for stdin, or a path / named pipe / URL.
+    @raw: The source already is 16 kHz mono s16le PCM; read it directly.
+    @realtime: Have ffmpeg read the input at its native rate (simulates a live
+        source when given a file).
+    @return: (byte stream, ffmpeg process or None).
+    """
+    if raw:
+        return (sys.stdin.buffer if source == "-" else open(source, "rb")), None  # pylint: disable=consider-using-with
+
+    cmd = ["ffmpeg", "-nostdin", "-loglevel", "error"]
+    if realtime:
+        cmd.append("-re")
+    cmd += ["-i", "pipe:0" if source == "-" else source, "-f", "s16le", "-ac", "1", "-ar", str(SAMPLE_RATE), "-"]
+    if source == "-":
+        cmd.remove("-nostdin")
+    proc = subprocess.Popen(  # pylint: disable=consider-using-with
+        cmd, stdin=sys.stdin.buffer if source == "-" else subprocess.DEVNULL, stdout=subprocess.PIPE,
+    )
+    return proc.stdout, proc
+
+
+def _reader(stream: IO[bytes], chunks: "queue.Queue[Optional[bytes]]") -> None:
+    """Read the stream on its own thread so a slow pass never stalls the producer."""
+    try:
+        while True:
+            data = stream.read(_CHUNK_BYTES)
+            if not data:
+                break
+            chunks.put(data)
+    finally:
+        chunks.put(None)
+
+
+def run_live(
+    live: LiveTranscriber,
+    stream: IO[bytes],
+    on_final: Callable[[dict], None],
+    on_partial: Optional[Callable[[str], None]] = None,
+) -> None:
+    """
+    Drive @live from @stream until it ends, reporting segments as they are finalised.
+
+    Audio that arrives while a pass is running is batched into the next pass,
+    so a slow machine finalises larger steps instead of falling further behind.
+
+    @live: Transcriber state.
+    @stream: 16 kHz mono s16le byte stream (see open_stream()).
+    @on_final: Called with each finalised segment, in order.
+    @on_partial: Called with the current partial text after each pass.
+    """
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    chunks: "queue.Queue[Optional[bytes]]" = queue.Queue()
+    threading.Thread(target=_reader, args=(stream, chunks), name="live-reader", daemon=True).start()
+
+    leftover = b""
+    ended = False
+    while not ended:
+        data = [chunks.get()]
+        while not chunks.empty():
+            data.append(chunks.get_nowait())
+        if None in data:
+            ended = True
+            data = data[:data.index(None)]
+
+        raw = leftover + b"".join(data)
+        usable = len(raw) - len(raw) % 2
+        leftover = raw[usable:]
+        if usable:
+            samples = np.frombuffer(raw[:usable], np.int16).astype(np.float32) / 32768.0
+            for segment in live.feed(samples):
+                on_final(segment)
+            if on_partial:
+                on_partial(live.partial)
+
+    for segment in live.finish():
+        on_final(segment)
+    if on_partial:
+        on_partial("")
+
+
+def format_segment(segment: dict) -> str:
+    """Render a finalised segment as a '[HH:MM:SS.mmm] text' transcript line."""
+    return f"[{format_timestamp(segment['start'])}] {segment['text']}"
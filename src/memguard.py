@@ -0,0 +1,290 @@
+"""
+Memory guard: plan a batch so it fits in available memory, degrading step by step.
+
+whisper.transcribe() holds the whole waveform and its spectrogram (with the
+STFT intermediate) in memory, so a file's working set grows with its length on
+top of a roughly fixed decoding cost per model. Before a batch starts, each
+file's need is estimated from its duration and compared with available memory
+less a reserve. When it does not fit, in order:
+
+1. fewer forked workers run at once;
+2. files that still do not fit are transcribed in fixed-length chunks;
+3. files that do not fit even chunked use the configured smaller model.
+
+Each step taken is reported as a note on the affected files' results.
+
+In-process runs also journal the file in progress (JOURNAL_NAME in the output
+directory), so a run the OOM killer still takes down is reported on the next
+run, which transcribes that file chunked.
+"""
+
+import dataclasses
+import json
+import os
+import socket
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from src import config
+from src.memory import available_mb, rss_mb
+
+JOURNAL_NAME = ".memory-guard.json"
+
+# Waveform + STFT + mel for one hour of audio (float32 at 16 kHz, 100 frames/s)
+_MB_PER_AUDIO_HOUR = 1300.0
+# Decoder state and activations per model size, beyond the weights
+_DECODE_MB = {"tiny": 120, "base": 160, "small": 320, "medium": 650, "large": 1100}
+# Weights as loaded on CPU (float32)
+MODEL_MB = {"tiny": 150, "base": 290, "small": 970, "medium": 3000, "large": 6200}
+
+
+def _decode_mb(model_size: str) -> float:
+    if model_size == config.TIERED_MODEL:
+        return float(max(_DECODE_MB[config.TIERED["draft_model"]], _DECODE_MB[config.TIERED["refine_model"]]))
+    mb = float(_DECODE_MB.get(model_size, _DECODE_MB["large"]))
+    if config.DECODE_PRESETS[config.DECODE_PRESET]["beam_size"]:
+        mb *= 2  # beam search keeps several hypotheses' caches
+    return mb
+
+
+def estimate_mb(model_size: str, audio_seconds: float) -> float:
+    """Estimated working set of transcribing @audio_seconds of audio in one call, excluding weights."""
+    return _decode_mb(model_size) + _MB_PER_AUDIO_HOUR * audio_seconds / 3600
+
+
+@dataclasses.dataclass
+class MemoryPlan:
+    """How a batch should run; see plan_batch()."""
+
+    workers: int
+    chunks: dict = dataclasses.field(default_factory=dict)       # file -> chunk seconds
+    fallback: set = dataclasses.field(default_factory=set)       # files to run on the fallback model
+    no_fit: set = dataclasses.field(default_factory=set)         # files that fit nowhere
+    notes: dict = dataclasses.field(default_factory=dict)        # file -> [note, ...]
+
+    def note(self, f: object, text: str) -> None:
+        self.notes.setdefault(f, []).append(f"memory guard: {text}")
+
+
+def plan_batch(
+    durations: dict,
+    model_size: str,
+    workers: int,
+    available_mb: Optional[float],
+    chunkable: bool = True,
+) -> MemoryPlan:
+    """
+    Choose worker count, chunking, and model fallback so the batch fits in memory.
+
+    @durations: {file: audio seconds}; files without a duration are assumed to fit.
+    @model_size: Size of the loaded model (its weights are already resident).
+    @workers: Requested concurrent workers.
+    @available_mb: Memory available now (memory.available_mb()), or None to
+        skip planning.
+    @chunkable: Whether files may be transcribed in chunks (not for transcribe + translate).
+    @return: The plan.
+    """
+    plan = MemoryPlan(workers=workers)
+    if available_mb is None or not durations:
+        return plan
+    budget = available_mb - config.MEMORY_GUARD["reserve_mb"]
+    needs = {f: estimate_mb(model_size, seconds) for f, seconds in durations.items()}
+    largest = sorted(needs.values(), reverse=True)
+
+    # 1. Fewer workers: the largest files may run at the same time
+    while plan.workers > 1 and sum(largest[:plan.workers]) > budget:
+        plan.workers = max(1, plan.workers // 2)
+    if plan.workers < workers:
+        peak = sum(largest[:workers]) / 1024
+        for f in durations:
+            plan.note(f, f"{workers} -> {plan.workers} workers (est. {peak:.1f} GB, {budget / 1024:.1f} GB free)")
+
+    # Each worker gets an equal share; a file over its share needs the next step
+    share = budget / plan.workers
+    chunk_seconds = float(config.MEMORY_GUARD["chunk_seconds"])
+    fallback_size = config.MEMORY_GUARD["fallback_model"]
+    for f, need in needs.items():
+        if need <= share:
+            continue
+        # 2. Chunked processing bounds the audio held at once
+        if chunkable and estimate_mb(model_size, chunk_seconds) <= share:
+            plan.chunks[f] = chunk_seconds
+            plan.note(f, f"chunked into {chunk_seconds / 60:.0f}-minute pieces (est. {need / 1024:.1f} GB whole)")
+            continue
+        # 3. A smaller model, loaded alongside the current one
+        if fallback_size and fallback_size != model_size and fallback_size in MODEL_MB:
+            extra = MODEL_MB[fallback_size]
+            fallback_need = estimate_mb(fallback_size, chunk_seconds if chunkable else durations[f])
+            if extra + fallback_need <= budget:
+                plan.fallback.add(f)
+                if chunkable:
+                    plan.chunks[f] = chunk_seconds
+                plan.note(f, f"used '{fallback_size}' instead of '{model_size}' (est. {need / 1024:.1f} GB)")
+                continue
+        plan.no_fit.add(f)
+    return plan
+
+
+class MemoryMonitor:
+    """
+    Sample this process's RSS on a background thread to find each file's peak.
+
+    Use as a context manager; call reset() before a file and peak() after it.
+    With @floor_mb set it also watches available memory; below_floor() then
+    says whether it fell under the floor since the last reset().
+    """
+
+    def __init__(self, interval: float = 0.25, floor_mb: Optional[float] = None):
+        self.interval = interval
+        self.floor_mb = floor_mb
+        self._peak: Optional[float] = None
+        self._low: Optional[float] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _sample(self) -> None:
+        current = rss_mb()
+        if current is not None and (self._peak is None or current > self._peak):
+            self._peak = current
+        if self.floor_mb is not None:
+            available = available_mb()
+            if available is not None and available < self.floor_mb and (self._low is None or available < self._low):
+                self._low = available
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def __enter__(self) -> "MemoryMonitor":
+        self._thread = threading.Thread(target=self._run, name="memory-monitor", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def reset(self) -> None:
+        """Start a new measurement from the current RSS."""
+        self._peak = None
+        self._low = None
+        self._sample()
+
+    def below_floor(self) -> Optional[str]:
+        """Why memory is short, if available memory fell below the floor since reset(); else None."""
+        if self._low is None:
+            return None
+        return f"available memory fell to {self._low:.0f} MB"
+
+    def peak(self) -> Optional[float]:
+        """Highest RSS (MB) seen since the last reset()."""
+        self._sample()
+        return self._peak
+
+
+# ─── Journal ─────────────────────────────────────────────────────────────────
+def _write_journal(directory: Path, entry: dict) -> None:
+    path = directory / JOURNAL_NAME
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(entry), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def record_start(directory: Path, file: Path, estimate: float, available: float) -> None:
+    """
+    Journal the file about to be transcribed in this process.
+
+    A killed run's entry that no batch has replanned yet is carried along, so
+    it still reaches the next batch that includes its file.
+
+    @directory: Output directory of the run.
+    @file: Audio file.
+    @estimate: Its estimated working set in MB.
+    @available: Memory available before starting, in MB.
+    """
+    entry: dict = {
+        "file": file.name, "estimate_mb": estimate, "available_mb": available,
+        "host": socket.gethostname(), "pid": os.getpid(), "started_at": time.time(),
+    }
+    pending = interrupted(directory)
+    if pending is not None and pending.get("pid") != os.getpid():
+        pending.pop("interrupted", None)  # only the latest kill is carried
+        entry["interrupted"] = pending
+    _write_journal(directory, entry)
+
+
+def record_done(directory: Path) -> None:
+    """Clear this process's journal entry once the file is over, keeping a carried one."""
+    try:
+        entry = json.loads((directory / JOURNAL_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return
+    if entry.get("interrupted"):
+        _write_journal(directory, entry["interrupted"])
+    else:
+        (directory / JOURNAL_NAME).unlink(missing_ok=True)
+
+
+def interrupted(directory: Path) -> Optional[dict]:
+    """
+    Journal entry of a run on this host that died mid-file (e.g. OOM-killed).
+
+    @return: Dict with 'file', 'estimate_mb' and 'available_mb', or None if
+        there is none or its process is still running.
+    """
+    try:
+        entry = json.loads((directory / JOURNAL_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if entry.get("host") != socket.gethostname():
+        return None
+    if entry.get("pid") != os.getpid():
+        try:
+            os.kill(entry["pid"], 0)
+            return None  # still running
+        except (ProcessLookupError, KeyError, TypeError):
+            pass
+        except PermissionError:
+            return None  # alive, owned by someone else
+    return entry
+
+
+def replan_interrupted(plan: MemoryPlan, files: list, directory: Path, chunkable: bool = True) -> None:
+    """
+    Chunk the file a killed earlier run died on, if it is in this batch, and note why.
+
+    @plan: Plan from plan_batch(), updated in place.
+    @files: Files in the batch.
+    @directory: Output directory whose journal to read; entries are cleared
+        only once their file has been replanned.
+    @chunkable: Whether files may be transcribed in chunks.
+    """
+    entry = interrupted(directory)
+    if entry is None:
+        return
+    carried = entry.pop("interrupted", None)
+    by_name = {f.name: f for f in files}
+    remaining = []
+    for killed in [entry] + ([carried] if carried else []):
+        f = by_name.get(killed.get("file"))
+        if f is None:
+            remaining.append(killed)
+            continue
+        text = (
+            f"previous run was killed while transcribing this file "
+            f"(est. {killed.get('estimate_mb', 0) / 1024:.1f} GB, {killed.get('available_mb', 0) / 1024:.1f} GB free)"
+        )
+        if chunkable and f not in plan.chunks:
+            plan.chunks[f] = float(config.MEMORY_GUARD["chunk_seconds"])
+            text += f"; chunked into {plan.chunks[f] / 60:.0f}-minute pieces"
+        plan.note(f, text)
+
+    if len(remaining) == 1 + bool(carried):
+        return  # none of them in this batch; leave the journal for a later one
+    if remaining:
+        _write_journal(directory, remaining[0])
+    else:
+        (directory / JOURNAL_NAME).unlink(missing_ok=True)
@@ -0,0 +1,76 @@
+"""
+Process memory measurements (Linux /proc, with portable fallbacks).
+"""
+
+import os
+import resource
+import sys
+from typing import Optional
+
+
+def unique_rss_mb(pid: Optional[int] = None) -> Optional[float]:
+    """
+    Return a process's unique set size (USS) in MB: memory no other process shares.
+
+    Pages a forked worker still shares copy-on-write with its parent are not
+    counted, so this is the real cost of each extra worker.
+
+    @pid: Process id, default the current process.
+    @return: USS in MB, or None where /proc/<pid>/smaps_rollup is unavailable.
+    """
+    path = f"/proc/{pid or os.getpid()}/smaps_rollup"
+    try:
+        private_kb = 0
+        with open(path, encoding="ascii") as f:
+            for line in f:
+                if line.startswith(("Private_Clean:", "Private_Dirty:")):
+                    private_kb += int(line.split()[1])
+        return private_kb / 1024
+    except (OSError, ValueError):
+        return None
+
+
+def peak_rss_mb() -> float:
+    """Return the peak resident set size of the current process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def rss_mb(pid: Optional[int] = None) -> Optional[float]:
+    """
+    Return a process's current resident set size in MB.
+
+    @pid: Process id, default the current process.
+    @return: RSS in MB, or None where /proc/<pid>/status is unavailable.
+    """
+    try:
+        with open(f"/proc/{pid or os.getpid()}/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def available_mb() -> Optional[float]:
+    """
+    Return the memory available for new allocations without swapping, in MB.
+
+    Uses MemAvailable (which counts reclaimable page cache) where the kernel
+    reports it, else free physical pages.
+
+    @return: Available memory in MB, or None if it cannot be determined.
+    """
+    try:
+        with open("/proc/meminfo", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError):
+        pass
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_AVPHYS_PAGES") / (1024 * 1024)
+    except (ValueError, OSError, AttributeError):
+        return None
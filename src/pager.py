@@ -0,0 +1,249 @@
+"""
+Seek-based reading of very large transcripts, one page at a time.
+
+A transcript is never read whole. Pages are read from byte offsets found
+through a sparse line index (the line number and offset of the first line
+starting in each 64 KiB block), which is only built as far into the file as
+the reader has gone and counts newlines block by block. Jumping to a time
+binary-searches the file by byte offset on the [HH:MM:SS.mmm] prefixes, and
+search streams the file in blocks.
+"""
+
+import bisect
+import io
+import re
+from pathlib import Path
+from typing import IO, Any, Optional
+
+from src import archive
+
+_INDEX_BLOCK = 64 * 1024
+_SEARCH_BLOCK = 1024 * 1024
+
+_LINE_RE = re.compile(rb"^\[(\d+):(\d{2}):(\d{2})\.(\d{3})\]")
+
+
+def _line_start(line: bytes) -> Optional[float]:
+    match = _LINE_RE.match(line)
+    if not match:
+        return None
+    h, m, s, ms = match.groups()
+    return int(h) * 3600 + int(m) * 60 + int(s) + int(ms) / 1000
+
+
+def parse_time(text: str) -> Optional[float]:
+    """Parse 'HH:MM:SS(.mmm)', 'MM:SS' or plain seconds; None if malformed."""
+    try:
+        parts = [float(p) for p in text.strip().split(":")]
+    except ValueError:
+        return None
+    if not 1 <= len(parts) <= 3 or any(p < 0 for p in parts):
+        return None
+    seconds = 0.0
+    for part in parts:
+        seconds = seconds * 60 + part
+    return seconds
+
+
+class TranscriptPager:
+    """
+    Random access by line number and timestamp over a seekable binary file.
+
+    Line numbers are 0-based. Use as a context manager, or call close().
+    """
+
+    def __init__(self, f: IO[bytes]):
+        """
+        @f: Transcript opened in binary mode; owned (and closed) by the pager.
+        """
+        self._f = f
+        self.size = f.seek(0, io.SEEK_END)
+        # Sparse index: line number and byte offset of the first line starting in each block
+        self._lines = [0]
+        self._offsets = [0]
+        self._scanned = 0          # bytes covered by the index
+        self._scanned_lines = 0    # newlines in those bytes
+        self.line_count: Optional[int] = None  # known once the index reaches the end
+
+    @classmethod
+    def open(cls, path: Path) -> "TranscriptPager":
+        """
+        Open a transcript from disk, or stream it out of its directory's archive.
+
+        Archived transcripts are decompressed one frame at a time into an
+        anonymous temporary file, so they never sit in memory whole either.
+
+        @path: Path where the file would be in the transcript directory.
+        @return: A pager over the file.
+        """
+        try:
+            return cls(open(path, "rb"))
+        except FileNotFoundError:
+            return cls(archive.open_archived(path.name, path.parent))
+
+    def close(self) -> None:
+        self._f.close()
+
+    def __enter__(self) -> "TranscriptPager":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    # ─── Index ───────────────────────────────────────────────────────────────
+    def _extend(self, line: Optional[int] = None, offset: Optional[int] = None) -> None:
+        """Index blocks until @line starts within the indexed bytes, @offset is covered, or EOF."""
+        while self.line_count is None and (
+            (line is not None and self._scanned_lines < line)
+            or (offset is not None and self._scanned < offset)
+        ):
+            self._f.seek(self._scanned)
+            block = self._f.read(_INDEX_BLOCK)
+            if not block:
+                # A last line without a trailing newline still counts
+                unterminated = False
+                if self.size:
+                    self._f.seek(-1, io.SEEK_END)
+                    unterminated = self._f.read(1) != b"\n"
+                self.line_count = self._scanned_lines + unterminated
+                break
+            first = block.find(b"\n")
+            if first >= 0 and self._scanned + first + 1 < self.size:
+                self._lines.append(self._scanned_lines + 1)
+                self._offsets.append(self._scanned + first + 1)
+            self._scanned_lines += block.count(b"\n")
+            self._scanned += len(block)
+
+    def offset_of(self, line: int) -> Optional[int]:
+        """Byte offset where @line starts, or None past the last line."""
+        if line < 0:
+            return None
+        self._extend(line=line)
+        if self._scanned_lines < line or (self.line_count is not None and line >= self.line_count):
+            return None
+        i = bisect.bisect_right(self._lines, line) - 1
+        self._f.seek(self._offsets[i])
+        for _ in range(line - self._lines[i]):
+            self._f.readline()
+        offset = self._f.tell()
+        return offset if offset < self.size else None
+
+    def line_at(self, offset: int) -> int:
+        """Number of the line containing byte @offset."""
+        offset = max(0, min(offset, self.size))
+        self._extend(offset=offset)
+        i = bisect.bisect_right(self._offsets, offset) - 1
+        self._f.seek(self._offsets[i])
+        return self._lines[i] + self._f.read(offset - self._offsets[i]).count(b"\n")
+
+    # ─── Reading ─────────────────────────────────────────────────────────────
+    def read_lines(self, start: int, count: int) -> list[str]:
+        """Up to @count lines from line @start, without line endings."""
+        offset = self.offset_of(start)
+        if offset is None:
+            return []
+        self._f.seek(offset)
+        lines = []
+        for _ in range(count):
+            raw = self._f.readline()
+            if not raw:
+                break
+            lines.append(raw.decode("utf-8", errors="replace").rstrip("\r\n"))
+        return lines
+
+    def has_line(self, line: int) -> bool:
+        return self.offset_of(line) is not None
+
+    def find_time(self, seconds: float) -> int:
+        """
+        Line of the first segment starting at or after @seconds.
+
+        Binary search over byte offsets: each probe seeks into the file, skips
+        to the next line start and reads forward to the next timestamp, so
+        only a few lines per probe are read however large the file is.
+
+        @seconds: Time to jump to.
+        @return: Line number, or the last line's if every segment starts earlier.
+        """
+        lo, hi = 0, self.size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            ts, _ = self._timestamp_after(mid)
+            if ts is None or ts >= seconds:
+                hi = mid
+            else:
+                lo = mid + 1
+        ts, offset = self._timestamp_after(lo)
+        if ts is None:
+            offset = self._last_timestamp()
+        return self.line_at(offset)
+
+    def _last_timestamp(self) -> int:
+        """Offset of the last [HH:MM:SS.mmm] line, reading backwards a block at a time; 0 if none."""
+        end = self.size
+        while end > 0:
+            start = max(0, end - _INDEX_BLOCK)
+            self._f.seek(start)
+            block = self._f.read(end - start)
+            # Only line starts after a newline are certain, except at the start of the file
+            first = 0 if start == 0 else block.find(b"\n") + 1
+            starts = [first + m.end() for m in re.finditer(b"\n", block[first:-1])]
+            if start == 0 or first:
+                starts.insert(0, first)
+            for pos in reversed(starts):
+                if _line_start(block[pos:pos + 32]) is not None:
+                    return start + pos
+            # Rescan the line cut off at the block start (without its newline) next
+            end = start + max(first - 1, 0)
+        return 0
+
+    def _timestamp_after(self, offset: int) -> tuple[Optional[float], int]:
+        """First [HH:MM:SS.mmm] line starting at or after @offset, as (seconds, offset)."""
+        if offset:
+            self._f.seek(offset - 1)
+            self._f.readline()  # finish the line containing @offset - 1
+        else:
+            self._f.seek(0)
+        pos = self._f.tell()
+        while True:
+            line = self._f.readline()
+            if not line:
+                return None, self.size
+            ts = _line_start(line)
+            if ts is not None:
+                return ts, pos
+            pos += len(line)
+
+    def search(self, query: str, start: int = 0) -> Optional[int]:
+        """
+        Find the first line at or after @start containing @query (case-insensitive).
+
+        The file is streamed in 1 MiB blocks cut at line ends; only the block
+        being searched is held in memory.
+
+        @query: Text to find.
+        @start: Line to start from.
+        @return: Line number of the match, or None.
+        """
+        needle = query.lower()
+        offset = self.offset_of(start)
+        if not needle or offset is None:
+            return None
+        self._f.seek(offset)
+        line = start
+        carry = b""
+        while True:
+            block = self._f.read(_SEARCH_BLOCK)
+            data = carry + block
+            if not data:
+                return None
+            cut = data.rfind(b"\n") + 1 if block else len(data)
+            if cut == 0:
+                carry = data  # a single line longer than the block
+                continue
+            carry = data[cut:]
+            text = data[:cut].decode("utf-8", errors="replace").lower()
+            pos = text.find(needle)
+            if pos >= 0:
+                return line + text.count("\n", 0, pos)
+            line += text.count("\n")
@@ -0,0 +1,90 @@
+"""
+Background model loading, started from the TUI so the model is warm by the time
+the user confirms their settings.
+
+This module is imported by ui.py, so it must stay light: whisper/torch are only
+imported inside the loader thread.
+"""
+
+import threading
+from concurrent.futures import CancelledError, Future
+from typing import Any, Optional
+
+_lock = threading.Lock()
+_pending: Optional[tuple[str, Future, threading.Event]] = None
+_loader: Optional[threading.Thread] = None  # thread of the most recent load
+
+
+def _load(model_size: str, future: Future, cancel: threading.Event, previous: Optional[threading.Thread]) -> None:
+    # Never hold two models in memory at once: a replaced load stops at its
+    # next step (see transcriber.load_model()) and this one waits for it
+    if previous is not None:
+        previous.join()
+    if not future.set_running_or_notify_cancel():
+        return
+    try:
+        from src.transcriber import load_model  # pylint: disable=import-outside-toplevel
+        future.set_result(load_model(model_size, cancel=cancel))
+    except BaseException as e:  # pylint: disable=broad-exception-caught
+        future.set_exception(e)
+
+
+def _discard() -> None:
+    """Drop the current load; one in progress is abandoned at its next step."""
+    global _pending
+    if _pending is not None:
+        _pending[1].cancel()
+        _pending[2].set()
+        _pending = None
+
+
+def start(model_size: str) -> None:
+    """
+    Begin loading @model_size in a background thread.
+
+    Does nothing if that size is already loading or loaded; a different size
+    replaces the previous load, which is abandoned and finishes before the new
+    one starts.
+
+    @model_size: Model size accepted by transcriber.load_model().
+    """
+    global _pending, _loader
+    with _lock:
+        if _pending is not None and _pending[0] == model_size:
+            future = _pending[1]
+            if not (future.done() and (future.cancelled() or future.exception() is not None)):
+                return
+        _discard()
+        future, cancel = Future(), threading.Event()
+        _pending = (model_size, future, cancel)
+        _loader = threading.Thread(
+            target=_load, args=(model_size, future, cancel, _loader), name=f"preload-{model_size}", daemon=True,
+        )
+        _loader.start()
+
+
+def cancel() -> None:
+    """Forget any preloaded model and abandon an in-flight load."""
+    with _lock:
+        _discard()
+
+
+def get(model_size: str) -> Any:
+    """
+    Return the model for @model_size, attaching to an in-flight preload if one
+    matches and loading synchronously otherwise.
+
+    The loaded model stays cached here, so a later run with the same size
+    starts immediately.
+
+    @model_size: Model size accepted by transcriber.load_model().
+    @return: Loaded Whisper model instance.
+    """
+    start(model_size)
+    with _lock:
+        future = _pending[1]
+    from src.transcriber import LoadCancelled, load_model  # pylint: disable=import-outside-toplevel
+    try:
+        return future.result()
+    except (CancelledError, LoadCancelled):
+        return load_model(model_size)
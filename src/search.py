@@ -0,0 +1,323 @@
+"""
+Full-text search over transcripts backed by an incrementally updated SQLite FTS5 index.
+"""
+
+import os
+import re
+import sqlite3
+from pathlib import Path
+from typing import Iterable, Optional
+
+from src import archive, config
+
+# Marks the matched terms inside search snippets
+HIGHLIGHT_START = "\x02"
+HIGHLIGHT_END = "\x03"
+
+_LINE_RE = re.compile(r"^\[(\d+):(\d{2}):(\d{2})\.(\d{3})\]\s?(.*)$")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS segments (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL REFERENCES files(id),
+    start REAL NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS segments_file ON segments(file_id);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS segments_fts USING fts5(
+    text, content='segments', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS segments_ai AFTER INSERT ON segments BEGIN
+    INSERT INTO segments_fts(rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS segments_ad AFTER DELETE ON segments BEGIN
+    INSERT INTO segments_fts(segments_fts, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+"""
+
+
+def open_index(path: Optional[Path] = None) -> sqlite3.Connection:
+    """
+    Open (creating if needed) the search index database.
+
+    @path: Database location, defaults to config.SEARCH_INDEX_PATH.
+    @return: Open SQLite connection.
+    """
+    path = path or config.SEARCH_INDEX_PATH
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    try:
+        conn.executescript(_SCHEMA)
+    except sqlite3.OperationalError as e:
+        conn.close()
+        if "fts5" in str(e):
+            raise RuntimeError("Transcript search needs SQLite with FTS5 support") from e
+        raise
+    return conn
+
+
+def _parse_lines(lines: Iterable[str]) -> list[tuple[float, str]]:
+    """Parse [HH:MM:SS.mmm] transcript lines into (start_seconds, text) pairs."""
+    segments: list[tuple[float, str]] = []
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        match = _LINE_RE.match(line)
+        if match:
+            h, m, s, ms, text = match.groups()
+            start = int(h) * 3600 + int(m) * 60 + int(s) + int(ms) / 1000
+            segments.append((start, text))
+        elif segments:
+            start, text = segments[-1]
+            segments[-1] = (start, f"{text} {line}")
+        else:
+            segments.append((0.0, line))
+    return segments
+
+
+def _parse_segments(path: Path) -> list[tuple[float, str]]:
+    """Parse a [HH:MM:SS.mmm] transcript file into (start_seconds, text) pairs."""
+    with open(path, encoding="utf-8", errors="replace") as f:
+        return _parse_lines(f)
+
+
+def _is_transcript(name: str) -> bool:
+    return name.endswith(".txt") and not name.endswith("_summary.txt")
+
+
+def _index_file(
+    conn: sqlite3.Connection,
+    name: str,
+    mtime_ns: int,
+    size: int,
+    segments: list[tuple[float, str]],
+) -> None:
+    """Replace the indexed segments of a single transcript."""
+    row = conn.execute("SELECT id FROM files WHERE name = ?", (name,)).fetchone()
+    if row:
+        file_id = row[0]
+        conn.execute("DELETE FROM segments WHERE file_id = ?", (file_id,))
+        conn.execute(
+            "UPDATE files SET mtime_ns = ?, size = ? WHERE id = ?",
+            (mtime_ns, size, file_id),
+        )
+    else:
+        file_id = conn.execute(
+            "INSERT INTO files (name, mtime_ns, size) VALUES (?, ?, ?)",
+            (name, mtime_ns, size),
+        ).lastrowid
+
+    conn.executemany(
+        "INSERT INTO segments (file_id, start, text) VALUES (?, ?, ?)",
+        ((file_id, start, text) for start, text in segments),
+    )
+
+
+def _remove_file(conn: sqlite3.Connection, name: str) -> None:
+    row = conn.execute("SELECT id FROM files WHERE name = ?", (name,)).fetchone()
+    if row:
+        conn.execute("DELETE FROM segments WHERE file_id = ?", (row[0],))
+        conn.execute("DELETE FROM files WHERE id = ?", (row[0],))
+
+
+def index_transcript(path: Path, conn: Optional[sqlite3.Connection] = None) -> None:
+    """
+    Add or refresh one transcript in the index (called as transcripts are written).
+
+    @path: Path to the transcript .txt file.
+    @conn: Open index connection, or None to open the default index.
+    """
+    own = conn is None
+    conn = conn or open_index()
+    try:
+        st = path.stat()
+        with conn:
+            _index_file(conn, path.name, st.st_mtime_ns, st.st_size, _parse_segments(path))
+    finally:
+        if own:
+            conn.close()
+
+
+def sync_index(directory: Optional[Path] = None, conn: Optional[sqlite3.Connection] = None) -> int:
+    """
+    Bring the index up to date with a transcript directory (a full rebuild check).
+
+    Only files whose mtime or size changed are re-parsed; deleted files are dropped.
+    Transcripts moved into the directory's archive stay indexed. Searches call
+    sync_if_changed() instead, which skips this scan while no transcript changed.
+
+    @directory: Transcript directory, defaults to config.DEFAULT_OUTPUT_DIR.
+    @conn: Open index connection, or None to open the default index.
+    @return: Number of transcripts (re)indexed.
+    """
+    directory = directory or config.DEFAULT_OUTPUT_DIR
+    own = conn is None
+    conn = conn or open_index()
+    try:
+        # Read before scanning, so changes made during the scan trigger another sync
+        mtime_ns = _dir_mtime_ns(directory)
+        indexed = {
+            name: (mtime_ns, size)
+            for name, mtime_ns, size in conn.execute("SELECT name, mtime_ns, size FROM files")
+        }
+        on_disk: dict[str, os.stat_result] = {}
+        if directory.exists():
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.is_file() and _is_transcript(entry.name):
+                        on_disk[entry.name] = entry.stat()
+        archived = {
+            name: version for name, version in archive.list_entries(directory).items()
+            if _is_transcript(name) and name not in on_disk
+        }
+
+        changed = 0
+        with conn:
+            for name in indexed.keys() - on_disk.keys() - archived.keys():
+                _remove_file(conn, name)
+            for name, st in on_disk.items():
+                if indexed.get(name) != (st.st_mtime_ns, st.st_size):
+                    _index_file(conn, name, st.st_mtime_ns, st.st_size, _parse_segments(directory / name))
+                    changed += 1
+            for name, (mtime_ns, size) in archived.items():
+                if indexed.get(name) != (mtime_ns, size):
+                    text = archive.read_archived(name, directory)
+                    _index_file(conn, name, mtime_ns, size, _parse_lines(text.splitlines()))
+                    changed += 1
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                (_synced_key(directory), str(mtime_ns)),
+            )
+        return changed
+    finally:
+        if own:
+            conn.close()
+
+
+def _dir_mtime_ns(directory: Path) -> int:
+    try:
+        return directory.stat().st_mtime_ns
+    except FileNotFoundError:
+        return 0
+
+
+def _synced_key(directory: Path) -> str:
+    return f"synced_mtime_ns:{directory.resolve()}"
+
+
+def _edited(directory: Path, conn: sqlite3.Connection) -> bool:
+    """Whether any transcript in @directory differs in mtime or size from its indexed copy."""
+    indexed = {
+        name: (mtime_ns, size)
+        for name, mtime_ns, size in conn.execute("SELECT name, mtime_ns, size FROM files")
+    }
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.is_file() and _is_transcript(entry.name):
+                    st = entry.stat()
+                    if indexed.get(entry.name) != (st.st_mtime_ns, st.st_size):
+                        return True
+    except FileNotFoundError:
+        pass
+    return False
+
+
+def sync_if_changed(directory: Optional[Path] = None, conn: Optional[sqlite3.Connection] = None) -> int:
+    """
+    Run sync_index() only if transcripts were added, removed, renamed or edited since the last sync.
+
+    The directory's own mtime covers added, removed and renamed files; edits
+    in place (an editor saving over a transcript) only show in the file's own
+    mtime and size, so those are compared too. Nothing is re-parsed or read
+    from the archive while everything matches.
+
+    @directory: Transcript directory, defaults to config.DEFAULT_OUTPUT_DIR.
+    @conn: Open index connection, or None to open the default index.
+    @return: Number of transcripts (re)indexed.
+    """
+    directory = directory or config.DEFAULT_OUTPUT_DIR
+    own = conn is None
+    conn = conn or open_index()
+    try:
+        row = conn.execute("SELECT value FROM meta WHERE key = ?", (_synced_key(directory),)).fetchone()
+        if row and int(row[0]) == _dir_mtime_ns(directory) and not _edited(directory, conn):
+            return 0
+        return sync_index(directory, conn)
+    finally:
+        if own:
+            conn.close()
+
+
+def format_snippet(snippet: str) -> str:
+    """Escape a search snippet for Rich markup and highlight the matched terms."""
+    from rich.markup import escape  # pylint: disable=import-outside-toplevel
+
+    return (
+        escape(snippet)
+        .replace(HIGHLIGHT_START, "[bold yellow]")
+        .replace(HIGHLIGHT_END, "[/bold yellow]")
+    )
+
+
+def _quote_terms(query: str) -> str:
+    """Turn free text into an FTS5 query of quoted terms (implicit AND)."""
+    return " ".join('"' + term.replace('"', '""') + '"' for term in query.split())
+
+
+def search(
+    query: str,
+    limit: int = 50,
+    conn: Optional[sqlite3.Connection] = None,
+) -> list[dict]:
+    """
+    Search indexed transcripts, best matches first.
+
+    FTS5 query syntax (phrases, OR, NEAR, prefix*) is accepted; input that fails to
+    parse is retried as plain quoted terms.
+
+    @query: Search terms.
+    @limit: Maximum number of hits to return.
+    @conn: Open index connection, or None to open the default index.
+    @return: List of dicts with keys 'file', 'start' (seconds), and 'snippet'.
+    """
+    if not query.strip():
+        return []
+
+    sql = (
+        "SELECT f.name, s.start, snippet(segments_fts, 0, ?, ?, '...', 16) "
+        "FROM segments_fts "
+        "JOIN segments s ON s.id = segments_fts.rowid "
+        "JOIN files f ON f.id = s.file_id "
+        "WHERE segments_fts MATCH ? ORDER BY rank LIMIT ?"
+    )
+
+    own = conn is None
+    conn = conn or open_index()
+    try:
+        try:
+            rows = conn.execute(sql, (HIGHLIGHT_START, HIGHLIGHT_END, query, limit)).fetchall()
+        except sqlite3.OperationalError:
+            try:
+                rows = conn.execute(
+                    sql, (HIGHLIGHT_START, HIGHLIGHT_END, _quote_terms(query), limit)
+                ).fetchall()
+            except sqlite3.OperationalError:
+                rows = []
+        return [{"file": name, "start": start, "snippet": snippet} for name, start, snippet in rows]
+    finally:
+        if own:
+            conn.close()
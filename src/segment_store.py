@@ -0,0 +1,249 @@
+"""
+Append-only store of every transcribed segment with its file and run metadata.
+
+Each transcription adds one row to `runs` and one typed row per segment to
+`segments`, in an SQLite database beside the transcripts (`segments.db`).
+Re-transcribing a file adds a new run rather than replacing the old one; the
+`latest_runs` view selects the most recent run per file for aggregates.
+"""
+
+import csv
+import json
+import math
+import platform
+import sqlite3
+import time
+from pathlib import Path
+from typing import IO, Any, Optional
+
+from src import config
+
+STORE_NAME = "segments.db"
+GROUP_BY = {
+    "language": "r.language",
+    "model": "r.model",
+    "task": "r.task",
+    "preset": "r.decode_preset",
+    "file": "r.file",
+    "day": "date(r.created_at, 'unixepoch', 'localtime')",
+}
+EXPORT_COLUMNS = [
+    "run_id", "file", "model", "task", "language", "decode_preset", "created_at",
+    "seq", "start", "end", "text", "avg_logprob", "no_speech_prob", "compression_ratio", "temperature",
+]
+_BUSY_TIMEOUT = 30.0  # forked workers record concurrently
+_EXPORT_BATCH = 10000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    file TEXT NOT NULL,
+    audio_key TEXT,
+    model TEXT NOT NULL,
+    task TEXT NOT NULL,
+    language TEXT,
+    decode_preset TEXT,
+    device TEXT,
+    host TEXT,
+    created_at REAL NOT NULL,
+    elapsed_seconds REAL,
+    segment_count INTEGER NOT NULL,
+    speech_seconds REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_file ON runs(file);
+CREATE TABLE IF NOT EXISTS segments (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    seq INTEGER NOT NULL,
+    start REAL NOT NULL,
+    "end" REAL NOT NULL,
+    text TEXT NOT NULL,
+    avg_logprob REAL,
+    no_speech_prob REAL,
+    compression_ratio REAL,
+    temperature REAL,
+    PRIMARY KEY (run_id, seq)
+) WITHOUT ROWID;
+CREATE VIEW IF NOT EXISTS latest_runs AS
+    SELECT * FROM runs WHERE id IN (SELECT MAX(id) FROM runs GROUP BY file);
+"""
+
+
+def store_path(directory: Optional[Path] = None) -> Path:
+    """Location of the store for a transcript directory (default config.DEFAULT_OUTPUT_DIR)."""
+    return (directory or config.DEFAULT_OUTPUT_DIR) / STORE_NAME
+
+
+def open_store(path: Optional[Path] = None) -> sqlite3.Connection:
+    """
+    Open (creating if needed) the segment store.
+
+    @path: Database location, defaults to store_path().
+    @return: Open SQLite connection.
+    """
+    path = path or store_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=_BUSY_TIMEOUT)
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _finite(value: Any) -> Optional[float]:
+    """SQLite stores -inf fine but CSV/JSON consumers choke on it; keep only finite floats."""
+    if value is None:
+        return None
+    value = float(value)
+    return value if math.isfinite(value) else None
+
+
+def record_run(
+    result: dict,
+    file: str,
+    model: str,
+    task: str,
+    path: Path,
+    audio_key: Optional[str] = None,
+    decode_preset: Optional[str] = None,
+    device: Optional[str] = None,
+    elapsed_seconds: Optional[float] = None,
+) -> int:
+    """
+    Append one transcription and all its segments.
+
+    @result: Dict returned by model.transcribe().
+    @file: Audio file name.
+    @model: Model size (or 'tiered').
+    @task: Whisper task.
+    @path: Store location (see store_path()).
+    @audio_key: Key of the audio file (cache.file_key()).
+    @decode_preset: Decoding preset in use.
+    @device: 'cpu' or 'cuda'.
+    @elapsed_seconds: Wall time of the transcription.
+    @return: The new run id.
+    """
+    segments = result["segments"]
+    conn = open_store(path)
+    try:
+        with conn:
+            run_id = conn.execute(
+                "INSERT INTO runs (file, audio_key, model, task, language, decode_preset, device, host, "
+                "created_at, elapsed_seconds, segment_count, speech_seconds) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    file, audio_key, model, task, result.get("language"), decode_preset, device,
+                    platform.node(), time.time(), elapsed_seconds, len(segments),
+                    sum(max(0.0, s["end"] - s["start"]) for s in segments),
+                ),
+            ).lastrowid
+            conn.executemany(
+                'INSERT INTO segments (run_id, seq, start, "end", text, avg_logprob, no_speech_prob, '
+                "compression_ratio, temperature) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (
+                        run_id, i, float(s["start"]), float(s["end"]), s["text"].strip(),
+                        _finite(s.get("avg_logprob")), _finite(s.get("no_speech_prob")),
+                        _finite(s.get("compression_ratio")), _finite(s.get("temperature")),
+                    )
+                    for i, s in enumerate(segments)
+                ),
+            )
+        return run_id
+    finally:
+        conn.close()
+
+
+def aggregate(
+    by: str = "language",
+    latest_only: bool = True,
+    conn: Optional[sqlite3.Connection] = None,
+) -> list[dict]:
+    """
+    Totals and average confidence grouped by one run attribute.
+
+    Confidence averages are weighted by segment duration, so a long segment
+    counts for more than a one-word one.
+
+    @by: Key of GROUP_BY.
+    @latest_only: Count only the most recent run of each file.
+    @conn: Open store connection, or None to open the default store.
+    @return: Dicts with 'key', 'runs', 'files', 'segments', 'speech_hours',
+        'audio_hours' (speech plus gaps up to the last segment), 'avg_logprob',
+        'confidence' (exp of avg_logprob) and 'no_speech_prob', largest first.
+    """
+    runs = "latest_runs" if latest_only else "runs"
+    sql = f"""
+        SELECT {GROUP_BY[by]} AS key,
+               COUNT(DISTINCT r.id), COUNT(DISTINCT r.file), COUNT(s.seq),
+               SUM(s."end" - s.start) / 3600.0,
+               SUM(s.avg_logprob * (s."end" - s.start)) / SUM(CASE WHEN s.avg_logprob IS NOT NULL
+                   THEN s."end" - s.start END),
+               SUM(s.no_speech_prob * (s."end" - s.start)) / SUM(CASE WHEN s.no_speech_prob IS NOT NULL
+                   THEN s."end" - s.start END)
+        FROM {runs} r JOIN segments s ON s.run_id = r.id
+        GROUP BY key ORDER BY 5 DESC
+    """
+    own = conn is None
+    conn = conn or open_store()
+    try:
+        rows = conn.execute(sql).fetchall()
+        audio = dict(conn.execute(
+            f"SELECT {GROUP_BY[by]} AS key, SUM(m.last_end) / 3600.0 FROM {runs} r "
+            'JOIN (SELECT run_id, MAX("end") AS last_end FROM segments GROUP BY run_id) m ON m.run_id = r.id '
+            "GROUP BY key"
+        ).fetchall())
+    finally:
+        if own:
+            conn.close()
+    return [
+        {
+            "key": key, "runs": n_runs, "files": n_files, "segments": n_segments,
+            "speech_hours": speech or 0.0, "audio_hours": audio.get(key) or 0.0,
+            "avg_logprob": logprob, "confidence": math.exp(logprob) if logprob is not None else None,
+            "no_speech_prob": no_speech,
+        }
+        for key, n_runs, n_files, n_segments, speech, logprob, no_speech in rows
+    ]
+
+
+def export(
+    out: IO[str],
+    fmt: str = "csv",
+    latest_only: bool = True,
+    conn: Optional[sqlite3.Connection] = None,
+) -> int:
+    """
+    Stream every segment with its run metadata as CSV or JSON Lines.
+
+    @out: Text stream to write to.
+    @fmt: 'csv' or 'jsonl'.
+    @latest_only: Export only the most recent run of each file.
+    @conn: Open store connection, or None to open the default store.
+    @return: Number of segments written.
+    """
+    runs = "latest_runs" if latest_only else "runs"
+    sql = (
+        "SELECT r.id, r.file, r.model, r.task, r.language, r.decode_preset, r.created_at, "
+        's.seq, s.start, s."end", s.text, s.avg_logprob, s.no_speech_prob, s.compression_ratio, s.temperature '
+        f"FROM {runs} r JOIN segments s ON s.run_id = r.id ORDER BY r.id, s.seq"
+    )
+    writer = csv.writer(out) if fmt == "csv" else None
+    if writer:
+        writer.writerow(EXPORT_COLUMNS)
+
+    own = conn is None
+    conn = conn or open_store()
+    written = 0
+    try:
+        cursor = conn.execute(sql)
+        while True:
+            rows = cursor.fetchmany(_EXPORT_BATCH)
+            if not rows:
+                break
+            if writer:
+                writer.writerows(rows)
+            else:
+                out.writelines(json.dumps(dict(zip(EXPORT_COLUMNS, row)), ensure_ascii=False) + "\n" for row in rows)
+            written += len(rows)
+    finally:
+        if own:
+            conn.close()
+    return written
@@ -14,10 +14,13 @@ _BACK_LABEL = [("bold", "BACK")]
 
 # Settings that can be edited interactively
 _EDITABLE_SETTINGS: list[dict] = [
-    {"key": "model_size", "label": "Default Model Size", "choices": config.MODEL_SIZES},
+    {"key": "model_size", "label": "Default Model Size", "choices": config.MODEL_SIZES + [config.TIERED_MODEL]},
     {"key": "language", "label": "Default Language", "choices": ["auto"] + [l.lower() for l in config.LANGUAGES]},
     {"key": "task", "label": "Default Task", "choices": config.TASKS},
+    {"key": "device", "label": "Compute Device", "choices": config.DEVICES},
+    {"key": "decode_preset", "label": "Decoding Preset", "choices": list(config.DECODE_PRESETS)},
     {"key": "summary_style", "label": "Summary Style", "choices": list(config.SUMMARY_STYLE_MAP.values())},
+    {"key": "summarizer_backend", "label": "Summarizer", "choices": config.SUMMARIZER_BACKENDS},
     {"key": "gemini_model", "label": "Gemini Model", "choices": None},  # free text
 ]
 
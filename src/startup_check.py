@@ -0,0 +1,115 @@
+"""
+Start-up import-time budget check: `python -m src.startup_check`.
+
+Runs short, non-interactive invocations of the CLI under `python -X importtime`
+and fails (exit status 1) when one of them imports a heavy module it has no use
+for (the TUI, YAML parsing on a warm config cache, Whisper and its stack) or
+exits with an error. Import time is measured on top of a bare `python -c pass`
+on the same machine and checked against a budget; going over it is reported
+as a warning, and only fails the check with --strict, since timings depend on
+the machine. Meant for CI or a pre-release run after changing imports.
+"""
+
+import argparse
+import re
+import subprocess
+import sys
+from typing import Optional
+
+from src.config import ROOT
+
+# Invocation -> top-level modules it must not import
+CHECKS: dict[tuple[str, ...], tuple[str, ...]] = {
+    ("--help",): ("rich", "questionary", "yaml", "whisper", "torch", "numpy", "google"),
+    ("stats", "--by", "model"): ("questionary", "yaml", "whisper", "torch", "numpy", "google"),
+}
+DEFAULT_BUDGET_MS = 150.0
+
+_LINE_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+
+def measure(args: tuple[str, ...], module: Optional[str] = "src") -> tuple[float, dict[str, float], set[str], int]:
+    """
+    Run `python -X importtime -m src <args>` once.
+
+    @args: CLI arguments.
+    @module: Module to run, or None to run `python -c pass` (the interpreter's
+        own start-up imports).
+    @return: (total import time in ms, {top-level import: cumulative ms},
+        top-level package of every module imported, exit status).
+    """
+    command = ["-m", module, *args] if module else ["-c", "pass"]
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *command],
+        cwd=ROOT, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+        text=True, check=False,
+    )
+    total = 0.0
+    top: dict[str, float] = {}
+    packages: set[str] = set()
+    for line in proc.stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        total += int(self_us) / 1000
+        packages.add(name.split(".")[0])
+        if len(indent) == 1:
+            top[name] = int(cumulative_us) / 1000
+    return total, top, packages, proc.returncode
+
+
+def check(budget_ms: float = DEFAULT_BUDGET_MS, runs: int = 3, strict: bool = False) -> bool:
+    """
+    Measure every invocation in CHECKS against @budget_ms and print a report.
+
+    Each invocation runs @runs times and its fastest run counts, which filters
+    out a cold disk cache or a busy machine. One unmeasured run first makes
+    sure the config cache is warm. The fastest bare `python -c pass` is
+    subtracted, so the budget covers only what the CLI imports.
+
+    @budget_ms: Import time per invocation beyond a bare interpreter.
+    @runs: Measured runs per invocation.
+    @strict: Fail invocations over @budget_ms instead of only warning.
+    @return: True if every invocation passed.
+    """
+    measure(("--help",))
+    baseline = min(measure((), module=None)[0] for _ in range(runs))
+    print(f"     {baseline:6.1f} ms  python -c pass (subtracted)")
+    passed = True
+    for args, forbidden in CHECKS.items():
+        total, top, packages, status = min((measure(args) for _ in range(runs)), key=lambda r: r[0])
+        total = max(0.0, total - baseline)
+        heavy = sorted(packages & set(forbidden))
+        slow = total > budget_ms
+        ok = not heavy and status == 0 and not (strict and slow)
+        passed &= ok
+        label = "FAIL" if not ok else "SLOW" if slow else "ok  "
+        print(f"{label} {total:6.1f} ms  transcriber {' '.join(args)}")
+        for name, ms in sorted(top.items(), key=lambda item: -item[1])[:5]:
+            print(f"         {ms:6.1f} ms  {name}")
+        if heavy:
+            print(f"         unexpected imports: {', '.join(heavy)}")
+        if slow:
+            print(f"         over the {budget_ms:.0f} ms budget")
+        if status:
+            print(f"         exited with status {status}")
+    return passed
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Command-line entry point; exits with status 1 when a check fails."""
+    parser = argparse.ArgumentParser(prog="python -m src.startup_check", description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+        help="Import-time budget per invocation, beyond a bare `python -c pass`",
+    )
+    parser.add_argument("--runs", type=int, default=3, help="Runs per invocation (the fastest counts)")
+    parser.add_argument("--strict", action="store_true", help="Fail, rather than warn, when over the budget")
+    args = parser.parse_args(argv)
+    if not check(args.budget_ms, max(1, args.runs), strict=args.strict):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,28 @@
 """
-Gemini-based transcript summarization.
+Transcript summarization via a configurable backend.
+
+'gemini' sends the transcript to the Gemini API; 'extractive' picks the most
+central sentences offline (see src/extractive.py).
 """
 
 import os
+import re
 import time
 from pathlib import Path
+from typing import Callable, Optional
+
+from src.archive import read_transcript
+from src.config import GEMINI_MODEL, SUMMARIZER_BACKEND, SUMMARY_PACK_TOKENS
 
-from src.config import GEMINI_MODEL
 _MIN_REQUEST_INTERVAL = 4.0
 _last_request_time: float = 0.0
 
+# Packing: rough token estimate, per-section overhead, and a cap on sections per request
+_CHARS_PER_TOKEN = 4
+_SECTION_OVERHEAD_TOKENS = 20
+_MAX_PACK_FILES = 20
+_SUMMARY_MARKER_RE = re.compile(r"^[ \t]*=== SUMMARY (\d+) ===[ \t]*$", re.MULTILINE)
+
 
 def load_env() -> None:
     """Load .env file from project root if present."""
@@ -25,23 +38,76 @@ def load_env() -> None:
 
 
 def is_available() -> bool:
-    """Check if Gemini summarization is available (API key set)."""
+    """Check if the configured summarizer can run (Gemini needs an API key)."""
+    if SUMMARIZER_BACKEND == "extractive":
+        return True
     return bool(os.environ.get("GEMINI_API_KEY"))
 
 
-def _build_prompt(transcript: str, style: str) -> str:
+def _instruction(style: str, subject: str) -> str:
     if style == "bullet_points":
-        instruction = (
-            "Summarize the following transcript using structured bullet points. "
+        return (
+            f"Summarize {subject} using structured bullet points. "
             "Include key topics, main points, and important takeaways. "
             "Use clear, concise language."
         )
-    else:
-        instruction = (
-            "Provide a concise paragraph summary of the following transcript. "
-            "Capture the key points and main ideas in a brief, readable format."
-        )
-    return f"{instruction}\n\nTranscript:\n{transcript}"
+    return (
+        f"Provide a concise paragraph summary of {subject}. "
+        "Capture the key points and main ideas in a brief, readable format."
+    )
+
+
+def _build_prompt(transcript: str, style: str) -> str:
+    return f"{_instruction(style, 'the following transcript')}\n\nTranscript:\n{transcript}"
+
+
+def _build_packed_prompt(transcripts: list[str], style: str) -> str:
+    """Build one prompt holding several transcripts in numbered, delimited sections."""
+    sections = "\n\n".join(
+        f"=== TRANSCRIPT {i} ===\n{text.strip()}\n=== END TRANSCRIPT {i} ==="
+        for i, text in enumerate(transcripts, 1)
+    )
+    return (
+        f"{_instruction(style, 'each of the following transcripts independently')}\n\n"
+        f"There are {len(transcripts)} transcripts. For each one, output a line "
+        "'=== SUMMARY <number> ===' followed by its summary, in order, with no "
+        "other text. Never merge or skip transcripts.\n\n"
+        f"{sections}"
+    )
+
+
+def _parse_packed_response(response: str, count: int) -> dict[int, str]:
+    """Split a packed response into {section_number: summary}, dropping anything malformed."""
+    parts = _SUMMARY_MARKER_RE.split(response)
+    summaries: dict[int, str] = {}
+    # parts = [preamble, number, body, number, body, ...]
+    for number, body in zip(parts[1::2], parts[2::2]):
+        i = int(number)
+        body = body.strip()
+        if 1 <= i <= count and i not in summaries and body:
+            summaries[i] = body + "\n"
+    return summaries
+
+
+def _estimate_tokens(text: str) -> int:
+    return len(text) // _CHARS_PER_TOKEN + _SECTION_OVERHEAD_TOKENS
+
+
+def _plan_packs(texts: dict[int, str], budget: int) -> list[list[int]]:
+    """Greedily group transcripts, in order, into packs that fit the token budget."""
+    packs: list[list[int]] = []
+    current: list[int] = []
+    used = 0
+    for i, text in texts.items():
+        tokens = _estimate_tokens(text)
+        if current and (used + tokens > budget or len(current) >= _MAX_PACK_FILES):
+            packs.append(current)
+            current, used = [], 0
+        current.append(i)
+        used += tokens
+    if current:
+        packs.append(current)
+    return packs
 
 
 def _rate_limit() -> None:
@@ -54,46 +120,138 @@ def _rate_limit() -> None:
     _last_request_time = time.monotonic()
 
 
+def _generate(prompt: str) -> str:
+    """Send one prompt to Gemini; raises on any API or configuration error."""
+    from google import genai  # pylint: disable=import-outside-toplevel
+
+    api_key = os.environ.get("GEMINI_API_KEY")
+    if not api_key:
+        raise RuntimeError("GEMINI_API_KEY not set")
+
+    _rate_limit()
+
+    client = genai.Client(api_key=api_key)
+    response = client.models.generate_content(
+        model=GEMINI_MODEL,
+        contents=prompt,
+    )
+
+    if not response.text:
+        raise RuntimeError("Gemini returned empty response")
+    return response.text
+
+
+def _summarize_gemini(text: str, style: str) -> str:
+    """Summarize via the Gemini API."""
+    return _generate(_build_prompt(text, style))
+
+
+def _summarize_extractive(text: str, style: str) -> str:
+    """Summarize offline by extracting the most central sentences."""
+    from src.extractive import summarize_text  # pylint: disable=import-outside-toplevel
+
+    summary = summarize_text(text, style)
+    if not summary:
+        raise RuntimeError("No sentences to extract")
+    return summary
+
+
+_BACKENDS = {
+    "gemini": _summarize_gemini,
+    "extractive": _summarize_extractive,
+}
+
+
 def summarize_file(
     transcript_path: Path,
     summary_path: Path,
     style: str,
 ) -> tuple[bool, str | None]:
     """
-    Read a transcript file, summarize it via Gemini, and write the summary.
+    Read a transcript file, summarize it with the configured backend, and write the summary.
 
-    @transcript_path: Path to the transcript .txt file.
+    @transcript_path: Path to the transcript .txt file (read from the archive if moved there).
     @summary_path: Path to write the summary output.
     @style: Either 'concise' or 'bullet_points'.
     @return: (success, error_message) tuple.
     """
     try:
-        from google import genai  # pylint: disable=import-outside-toplevel
-
-        api_key = os.environ.get("GEMINI_API_KEY")
-        if not api_key:
-            return False, "GEMINI_API_KEY not set"
-
-        text = transcript_path.read_text(encoding="utf-8")
+        text = read_transcript(transcript_path)
         if not text.strip():
             return False, "Transcript is empty"
 
-        prompt = _build_prompt(text, style)
-
-        _rate_limit()
-
-        client = genai.Client(api_key=api_key)
-        response = client.models.generate_content(
-            model=GEMINI_MODEL,
-            contents=prompt,
-        )
-
-        summary = response.text
-        if not summary:
-            return False, "Gemini returned empty response"
+        summary = _BACKENDS[SUMMARIZER_BACKEND](text, style)
 
         summary_path.write_text(summary, encoding="utf-8")
         return True, None
 
     except Exception as e:  # pylint: disable=broad-exception-caught
         return False, str(e)
+
+
+def summarize_files(
+    pairs: list[tuple[Path, Path]],
+    style: str,
+    on_done: Optional[Callable[[int, bool, str | None], None]] = None,
+) -> list[tuple[bool, str | None]]:
+    """
+    Summarize several transcripts, packing short ones into shared Gemini requests.
+
+    With the Gemini backend and a non-zero summary_pack_tokens, consecutive
+    transcripts are grouped into one request up to that token budget and the
+    response is split back into per-file summaries. Files whose summary is
+    missing from the response (or whose pack request fails) are retried with
+    one request each.
+
+    @pairs: (transcript_path, summary_path) tuples.
+    @style: Either 'concise' or 'bullet_points'.
+    @on_done: Called with (index, success, error) as each file finishes.
+    @return: (success, error_message) per pair, in input order.
+    """
+    results: list[tuple[bool, str | None]] = [(False, None)] * len(pairs)
+
+    def _finish(i: int, success: bool, error: str | None) -> None:
+        results[i] = (success, error)
+        if on_done:
+            on_done(i, success, error)
+
+    if SUMMARIZER_BACKEND != "gemini" or SUMMARY_PACK_TOKENS <= 0:
+        for i, (transcript_path, summary_path) in enumerate(pairs):
+            _finish(i, *summarize_file(transcript_path, summary_path, style))
+        return results
+
+    texts: dict[int, str] = {}
+    for i, (transcript_path, _) in enumerate(pairs):
+        try:
+            text = read_transcript(transcript_path)
+        except (OSError, RuntimeError) as e:
+            _finish(i, False, str(e))
+            continue
+        if text.strip():
+            texts[i] = text
+        else:
+            _finish(i, False, "Transcript is empty")
+
+    for pack in _plan_packs(texts, SUMMARY_PACK_TOKENS):
+        remaining = pack
+        if len(pack) > 1:
+            try:
+                response = _generate(_build_packed_prompt([texts[i] for i in pack], style))
+                summaries = _parse_packed_response(response, len(pack))
+            except Exception:  # pylint: disable=broad-exception-caught
+                summaries = {}
+            remaining = []
+            for n, i in enumerate(pack, 1):
+                if n not in summaries:
+                    remaining.append(i)
+                    continue
+                try:
+                    pairs[i][1].write_text(summaries[n], encoding="utf-8")
+                    _finish(i, True, None)
+                except OSError as e:
+                    _finish(i, False, str(e))
+
+        for i in remaining:
+            _finish(i, *summarize_file(*pairs[i], style))
+
+    return results
@@ -2,93 +2,511 @@
 Core transcription logic utilizing the OpenAI Whisper model.
 """
 
+import threading
+import time
+import warnings
+from contextlib import closing, contextmanager, nullcontext
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Iterator, Optional
 
-import questionary
 from rich.progress import (
     Progress, SpinnerColumn, TextColumn, BarColumn,
     MofNCompleteColumn, TimeRemainingColumn,
 )
 
+from src import archive, config, fingerprint, leases, memguard, search, segment_store
+from src.audio import SAMPLE_RATE, load_audio_window, probe_durations
+from src.cache import file_key, load_cache, save_cache
+from src.guard import DecodeGuard
+from src.memory import available_mb
+from src.workers import Job, fork_supported, run_forked
+from src.writers import write_outputs
 
-def load_model(model_size: str) -> Any:
+
+class LoadCancelled(Exception):
+    """A model load was abandoned through its cancel event (see preload.py)."""
+
+
+def _check_cancel(cancel: Optional[threading.Event]) -> None:
+    if cancel is not None and cancel.is_set():
+        raise LoadCancelled()
+
+
+class TieredModel:
+    """
+    Two-pass model: a small draft model transcribes everything, then only the
+    low-confidence segments are re-decoded with a larger model and merged back.
+
+    Exposes the same transcribe() call as a Whisper model, so it can be used
+    anywhere a loaded model is expected.
+    """
+
+    def __init__(self, draft: Any, refine_size: str, thresholds: dict):
+        """
+        @draft: Loaded Whisper model used for the first pass.
+        @refine_size: Model size loaded on first use for the second pass.
+        @thresholds: Dict with 'logprob_threshold', 'no_speech_threshold', and
+            'compression_ratio_threshold'.
+        """
+        self.draft = draft
+        self.refine_size = refine_size
+        self.thresholds = thresholds
+        self.model_size = config.TIERED_MODEL
+        self.guard: Optional[DecodeGuard] = None
+        self._refine: Any = None
+
+    @property
+    def refine(self) -> Any:
+        """The second-pass model, loaded lazily so clean audio never pays for it."""
+        if self._refine is None:
+            self._refine = _load_whisper(self.refine_size)
+        return self._refine
+
+    def _guarded(self, model: Any) -> Any:
+        return self.guard.attach(model) if self.guard else nullcontext()
+
+    def _needs_refine(self, segment: dict) -> bool:
+        t = self.thresholds
+        return (
+            segment.get("avg_logprob", 0.0) < t["logprob_threshold"]
+            or segment.get("no_speech_prob", 0.0) > t["no_speech_threshold"]
+            or segment.get("compression_ratio", 0.0) > t["compression_ratio_threshold"]
+        )
+
+    def transcribe(self, audio: Any, **kwargs: Any) -> dict:
+        """
+        Draft-transcribe @audio, then re-decode flagged segments with the refine model.
+
+        @audio: Path or 16 kHz float32 waveform, as accepted by Whisper.
+        @kwargs: Passed through to both models' transcribe().
+        @return: Whisper-style result dict with extra 'refined_segments' and
+            'refined_seconds' keys.
+        """
+        import whisper  # pylint: disable=import-outside-toplevel
+
+        if isinstance(audio, str):
+            audio = whisper.load_audio(audio)
+
+        with self._guarded(self.draft):
+            result = self.draft.transcribe(audio, **kwargs)
+        draft_segments = result["segments"]
+
+        # Group consecutive flagged segments into windows to re-decode together
+        windows: list[tuple[int, int]] = []
+        for i, segment in enumerate(draft_segments):
+            if not self._needs_refine(segment):
+                continue
+            if windows and windows[-1][1] == i - 1:
+                windows[-1] = (windows[-1][0], i)
+            else:
+                windows.append((i, i))
+
+        refine_kwargs = {
+            **kwargs,
+            "language": kwargs.get("language") or result.get("language"),
+            "condition_on_previous_text": False,
+        }
+
+        merged: list[dict] = []
+        refined_seconds = 0.0
+        cursor = 0
+        for first, last in windows:
+            merged.extend(draft_segments[cursor:first])
+            start = draft_segments[first]["start"]
+            end = draft_segments[last]["end"]
+            clip = audio[int(start * SAMPLE_RATE):int(end * SAMPLE_RATE)]
+            refined_seconds += end - start
+
+            with self._guarded(self.refine):
+                refined = self.refine.transcribe(clip, **refine_kwargs)
+            for segment in refined["segments"]:
+                segment["start"] = min(segment["start"] + start, end)
+                segment["end"] = min(segment["end"] + start, end)
+                for word in segment.get("words", []):
+                    word["start"] += start
+                    word["end"] += start
+                segment["refined"] = True
+                merged.append(segment)
+            cursor = last + 1
+        merged.extend(draft_segments[cursor:])
+
+        for i, segment in enumerate(merged):
+            segment["id"] = i
+
+        result["segments"] = merged
+        result["text"] = "".join(segment["text"] for segment in merged)
+        result["refined_segments"] = sum(last - first + 1 for first, last in windows)
+        result["refined_seconds"] = refined_seconds
+        return result
+
+
+def _torch_device() -> Optional[str]:
+    """Configured torch device, or None to let Whisper pick CUDA when available."""
+    return None if config.DEVICE == "auto" else config.DEVICE
+
+
+def _load_whisper(
+    model_size: str, device: Optional[str] = None, cancel: Optional[threading.Event] = None,
+) -> Any:
+    """
+    Load a single Whisper model, memory-mapping its weights when enabled.
+
+    @cancel: Checked between loading steps; raises LoadCancelled once set.
+    """
+    _check_cancel(cancel)
+    import whisper  # pylint: disable=import-outside-toplevel
+    device = device or _torch_device()
+    model = None
+    if config.MMAP_WEIGHTS:
+        from src.weights import load_mmap_model  # pylint: disable=import-outside-toplevel
+        try:
+            model = load_mmap_model(model_size, device, on_step=lambda: _check_cancel(cancel))
+        except LoadCancelled:
+            raise
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            warnings.warn(f"Memory-mapped load of '{model_size}' failed ({e}); using whisper.load_model")
+    if model is None:
+        _check_cancel(cancel)
+        model = whisper.load_model(model_size, device=device)
+    model.model_size = model_size  # recorded with each run in the segment store
+    return model
+
+
+def load_model(model_size: str, cancel: Optional[threading.Event] = None) -> Any:
     """
     Load and return a Whisper model.
 
-    @model_size: One of 'tiny', 'base', 'small', 'medium', 'large'.
-    @return: Loaded Whisper model instance.
+    @model_size: One of 'tiny', 'base', 'small', 'medium', 'large', or 'tiered'
+        (see config.TIERED).
+    @cancel: Set from another thread to abandon the load at its next step
+        (download/conversion, weight loading); LoadCancelled is raised then.
+    @return: Loaded Whisper model instance (or TieredModel).
+    """
+    if config.THREADS:
+        import torch  # pylint: disable=import-outside-toplevel
+        torch.set_num_threads(config.THREADS)
+
+    if model_size == config.TIERED_MODEL:
+        draft = _load_whisper(config.TIERED["draft_model"], cancel=cancel)
+        return TieredModel(draft, config.TIERED["refine_model"], config.TIERED)
+    return _load_whisper(model_size, cancel=cancel)
+
+
+def detect_language(model: Any, input_path: Path) -> str:
+    """
+    Detect the spoken language from the first 30-second window only.
+
+    @model: Loaded Whisper model instance (or TieredModel, which uses its draft model).
+    @input_path: Path to input audio file.
+    @return: Whisper language code, e.g. 'en'.
     """
     import whisper  # pylint: disable=import-outside-toplevel
-    return whisper.load_model(model_size)
+
+    if isinstance(model, TieredModel):
+        model = model.draft
+    audio = whisper.pad_or_trim(load_audio_window(input_path))
+    mel = whisper.log_mel_spectrogram(audio, model.dims.n_mels).to(model.device)
+    _, probs = model.detect_language(mel)
+    return max(probs, key=probs.get)
+
+
+def detect_languages(
+    model: Any,
+    files: list[Path],
+    on_progress: Optional[Callable[[Path], None]] = None,
+) -> dict[Path, str]:
+    """
+    Detect the language of every file, reusing results cached per audio file.
+
+    Files whose detection fails are left out, so Whisper falls back to its own
+    detection for them.
+
+    @model: Loaded Whisper model instance.
+    @files: Audio files to inspect.
+    @on_progress: Called with each file after it is handled.
+    @return: Mapping of file to Whisper language code.
+    """
+    cache = load_cache("languages")
+    detected: dict[Path, str] = {}
+
+    for f in files:
+        try:
+            key = file_key(f)
+            language = cache.get(key)
+            if language is None:
+                language = detect_language(model, f)
+                cache[key] = language
+            detected[f] = language
+        except Exception:  # pylint: disable=broad-exception-caught
+            pass
+        if on_progress:
+            on_progress(f)
+
+    save_cache("languages", cache)
+    return detected
+
+
+def _decode_options() -> dict:
+    """Whisper transcribe() options for the configured decode preset."""
+    preset = config.DECODE_PRESETS[config.DECODE_PRESET]
+    return {**preset, "temperature": tuple(preset["temperature"])}
+
+
+@contextmanager
+def _guarded(model: Any, guard: DecodeGuard) -> Iterator[None]:
+    """Apply @guard to every Whisper model behind @model for the duration of the block."""
+    if isinstance(model, TieredModel):
+        model.guard = guard
+        try:
+            yield
+        finally:
+            model.guard = None
+    else:
+        with guard.attach(model):
+            yield
 
 
 def get_device() -> str:
     """Return a human-readable string for the compute device."""
     import torch  # pylint: disable=import-outside-toplevel
-    if torch.cuda.is_available():
+    if config.DEVICE != "cpu" and torch.cuda.is_available():
         name = torch.cuda.get_device_name(0)
         return f"GPU ({name})"
     return "CPU"
 
 
+def _transcribe_chunked(
+    model: Any,
+    input_path: Path,
+    language: Optional[str],
+    task: str,
+    word_timestamps: bool,
+    decoding: dict,
+    chunk_seconds: float,
+) -> dict:
+    """
+    Transcribe @input_path in consecutive @chunk_seconds pieces and merge the results.
+
+    Only one chunk of audio (and its spectrogram) is in memory at a time. The
+    language detected in the first chunk is kept for the rest, and with
+    condition_on_previous_text the end of each chunk's text prompts the next.
+    """
+    segments: list[dict] = []
+    texts: list[str] = []
+    refined = {"refined_segments": 0, "refined_seconds": 0.0}
+    prompt: Optional[str] = None
+    offset = 0.0
+    while True:
+        audio = load_audio_window(input_path, offset, chunk_seconds)
+        if not len(audio):
+            break
+        result = model.transcribe(
+            audio,
+            language=language,
+            task=task,
+            verbose=False,
+            word_timestamps=word_timestamps,
+            initial_prompt=prompt,
+            **decoding,
+        )
+        language = language or result.get("language")
+        for segment in result["segments"]:
+            shifted = {
+                **segment,
+                "id": len(segments),
+                "seek": segment.get("seek", 0) + int(offset * 100),
+                "start": segment["start"] + offset,
+                "end": segment["end"] + offset,
+            }
+            if "words" in segment:
+                shifted["words"] = [
+                    {**w, "start": w["start"] + offset, "end": w["end"] + offset} for w in segment["words"]
+                ]
+            segments.append(shifted)
+        texts.append(result["text"])
+        for key in refined:
+            refined[key] += result.get(key, 0)
+        if decoding.get("condition_on_previous_text"):
+            prompt = "".join(texts)[-200:] or None  # roughly Whisper's prompt window
+        if len(audio) < (chunk_seconds - 1) * SAMPLE_RATE:
+            break  # short read: end of file
+        offset += chunk_seconds
+    merged = {"text": "".join(texts), "segments": segments, "language": language}
+    if isinstance(model, TieredModel):
+        merged.update(refined)
+    return merged
+
+
 def transcribe_file(
     model: Any,
     input_path: Path,
     output_path: Path,
     language: Optional[str],
     task: str,
+    formats: Optional[list[str]] = None,
+    word_timestamps: bool = False,
+    stats: Optional[dict] = None,
+    chunk_seconds: Optional[float] = None,
+    before_write: Optional[Callable[[], Optional[str]]] = None,
+    abort_if: Optional[Callable[[], Optional[str]]] = None,
 ) -> tuple[bool, str | None]:
     """
     Transcribe a single audio file and write timestamped output.
 
     @model: Loaded Whisper model instance.
     @input_path: Path to input audio file.
-    @output_path: Path to save transcription output.
+    @output_path: Path to save the .txt transcript; other formats share its stem.
     @language: Language of audio, or None for auto-detection.
-    @task: Either 'transcribe' or 'translate'.
+    @task: 'transcribe', 'translate', or config.DUAL_TASK (also writes the
+        English translation to '{stem}_en.txt').
+    @formats: Output formats to write (see writers.WRITERS), default ['txt'].
+    @word_timestamps: Ask Whisper for per-word timings (included in json output).
+    @stats: Optional dict updated in place with per-file details; human-readable
+        entries are appended to its 'notes' list.
+    @chunk_seconds: Transcribe in pieces of this length to bound memory (not
+        for config.DUAL_TASK), or None for the whole file at once.
+    @before_write: Called once the result is ready, before any output is
+        written; returning an error message discards the result.
+    @abort_if: Called between decoding windows; returning a reason stops the
+        transcription, which then fails with that reason.
     @return: (success, error_message) tuple.
     """
+    decoding = _decode_options()
+    guard = DecodeGuard(
+        config.REPETITION_GUARD["max_compression_ratio"],
+        temperatures=decoding["temperature"],
+        detect_loops=bool(config.REPETITION_GUARD["enabled"]),
+        abort_if=abort_if,
+    )
+
+    start_time = time.monotonic()
     try:
-        result = model.transcribe(
-            str(input_path),
-            language=language,
-            task=task,
-            verbose=False,
-        )
+        with _guarded(model, guard):
+            if task == config.DUAL_TASK:
+                result = _transcribe_dual(
+                    model, input_path, output_path, language, formats, word_timestamps, decoding,
+                    before_write,
+                )
+            elif chunk_seconds:
+                result = _transcribe_chunked(
+                    model, input_path, language, task, word_timestamps, decoding, chunk_seconds,
+                )
+            else:
+                result = model.transcribe(
+                    str(input_path),
+                    language=language,
+                    task=task,
+                    verbose=False,
+                    word_timestamps=word_timestamps,
+                    **decoding,
+                )
 
-        with open(output_path, "w", encoding="utf-8") as f:
-            for segment in result["segments"]:
-                start = segment["start"]
-                total = int(start)
-                ms = int((start - total) * 1000)
-                h, m, s = total // 3600, (total % 3600) // 60, total % 60
-                timestamp = f"[{h:02d}:{m:02d}:{s:02d}.{ms:03d}]"
-                text = segment["text"].strip()
-                f.write(f"{timestamp} {text}\n\n")
+        abort = before_write() if before_write else None
+        if abort:
+            return False, abort
+        write_outputs(result, output_path, formats or ["txt"])
+
+        if config.SEGMENT_STORE:
+            try:
+                segment_store.record_run(
+                    result, input_path.name, getattr(model, "model_size", "unknown"), task,
+                    segment_store.store_path(output_path.parent),
+                    audio_key=file_key(input_path),
+                    decode_preset=config.DECODE_PRESET,
+                    device=getattr(getattr(getattr(model, "draft", model), "device", None), "type", None),
+                    elapsed_seconds=time.monotonic() - start_time,
+                )
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                if stats is not None:
+                    stats.setdefault("notes", []).append(f"segment store not updated: {e}")
+
+        if stats is not None:
+            stats["decode_preset"] = config.DECODE_PRESET
+            stats["fallbacks"] = guard.fallbacks
+            stats["fallback_seconds"] = guard.fallback_seconds
+            if guard.fallbacks:
+                stats.setdefault("notes", []).append(guard.fallback_summary())
+            if guard.skipped_windows:
+                stats["repetition_skipped_windows"] = guard.skipped_windows
+                stats["repetition_decodes_saved"] = guard.decodes_saved
+                stats["repetition_tokens_saved"] = guard.tokens_saved
+                stats.setdefault("notes", []).append(guard.summary())
+
+        if stats is not None and "refined_segments" in result:
+            stats["refined_segments"] = result["refined_segments"]
+            stats["refined_seconds"] = result["refined_seconds"]
+            if result["refined_segments"]:
+                stats.setdefault("notes", []).append(
+                    f"re-decoded {result['refined_segments']} segment(s), "
+                    f"{result['refined_seconds']:.0f}s of audio"
+                )
 
         return True, None
     except Exception as e:  # pylint: disable=broad-exception-caught
         return False, str(e)
 
 
+def _transcribe_dual(
+    model: Any,
+    input_path: Path,
+    output_path: Path,
+    language: Optional[str],
+    formats: Optional[list[str]],
+    word_timestamps: bool,
+    decoding: dict,
+    before_write: Optional[Callable[[], Optional[str]]] = None,
+) -> dict:
+    """
+    Run transcribe + translate, write the translation, and return the transcript result.
+
+    Plain Whisper models share one encoder pass per window between both tasks;
+    other models (e.g. TieredModel) fall back to two separate runs.
+    """
+    translation_path = output_path.with_name(f"{output_path.stem}_en.txt")
+
+    if hasattr(model, "embed_audio") and not word_timestamps:
+        from src.bilingual import transcribe_and_translate  # pylint: disable=import-outside-toplevel
+        result, translation = transcribe_and_translate(model, input_path, language, decoding)
+    else:
+        result = model.transcribe(
+            str(input_path), language=language, task="transcribe",
+            verbose=False, word_timestamps=word_timestamps, **decoding,
+        )
+        translation = model.transcribe(
+            str(input_path), language=language or result.get("language"), task="translate",
+            verbose=False, word_timestamps=word_timestamps, **decoding,
+        )
+
+    abort = before_write() if before_write else None
+    if abort:
+        raise RuntimeError(abort)
+    write_outputs(translation, translation_path, formats or ["txt"])
+    return result
+
+
 def _check_overwrites(files: list[Path], output_dir: Path) -> list[Path]:
     """
     Check which files would overwrite existing transcripts and prompt the user.
 
+    Transcripts moved into the output directory's archive count as existing.
+
     @files: List of audio file Paths to check.
     @output_dir: Directory where transcript files are written.
     @return: Filtered list of files to actually transcribe.
     """
+    archived = archive.list_entries(output_dir)
     existing = []
     for f in files:
         output_path = output_dir / f"{f.stem}.txt"
-        if output_path.exists():
+        # An archived transcript counts too (see archive.is_archived())
+        if output_path.exists() or output_path.name in archived:
             existing.append(f)
 
     if not existing:
         return files
 
+    import questionary  # pylint: disable=import-outside-toplevel
+
     skip_all = "SKIP_ALL"
     names = [f.name for f in existing]
     choices = [questionary.Choice(n, checked=True) for n in names]
@@ -111,22 +529,419 @@ def _check_overwrites(files: list[Path], output_dir: Path) -> list[Path]:
     return [f for f in files if f not in existing or f.name in overwrite_set]
 
 
+def _format_duration(seconds: float) -> str:
+    total = int(seconds)
+    return f"{total // 3600}:{(total % 3600) // 60:02d}:{total % 60:02d}"
+
+
+def _run_language_prepass(model: Any, files: list[Path]) -> dict[Path, str]:
+    """Detect languages for the whole queue behind a progress bar."""
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        MofNCompleteColumn(),
+        TextColumn("{task.fields[filename]}"),
+    ) as progress:
+        task_id = progress.add_task("Detecting language", total=len(files), filename="")
+        return detect_languages(
+            model, files,
+            on_progress=lambda f: progress.update(task_id, advance=1, filename=f.name),
+        )
+
+
+def _fingerprint_queue(files: list[Path], durations: dict[Path, float]) -> dict[Path, tuple[str, float, Any]]:
+    """
+    Fingerprint the queue, reusing fingerprints stored for unchanged files.
+
+    @return: {file: (file_key, duration, fingerprint)}; files that cannot be
+        probed or decoded are left out (and simply transcribed).
+    """
+    from concurrent.futures import ThreadPoolExecutor  # pylint: disable=import-outside-toplevel
+
+    prints: dict[Path, tuple[str, float, Any]] = {}
+    conn = fingerprint.open_index()
+    try:
+        missing: dict[Path, str] = {}
+        for f in files:
+            if f not in durations:
+                continue
+            key = file_key(f)
+            bits = fingerprint.cached_fingerprint(conn, key)
+            if bits is None:
+                missing[f] = key
+            else:
+                prints[f] = (key, durations[f], bits)
+
+        def _compute(f: Path) -> Optional[Any]:
+            try:
+                return fingerprint.compute_fingerprint(f, durations[f])
+            except Exception:  # pylint: disable=broad-exception-caught
+                return None
+
+        # Each fingerprint is a handful of short ffmpeg decodes, mostly process startup
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            for f, bits in zip(missing, pool.map(_compute, missing)):
+                if bits is not None:
+                    prints[f] = (missing[f], durations[f], bits)
+                    fingerprint.remember(conn, missing[f], durations[f], bits, file=f.name)
+    finally:
+        conn.close()
+    return {f: prints[f] for f in files if f in prints}
+
+
+def _reuse_outputs(source: Path, output_path: Path, task: str, formats: Optional[list[str]]) -> bool:
+    """
+    Copy an earlier transcript, in every requested format, to @output_path's stem.
+
+    @source: The earlier .txt transcript (may be archived).
+    @return: False, writing nothing, if any requested output of @source is missing.
+    """
+    suffixes = [f".{name}" for name in dict.fromkeys(formats or ["txt"])]
+    pairs = [(source.with_suffix(suffix), output_path.with_suffix(suffix)) for suffix in suffixes]
+    if task == config.DUAL_TASK:
+        pairs += [
+            (source.with_name(f"{source.stem}_en{suffix}"), output_path.with_name(f"{output_path.stem}_en{suffix}"))
+            for suffix in suffixes
+        ]
+    try:
+        texts = [archive.read_transcript(src) for src, _ in pairs]
+    except (OSError, RuntimeError):
+        return False
+    for (_, dest), text in zip(pairs, texts):
+        dest.write_text(text, encoding="utf-8")
+    return True
+
+
+def _dedup_queue(
+    files: list[Path],
+    prints: dict[Path, tuple[str, float, Any]],
+    output_dir: Path,
+    language: Optional[str],
+    task: str,
+    formats: Optional[list[str]],
+    model_size: Optional[str],
+) -> tuple[list[Path], list[dict], dict[Path, tuple[Path, float]]]:
+    """
+    Split the queue into files to transcribe and acoustic duplicates.
+
+    Files matching an already transcribed recording get that transcript
+    copied to their own name right away. Files matching another file in the
+    queue are set aside and copied once that file has been transcribed.
+    Earlier transcripts are only reused if they came from @model_size and
+    the current decode preset.
+
+    @return: (files_to_transcribe, results_for_reused_files,
+        {duplicate: (queued_original, bit_error_rate)}).
+    """
+    reused: list[dict] = []
+    remaining: list[Path] = []
+    conn = fingerprint.open_index()
+    try:
+        for f in files:
+            if f not in prints:
+                remaining.append(f)
+                continue
+            key, duration, bits = prints[f]
+            output_path = output_dir / f"{f.stem}.txt"
+            match = fingerprint.find_transcribed(
+                conn, duration, bits, task, model_size, config.DECODE_PRESET, exclude_key=key,
+            )
+            if (
+                match is None
+                or (language and match["language"] and match["language"] != language)
+                or not _reuse_outputs(match["transcript"], output_path, task, formats)
+            ):
+                remaining.append(f)
+                continue
+            try:
+                search.index_transcript(output_path)
+            except Exception:  # pylint: disable=broad-exception-caught
+                pass
+            reused.append({
+                "file": f.name, "success": True, "error": None,
+                "duplicate_of": match["file"],
+                "notes": [
+                    f"acoustic duplicate of {match['file']} (bit error {match['bit_error_rate']:.2f}); "
+                    "transcript reused"
+                ],
+            })
+    finally:
+        conn.close()
+
+    batch = fingerprint.find_in_batch({f: prints[f][1:] for f in remaining if f in prints})
+    return [f for f in remaining if f not in batch], reused, batch
+
+
+def _plan_memory(
+    model: Any,
+    files: list[Path],
+    durations: dict[Path, float],
+    workers: int,
+    task: str,
+    output_dir: Path,
+) -> tuple[memguard.MemoryPlan, list[Path], list[dict]]:
+    """
+    Fit the batch into available memory (see memguard.plan_batch()).
+
+    @model: Loaded Whisper model instance.
+    @files: Files to transcribe.
+    @durations: Probed durations in seconds.
+    @workers: Requested number of forked workers.
+    @task: 'transcribe', 'translate', or config.DUAL_TASK.
+    @output_dir: Output directory, whose journal names a file an earlier run
+        was killed on.
+    @return: (plan, files that fit, failed results for files that do not).
+    """
+    model_size = getattr(model, "model_size", config.DEFAULT_MODEL_SIZE)
+    available = available_mb()
+    chunkable = task != config.DUAL_TASK
+    plan = memguard.plan_batch(
+        {f: durations[f] for f in files if f in durations},
+        model_size,
+        workers if fork_supported(get_device()) else 1,
+        available,
+        chunkable=chunkable,
+    )
+    unfit = []
+    for f in plan.no_fit:
+        need = memguard.estimate_mb(model_size, durations[f])
+        unfit.append({
+            "file": f.name, "success": False,
+            "error": f"Not enough memory (est. {need / 1024:.1f} GB, {available / 1024:.1f} GB free)",
+        })
+    files = [f for f in files if f not in plan.no_fit]
+    if files:
+        memguard.replan_interrupted(plan, files, output_dir, chunkable=chunkable)
+    return plan, files, unfit
+
+
+def _run_sequential(
+    model: Any,
+    jobs: list[Job],
+    task: str,
+    output_dir: Path,
+    on_done: Callable[[Job, bool, str | None, dict], None],
+    on_start: Callable[[Job], None],
+    formats: Optional[list[str]] = None,
+    word_timestamps: bool = False,
+    durations: Optional[dict[Path, float]] = None,
+    mem_plan: Optional[memguard.MemoryPlan] = None,
+) -> None:
+    """
+    Transcribe @jobs one after another in this process.
+
+    With @mem_plan, each file is checked against the memory available when it
+    starts (chunked, or failed, if it no longer fits) and watched while it
+    runs: below the floor its decoding is stopped and it is retried in chunks.
+    The file in progress is journalled, so a run the OOM killer still takes
+    down is reported next time.
+
+    @model: Loaded Whisper model instance.
+    @jobs: (input_path, output_path, language) tuples.
+    @task: 'transcribe', 'translate', or config.DUAL_TASK.
+    @output_dir: Output directory, holding the memory guard's journal.
+    @on_done: Called with (job, success, error, stats) as each job finishes.
+    @on_start: Called with each job before it starts.
+    @formats: Output formats to write for each file.
+    @word_timestamps: Ask Whisper for per-word timings.
+    @durations: Probed durations in seconds.
+    @mem_plan: Plan from _plan_memory(), or None with the memory guard off.
+    """
+    durations = durations or {}
+    size = getattr(model, "model_size", config.DEFAULT_MODEL_SIZE)
+    chunkable = task != config.DUAL_TASK
+    chunks = mem_plan.chunks if mem_plan else {}
+    chunk_limit = float(config.MEMORY_GUARD["chunk_seconds"])
+    floor_mb = config.MEMORY_GUARD["reserve_mb"] / 2 if mem_plan is not None else None
+
+    with memguard.MemoryMonitor(floor_mb=floor_mb) as monitor:
+        try:
+            for job in jobs:
+                file_path, output_path, file_language = job
+                on_start(job)
+                stats: dict = {}
+                chunk = chunks.get(file_path)
+
+                available = available_mb() if floor_mb is not None else None
+                if available is not None and file_path in durations:
+                    need = memguard.estimate_mb(size, chunk or durations[file_path])
+                    if available - need < floor_mb and chunkable and not chunk:
+                        chunk = chunk_limit
+                        need = memguard.estimate_mb(size, chunk)
+                        stats.setdefault("notes", []).append(
+                            f"memory guard: chunked into {chunk / 60:.0f}-minute pieces "
+                            f"({available:.0f} MB available at start)"
+                        )
+                    if available - need < floor_mb:
+                        on_done(job, False, (
+                            f"Not enough memory (est. {need / 1024:.1f} GB, "
+                            f"{available / 1024:.1f} GB free)"
+                        ), stats)
+                        continue
+                    memguard.record_start(output_dir, file_path, need, available)
+
+                while True:
+                    monitor.reset()
+                    success, error = transcribe_file(
+                        model, file_path, output_path, file_language, task,
+                        formats=formats, word_timestamps=word_timestamps, stats=stats,
+                        chunk_seconds=chunk, abort_if=monitor.below_floor,
+                    )
+                    low = monitor.below_floor()
+                    if success or not low or not chunkable or chunk:
+                        break
+                    chunk = chunk_limit
+                    stats.setdefault("notes", []).append(
+                        f"memory guard: {low}; retried in {chunk / 60:.0f}-minute chunks"
+                    )
+                stats["peak_mb"] = monitor.peak()
+                on_done(job, success, error, stats)
+        finally:
+            if floor_mb is not None:
+                memguard.record_done(output_dir)
+
+
+def _run_in_workers(
+    model: Any,
+    jobs: list[Job],
+    workers: int,
+    task: str,
+    on_done: Callable[[Job, bool, str | None, dict], None],
+    on_start: Optional[Callable[[Job], None]] = None,
+    formats: Optional[list[str]] = None,
+    word_timestamps: bool = False,
+    weights: Optional[dict[Path, float]] = None,
+    watchdog: bool = False,
+    mem_plan: Optional[memguard.MemoryPlan] = None,
+) -> None:
+    """
+    Transcribe @jobs across forked workers sharing @model (see workers.run_forked()).
+
+    @model: Loaded Whisper model instance (CPU).
+    @jobs: (input_path, output_path, language) tuples, dispatched in order.
+    @workers: Number of worker processes.
+    @task: 'transcribe', 'translate', or config.DUAL_TASK.
+    @on_done: Called with (job, success, error, stats) as each job finishes.
+    @on_start: Called with each job as it is dispatched.
+    @formats: Output formats to write for each file.
+    @word_timestamps: Ask Whisper for per-word timings.
+    @weights: Audio seconds per input path, for the watchdog's timeouts.
+    @watchdog: Kill any file exceeding config.WATCHDOG's duration-scaled timeout.
+    @mem_plan: Plan from _plan_memory(), or None with the memory guard off.
+    """
+    timeouts: dict[Path, float] = {}
+    if watchdog:
+        passes = 2 if task == config.DUAL_TASK else 1
+        timeouts = {
+            job[0]: config.WATCHDOG["base_seconds"] + passes * config.WATCHDOG["realtime_factor"] * (weights or {})[job[0]]
+            for job in jobs
+        }
+    guarded = mem_plan is not None and available_mb() is not None
+    run_forked(
+        model, jobs, workers, task, on_done,
+        formats=formats, word_timestamps=word_timestamps,
+        timeouts=timeouts, on_start=on_start, threads=config.THREADS,
+        chunks=mem_plan.chunks if mem_plan else {},
+        memory_floor_mb=config.MEMORY_GUARD["reserve_mb"] / 2 if guarded else None,
+        retry_chunk_seconds=(
+            float(config.MEMORY_GUARD["chunk_seconds"]) if task != config.DUAL_TASK else None
+        ),
+    )
+
+
+def _remember_fingerprint(
+    fingerprint_entry: tuple[str, float, Any],
+    file_path: Path,
+    output_path: Path,
+    task: str,
+    language: Optional[str],
+    model_size: Optional[str],
+    decode_preset: str,
+) -> None:
+    """Store a transcribed file's fingerprint with its transcript; failures are ignored."""
+    key, duration, bits = fingerprint_entry
+    try:
+        with closing(fingerprint.open_index()) as conn:
+            fingerprint.remember(
+                conn, key, duration, bits, file=file_path.name, transcript=output_path,
+                task=task, language=language, model=model_size, decode_preset=decode_preset,
+            )
+    except Exception:  # pylint: disable=broad-exception-caught
+        pass
+
+
+def _finish_duplicates(
+    duplicates: dict[Path, tuple[Path, float]],
+    originals: dict[Path, dict],
+    output_dir: Path,
+    task: str,
+    formats: Optional[list[str]],
+) -> list[dict]:
+    """
+    Copy each in-batch duplicate's outputs from its transcribed original.
+
+    @duplicates: {duplicate: (original, bit_error_rate)} from _dedup_queue().
+    @originals: {original: its result dict}.
+    @return: One result dict per duplicate.
+    """
+    results = []
+    for f, (original, ber) in duplicates.items():
+        source = originals.get(original, {})
+        output_path = output_dir / f"{f.stem}.txt"
+        if source.get("success") and _reuse_outputs(output_dir / f"{original.stem}.txt", output_path, task, formats):
+            try:
+                search.index_transcript(output_path)
+            except Exception:  # pylint: disable=broad-exception-caught
+                pass
+            results.append({
+                "file": f.name, "success": True, "error": None, "duplicate_of": original.name,
+                "notes": [f"acoustic duplicate of {original.name} (bit error {ber:.2f}); transcript reused"],
+            })
+        else:
+            results.append({
+                "file": f.name, "success": False, "error": f"Duplicate of {original.name}, which failed",
+            })
+    return results
+
+
 def process_queue(
     model: Any,
     files: list[Path],
     output_dir: Path,
     language: Optional[str],
     task: str,
+    formats: Optional[list[str]] = None,
+    word_timestamps: bool = False,
+    language_prepass: bool = False,
+    workers: int = 1,
+    watchdog: bool = False,
 ) -> list[dict]:
     """
-    Process a queue of audio files sequentially.
+    Process a queue of audio files, sequentially or across forked workers.
+
+    Durations are probed up front (cached per file and mtime) so progress and
+    ETA track audio seconds; parallel runs schedule the longest files first.
+    With config.MEMORY_GUARD enabled, the batch is planned to fit in available
+    memory (see memguard.plan_batch()) and each adjustment is noted per file.
 
     @model: Loaded Whisper model instance.
     @files: List of audio file Paths to transcribe.
     @output_dir: Directory to write transcript files.
     @language: Language of audio, or None for auto-detection.
-    @task: Either 'transcribe' or 'translate'.
-    @return: List of dicts with keys 'file', 'success', and 'error'.
+    @task: 'transcribe', 'translate', or config.DUAL_TASK.
+    @formats: Output formats to write for each file, default ['txt'].
+    @word_timestamps: Ask Whisper for per-word timings.
+    @language_prepass: When @language is None, detect every file's language up
+        front (cached per audio file), pass it explicitly to Whisper, and
+        process same-language files together.
+    @workers: Number of forked worker processes sharing the model's weights
+        (CPU only; falls back to sequential processing elsewhere).
+    @watchdog: Run files in supervised worker processes (even with one worker)
+        and kill any file exceeding config.WATCHDOG's duration-scaled timeout.
+        CPU only; elsewhere files run in-process without a timeout.
+    @return: List of dicts with keys 'file', 'success', and 'error', plus any
+        per-file details collected by transcribe_file() (e.g. 'notes').
     """
     output_dir.mkdir(parents=True, exist_ok=True)
 
@@ -134,25 +949,261 @@ def process_queue(
     if not files:
         return []
 
-    results: list[dict] = []
+    durations = probe_durations(files)
+
+    prints: dict[Path, tuple[str, float, Any]] = {}
+    reused: list[dict] = []
+    duplicates: dict[Path, tuple[Path, float]] = {}
+    if config.DEDUP:
+        try:
+            prints = _fingerprint_queue(files, durations)
+            files, reused, duplicates = _dedup_queue(
+                files, prints, output_dir, language, task, formats, getattr(model, "model_size", None),
+            )
+        except Exception:  # pylint: disable=broad-exception-caught
+            prints = {}  # dedup is an optimisation; transcribe everything instead
+        if not files:
+            return reused
+
+    languages: dict[Path, str] = {}
+    if language is None and language_prepass:
+        languages = _run_language_prepass(model, files)
+        order: dict[str, int] = {}
+        for f in files:
+            order.setdefault(languages.get(f, ""), len(order))
+        files = sorted(files, key=lambda f: order[languages.get(f, "")])
+
+    mem_plan: Optional[memguard.MemoryPlan] = None
+    unfit: list[dict] = []
+    if config.MEMORY_GUARD["enabled"]:
+        mem_plan, files, unfit = _plan_memory(model, files, durations, workers, task, output_dir)
+        workers = mem_plan.workers
+        if not files:
+            return reused + unfit
+
+    small_files = mem_plan.fallback if mem_plan else set()
+    forked = fork_supported(get_device()) and (
+        watchdog or (workers > 1 and len(files) - len(small_files) > 1)
+    )
+
+    # Progress and ETA are measured in audio seconds; files ffprobe cannot
+    # read are weighted as an average file
+    known = list(durations.values())
+    fallback = sum(known) / len(known) if known else 1.0
+    weights = {f: durations.get(f, fallback) for f in files}
+
+    if forked and workers > 1:
+        # Longest first, so the batch doesn't end waiting on one long file
+        files = sorted(files, key=lambda f: weights[f], reverse=True)
+
+    jobs = [
+        (f, output_dir / f"{f.stem}.txt", language or languages.get(f))
+        for f in files
+    ]
+    by_file = {job[0]: i for i, job in enumerate(jobs)}
+    results: list[dict] = [{}] * len(jobs)
+
+    try:
+        index = search.open_index()
+    except Exception:  # pylint: disable=broad-exception-caught
+        index = None
 
     with Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
         BarColumn(),
-        MofNCompleteColumn(),
+        TextColumn("{task.fields[files]}"),
+        TextColumn("[dim]{task.fields[audio]}[/dim]"),
         TimeRemainingColumn(),
         TextColumn("{task.fields[filename]}"),
     ) as progress:
+        total_audio = sum(weights.values())
+        done_files = 0
+        done_audio = 0.0
         task_id = progress.add_task(
-            "Transcribing", total=len(files), filename=""
+            "Transcribing", total=total_audio, filename="",
+            files=f"0/{len(jobs)}", audio=f"0:00:00/{_format_duration(total_audio)}",
         )
 
-        for file_path in files:
-            progress.update(task_id, filename=file_path.name)
-            output_path = output_dir / f"{file_path.stem}.txt"
-            success, error = transcribe_file(model, file_path, output_path, language, task)
-            results.append({"file": file_path.name, "success": success, "error": error})
-            progress.advance(task_id)
+        def _finish(job: Job, success: bool, error: str | None, stats: dict) -> None:
+            nonlocal done_files, done_audio
+            file_path, output_path, file_language = job
+            if file_language:
+                stats.setdefault("language", file_language)
+            if file_path in durations:
+                stats.setdefault("audio_seconds", durations[file_path])
+            if mem_plan and file_path in mem_plan.notes:
+                stats["notes"] = mem_plan.notes[file_path] + stats.get("notes", [])
+            results[by_file[file_path]] = {
+                "file": file_path.name, "success": success, "error": error, **stats,
+            }
+            if success and index is not None:
+                try:
+                    search.index_transcript(output_path, index)
+                except Exception:  # pylint: disable=broad-exception-caught
+                    pass  # the index is rebuilt from disk on the next search
+            if success and file_path in prints:
+                _remember_fingerprint(
+                    prints[file_path], file_path, output_path, task, file_language,
+                    (
+                        config.MEMORY_GUARD["fallback_model"] if file_path in small_files
+                        else getattr(model, "model_size", None)
+                    ),
+                    stats.get("decode_preset", config.DECODE_PRESET),
+                )
+            done_files += 1
+            done_audio += weights[file_path]
+            progress.update(
+                task_id,
+                completed=done_audio,
+                files=f"{done_files}/{len(jobs)}",
+                audio=f"{_format_duration(done_audio)}/{_format_duration(total_audio)}",
+            )
 
-    return results
+        def _show(job: Job) -> None:
+            progress.update(task_id, filename=job[0].name)
+
+        main_jobs = [job for job in jobs if job[0] not in small_files]
+        if forked and main_jobs:
+            if workers > 1:
+                progress.update(task_id, filename=f"({min(workers, len(main_jobs))} workers)")
+            _run_in_workers(
+                model, main_jobs, workers, task, _finish, on_start=_show if workers == 1 else None,
+                formats=formats, word_timestamps=word_timestamps,
+                weights=weights, watchdog=watchdog, mem_plan=mem_plan,
+            )
+        else:
+            _run_sequential(
+                model, main_jobs, task, output_dir, _finish, _show,
+                formats=formats, word_timestamps=word_timestamps, durations=durations, mem_plan=mem_plan,
+            )
+
+        small_jobs = [job for job in jobs if job[0] in small_files]
+        if small_jobs:
+            size = config.MEMORY_GUARD["fallback_model"]
+            progress.update(task_id, filename=f"(loading '{size}')")
+            try:
+                small_model = _load_whisper(size)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                for job in small_jobs:
+                    _finish(job, False, f"Fallback model '{size}' failed to load: {e}", {})
+            else:
+                _run_sequential(
+                    small_model, small_jobs, task, output_dir, _finish, _show,
+                    formats=formats, word_timestamps=word_timestamps, durations=durations, mem_plan=mem_plan,
+                )
+                del small_model
+
+    if index is not None:
+        index.close()
+
+    results += _finish_duplicates(
+        duplicates, {f: results[i] for f, i in by_file.items()}, output_dir, task, formats,
+    )
+    return reused + unfit + results
+
+
+def drain_directory(
+    model: Any,
+    input_dir: Path,
+    output_dir: Path,
+    language: Optional[str],
+    task: str,
+    formats: Optional[list[str]] = None,
+    word_timestamps: bool = False,
+    lease_ttl: float = 120.0,
+    max_attempts: int = 3,
+    on_event: Optional[Callable[[str, str], None]] = None,
+) -> list[dict]:
+    """
+    Cooperatively transcribe every pending file in @input_dir with other workers.
+
+    Files are claimed through leases in `<input_dir>/.leases/` (see leases.py),
+    so any number of processes on any number of hosts sharing the directory
+    split the work between them. The call returns once no untranscribed files
+    remain; while other workers still hold leases it keeps polling, so files
+    from workers that crash are reclaimed once their leases expire.
+
+    A result is only written while this worker still holds the file's lease;
+    if the lease was lost (e.g. a stalled heartbeat let another worker reclaim
+    the file) the result is discarded. Failed files are retried, by any
+    worker, until they have failed @max_attempts times.
+
+    @model: Loaded Whisper model instance.
+    @input_dir: Shared audio directory.
+    @output_dir: Shared transcript directory.
+    @language: Language of audio, or None for auto-detection.
+    @task: 'transcribe', 'translate', or config.DUAL_TASK.
+    @formats: Output formats to write for each file.
+    @word_timestamps: Ask Whisper for per-word timings.
+    @lease_ttl: Seconds without a heartbeat before a lease is reclaimed.
+    @max_attempts: Failures after which a file is given up on.
+    @on_event: Called with (event, filename) for 'claimed', 'done', and 'failed'.
+    @return: Result dicts for the files this worker transcribed.
+    """
+    lease_dir = input_dir / leases.LEASE_DIR_NAME
+    lease_dir.mkdir(parents=True, exist_ok=True)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    owner = leases.new_owner_id()
+    results: list[dict] = []
+
+    def _pending() -> list[Path]:
+        files: set[Path] = set()
+        for ext in config.FILE_EXTENSIONS:
+            files.update(input_dir.glob(f"*{ext}"))
+        archived = archive.list_entries(output_dir)
+        return [
+            f for f in sorted(files, key=lambda p: p.name.lower())
+            if not (output_dir / f"{f.stem}.txt").exists() and f"{f.stem}.txt" not in archived
+            and not leases.is_failed(lease_dir, f.name, max_attempts)
+        ]
+
+    def _lost(lease: leases.Lease) -> bool:
+        return lease.lost or not lease.is_owned()
+
+    try:
+        while True:
+            pending = _pending()
+            if not pending:
+                return results
+
+            claimed_any = False
+            for file_path in pending:
+                output_path = output_dir / f"{file_path.stem}.txt"
+                now = leases.fs_now(lease_dir, owner)
+                lease = leases.try_claim(lease_dir, file_path.name, owner, lease_ttl, now)
+                if lease is None:
+                    continue
+                if output_path.exists():  # finished by another worker since the scan
+                    lease.release()
+                    continue
+
+                claimed_any = True
+                if on_event:
+                    on_event("claimed", file_path.name)
+                with lease:
+                    stats: dict = {}
+                    success, error = transcribe_file(
+                        model, file_path, output_path, language, task,
+                        formats=formats, word_timestamps=word_timestamps, stats=stats,
+                        before_write=lambda lease=lease: "lease lost to another worker" if _lost(lease) else None,
+                    )
+                    if success:
+                        try:
+                            search.index_transcript(output_path)
+                        except Exception:  # pylint: disable=broad-exception-caught
+                            pass
+                    elif not _lost(lease):
+                        # A lost lease is not a failure: the new holder finishes the file
+                        leases.mark_failed(lease_dir, file_path.name, owner, error or "unknown error")
+
+                results.append({"file": file_path.name, "success": success, "error": error, **stats})
+                if on_event:
+                    on_event("done" if success else "failed", file_path.name)
+
+            if not claimed_any:
+                # Everything left is leased by other workers; wait for them to finish
+                # or for a crashed worker's lease to expire
+                time.sleep(max(1.0, lease_ttl / 4))
+    finally:
+        leases.cleanup(lease_dir, owner)
@@ -1,13 +1,14 @@
 # src/ui.py
 
+import fnmatch
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
 import questionary
 from rich.console import Console
 from rich.table import Table
 
-from src import config
+from src import archive, config, preload
 
 console = Console()
 
@@ -16,6 +17,17 @@ _EXIT = "EXIT"
 _BACK_LABEL = [("bold", "BACK")]
 _EXIT_LABEL = [("bold", "EXIT")]
 
+# Paged picker actions
+_PAGE_SIZE = 20
+_PAGE_OPTIONS = "PAGE_OPTIONS"
+_DONE = "DONE"
+_STAY = "STAY"
+_NEXT = "NEXT"
+_PREV = "PREV"
+_FILTER = "FILTER"
+_SELECT_MATCHING = "SELECT_MATCHING"
+_CLEAR = "CLEAR"
+
 
 def clear_screen() -> None:
     print("\033[2J\033[H", end="")
@@ -55,8 +67,9 @@ def _scan_audio_files() -> list[Path]:
 
 
 def _scan_transcript_files() -> list[Path]:
-    """Scan transcripts/ for .txt files, excluding *_summary.txt."""
-    all_txt = list(config.DEFAULT_OUTPUT_DIR.glob("*.txt"))
+    """Scan transcripts/ (and its archive) for .txt files, excluding *_summary.txt."""
+    all_txt = set(config.DEFAULT_OUTPUT_DIR.glob("*.txt"))
+    all_txt.update(config.DEFAULT_OUTPUT_DIR / name for name in archive.list_entries())
     return sorted(
         [f for f in all_txt if not f.name.endswith("_summary.txt")],
         key=lambda p: p.name.lower(),
@@ -81,7 +94,12 @@ def _select_language() -> Optional[str]:
 
 
 def _select_model_size() -> str:
+    tiered_label = (
+        f"{config.TIERED_MODEL} ({config.TIERED['draft_model']} draft, "
+        f"{config.TIERED['refine_model']} re-decode)"
+    )
     choices = config.MODEL_SIZES + [
+        questionary.Choice(tiered_label, value=config.TIERED_MODEL),
         questionary.Choice(title=_BACK_LABEL, value=_BACK),
         questionary.Choice(title=_EXIT_LABEL, value=_EXIT),
     ]
@@ -141,71 +159,226 @@ def _select_summary_style() -> str:
     return answer
 
 
-def _select_files(available: list[Path]) -> list[Path] | str:
-    choices = []
-    for f in available:
-        size = format_size(f.stat().st_size)
-        has_transcript = (config.DEFAULT_OUTPUT_DIR / f"{f.stem}.txt").exists()
-        label = f"{f.name} ({size})"
-        if has_transcript:
-            label += " [has transcript]"
-        choices.append(questionary.Choice(label, value=str(f)))
-    choices.append(questionary.Choice(title=_BACK_LABEL, value=_BACK))
-    choices.append(questionary.Choice(title=_EXIT_LABEL, value=_EXIT))
+def _matches_filter(name: str, pattern: str) -> bool:
+    """Glob match if the pattern has wildcards, otherwise case-insensitive substring."""
+    name, pattern = name.lower(), pattern.lower()
+    if any(c in pattern for c in "*?["):
+        return fnmatch.fnmatch(name, pattern)
+    return pattern in name
 
-    answer = questionary.checkbox(
-        "Select audio files (space to toggle, enter to confirm):",
-        choices=choices,
-        instruction="",
-    ).ask()
 
+def _ask_page_action(page: int, pages: int, matching: int, selected: Optional[set[Path]]) -> str:
+    """
+    Ask where to go next in a paged picker, as a prompt of its own.
+
+    @page: Current page, from 0.
+    @pages: Number of pages.
+    @matching: Number of paths matching the filter.
+    @selected: Current multi-selection, or None for a single-choice picker.
+    @return: One of _DONE, _STAY, _NEXT, _PREV, _FILTER, _SELECT_MATCHING, _CLEAR.
+    """
+    if selected is not None:
+        choices = [questionary.Choice(f"Done ({len(selected)} selected)", value=_DONE)]
+    else:
+        choices = [questionary.Choice("Back to the list", value=_STAY)]
+    if page + 1 < pages:
+        choices.append(questionary.Choice("Next page", value=_NEXT))
+    if page > 0:
+        choices.append(questionary.Choice("Previous page", value=_PREV))
+    choices.append(questionary.Choice("Filter (glob or text)...", value=_FILTER))
+    if selected is not None:
+        choices.append(questionary.Choice(f"Select all matching ({matching})", value=_SELECT_MATCHING))
+        if selected:
+            choices.append(questionary.Choice("Clear selection", value=_CLEAR))
+
+    answer = questionary.select("Page:", choices=choices, instruction="").ask()
     if answer is None:
         raise KeyboardInterrupt
+    return answer
 
-    if _EXIT in answer:
-        return _EXIT
-
-    if _BACK in answer:
-        return _BACK
 
-    if not answer:
-        return _BACK
+def _pick_paged(
+    message: str,
+    available: list[Path],
+    labels: Callable[[list[Path]], list[str]],
+    allow_exit: bool,
+    selected: Optional[set[Path]] = None,
+) -> list[Path] | Path | str:
+    """
+    Paging and filtering shared by select_paths_paged() and select_path_paged().
+
+    Each page is its own checkbox (or select) prompt holding only paths; for
+    lists longer than a page, navigation and filtering follow in a separate
+    prompt (see _ask_page_action()).
+
+    @selected: Set collecting a multi-selection (checkbox pages), or None to
+        pick a single path (select pages).
+    @return: Selected paths in @available order, the chosen path, or _BACK / _EXIT.
+    """
+    multi = selected is not None
+    paged = len(available) > _PAGE_SIZE
+    pattern = ""
+    matching = available
+    page = 0
 
-    return [Path(p) for p in answer if p not in (_BACK, _EXIT)]
+    while True:
+        pages = max(1, -(-len(matching) // _PAGE_SIZE))
+        page = max(0, min(page, pages - 1))
+        visible = matching[page * _PAGE_SIZE:(page + 1) * _PAGE_SIZE]
+
+        if paged:
+            status = f"Page {page + 1}/{pages} | {len(matching)} matching"
+            if multi:
+                status += f" | {len(selected)} selected"
+            if pattern:
+                status += f" | filter: {pattern}"
+            console.print(f"[dim]{status}[/dim]")
+
+        choices = [
+            questionary.Choice(text, value=str(f), checked=multi and f in selected)
+            for f, text in zip(visible, labels(visible))
+        ]
+        if paged and not multi:
+            choices.append(questionary.Separator())
+            choices.append(questionary.Choice(title=[("bold", "Page options...")], value=_PAGE_OPTIONS))
+        choices.append(questionary.Choice(title=_BACK_LABEL, value=_BACK))
+        if allow_exit:
+            choices.append(questionary.Choice(title=_EXIT_LABEL, value=_EXIT))
+
+        if multi:
+            answer = questionary.checkbox(message, choices=choices, instruction="").ask()
+        else:
+            answer = questionary.select(message, choices=choices, instruction="").ask()
+        if answer is None:
+            raise KeyboardInterrupt
+
+        picked = answer if multi else [answer]
+        if _EXIT in picked:
+            return _EXIT
+        if _BACK in picked:
+            return _BACK
+
+        if multi:
+            checked = set(answer)
+            for f in visible:
+                if str(f) in checked:
+                    selected.add(f)
+                else:
+                    selected.discard(f)
+            action = _ask_page_action(page, pages, len(matching), selected) if paged else _DONE
+        elif answer != _PAGE_OPTIONS:
+            return Path(answer)
+        else:
+            action = _ask_page_action(page, pages, len(matching), None)
+
+        if action == _DONE:
+            return [f for f in available if f in selected] if selected else _BACK
+        if action == _FILTER:
+            pattern = _ask_filter(pattern)
+            matching = [f for f in available if _matches_filter(f.name, pattern)] if pattern else available
+            page = 0
+        elif action == _NEXT:
+            page += 1
+        elif action == _PREV:
+            page -= 1
+        elif action == _SELECT_MATCHING:
+            selected.update(matching)
+        elif action == _CLEAR:
+            selected.clear()
+
+
+def select_paths_paged(
+    message: str,
+    available: list[Path],
+    labels: Callable[[list[Path]], list[str]],
+    allow_exit: bool = True,
+) -> list[Path] | str:
+    """
+    Multi-select over a potentially huge list of paths, one page at a time.
+
+    Only the visible page is passed to @labels, so per-file work such as
+    stat() calls and archive lookups scales with the page size rather than
+    the directory size.
+
+    @message: Prompt shown above each page.
+    @available: Sorted list of candidate paths.
+    @labels: Builds the display labels for one page of paths.
+    @allow_exit: Whether to offer an EXIT choice alongside BACK.
+    @return: Selected paths in @available order, or _BACK / _EXIT.
+    """
+    return _pick_paged(message, available, labels, allow_exit, selected=set())
+
+
+def select_path_paged(
+    message: str,
+    available: list[Path],
+    labels: Callable[[list[Path]], list[str]],
+    allow_exit: bool = True,
+) -> Path | str:
+    """
+    Single-select counterpart of select_paths_paged(), with the same paging and filter.
+
+    @message: Prompt shown above each page.
+    @available: Sorted list of candidate paths.
+    @labels: Builds the display labels for one page of paths.
+    @allow_exit: Whether to offer an EXIT choice alongside BACK.
+    @return: The chosen path, or _BACK / _EXIT.
+    """
+    return _pick_paged(message, available, labels, allow_exit)
+
+
+def _ask_filter(pattern: str) -> str:
+    """Prompt for a new name filter, starting from the current @pattern."""
+    text = questionary.text(
+        "Filter (e.g. *.m4a or meeting, empty to clear):", default=pattern,
+    ).ask()
+    if text is None:
+        raise KeyboardInterrupt
+    return text.strip()
 
 
-def _select_transcript_files(available: list[Path]) -> list[Path] | str:
-    """Select transcript files for standalone summarization."""
-    choices = []
-    for f in available:
-        size = format_size(f.stat().st_size)
-        has_summary = (f.parent / f"{f.stem}_summary.txt").exists()
-        label = f"{f.name} ({size})"
-        if has_summary:
+def _audio_labels(page: list[Path]) -> list[str]:
+    archived = archive.archived_names(f"{f.stem}.txt" for f in page)
+    labels = []
+    for f in page:
+        label = f"{f.name} ({format_size(f.stat().st_size)})"
+        transcript = config.DEFAULT_OUTPUT_DIR / f"{f.stem}.txt"
+        if transcript.exists() or transcript.name in archived:
+            label += " [has transcript]"
+        labels.append(label)
+    return labels
+
+
+def _transcript_labels(page: list[Path]) -> list[str]:
+    archived = archive.archived_names(f"{f.stem}_summary.txt" for f in page)
+    labels = []
+    for f in page:
+        if f.exists():
+            label = f"{f.name} ({format_size(f.stat().st_size)})"
+        else:
+            label = f"{f.name} [archived]"
+        summary = f.parent / f"{f.stem}_summary.txt"
+        if summary.exists() or summary.name in archived:
             label += " [has summary]"
-        choices.append(questionary.Choice(label, value=str(f)))
-    choices.append(questionary.Choice(title=_BACK_LABEL, value=_BACK))
-    choices.append(questionary.Choice(title=_EXIT_LABEL, value=_EXIT))
+        labels.append(label)
+    return labels
 
-    answer = questionary.checkbox(
-        "Select transcripts to summarize (space to toggle, enter to confirm):",
-        choices=choices,
-        instruction="",
-    ).ask()
-
-    if answer is None:
-        raise KeyboardInterrupt
 
-    if _EXIT in answer:
-        return _EXIT
-
-    if _BACK in answer:
-        return _BACK
+def _select_files(available: list[Path]) -> list[Path] | str:
+    return select_paths_paged(
+        "Select audio files (space to toggle, enter to confirm):",
+        available,
+        _audio_labels,
+    )
 
-    if not answer:
-        return _BACK
 
-    return [Path(p) for p in answer if p not in (_BACK, _EXIT)]
+def _select_transcript_files(available: list[Path]) -> list[Path] | str:
+    """Select transcript files for standalone summarization."""
+    return select_paths_paged(
+        "Select transcripts to summarize (space to toggle, enter to confirm):",
+        available,
+        _transcript_labels,
+    )
 
 
 def _show_summary(settings: dict) -> bool:
@@ -229,6 +402,8 @@ def _show_summary(settings: dict) -> bool:
         table.add_row("Transcript Files", str(len(settings.get("transcript_files", []))))
     else:
         table.add_row("Files", str(len(settings["files"])))
+        table.add_row("Output Formats", ", ".join(config.OUTPUT_FORMATS))
+        table.add_row("Decoding", config.DECODE_PRESET)
 
     table.add_row("Output Directory", str(config.DEFAULT_OUTPUT_DIR))
 
@@ -285,6 +460,7 @@ def run_setup(summarize_available: bool = False) -> dict | None:
             _step_header(1, 5, "Language")
             answer = _select_language()
             if answer == _EXIT:
+                preload.cancel()
                 return None
             language = None if answer == config.AUTO_DETECT else config.LANGUAGE_MAP[answer]
             state = "model"
@@ -298,8 +474,11 @@ def run_setup(summarize_available: bool = False) -> dict | None:
                 state = "language"
                 continue
             if answer == _EXIT:
+                preload.cancel()
                 return None
             model_size = answer
+            if config.PRELOAD_MODEL:
+                preload.start(model_size)
             state = "task"
 
         elif state == "task":
@@ -315,10 +494,12 @@ def run_setup(summarize_available: bool = False) -> dict | None:
                 state = "model"
                 continue
             if answer == _EXIT:
+                preload.cancel()
                 return None
             task = answer
 
             if _is_summarize_only():
+                preload.cancel()
                 state = "transcript_files"
             elif _needs_summary_style():
                 state = "summary_style"
@@ -344,6 +525,7 @@ def run_setup(summarize_available: bool = False) -> dict | None:
                 state = "task"
                 continue
             if answer == _EXIT:
+                preload.cancel()
                 return None
             transcript_files = answer
             state = "summary_style"
@@ -357,6 +539,7 @@ def run_setup(summarize_available: bool = False) -> dict | None:
                 state = "transcript_files" if _is_summarize_only() else "task"
                 continue
             if answer == _EXIT:
+                preload.cancel()
                 return None
             summary_style = config.SUMMARY_STYLE_MAP[answer]
             state = "confirm" if _is_summarize_only() else "files"
@@ -384,6 +567,7 @@ def run_setup(summarize_available: bool = False) -> dict | None:
                 state = "summary_style" if _needs_summary_style() else "task"
                 continue
             if answer == _EXIT:
+                preload.cancel()
                 return None
             files = answer
             state = "confirm"
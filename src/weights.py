@@ -0,0 +1,121 @@
+"""
+Memory-mapped Whisper checkpoints.
+
+whisper.load_model() deserialises the whole checkpoint into freshly allocated
+memory on every start. Here each checkpoint is converted once into an fp32
+state dict in torch's zip format, which torch.load(mmap=True) maps lazily:
+cold starts cost page faults instead of deserialisation, and every process
+using the same model shares the physical pages through the page cache.
+
+Whisper has no public way to fetch a checkpoint file without loading it, so
+the conversion uses its private download helper and model table when this
+Whisper version still has them; otherwise it raises, and the caller falls back
+to whisper.load_model().
+"""
+
+import itertools
+import os
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from src import config
+
+
+def mmap_checkpoint_path(model_size: str) -> Path:
+    """Location of the converted, mmap-able checkpoint for @model_size."""
+    return config.CACHE_DIR / "models" / f"{model_size}.mmap.pt"
+
+
+def convert_checkpoint(model_size: str, on_step: Optional[Callable[[], None]] = None) -> Path:
+    """
+    Convert the cached Whisper checkpoint for @model_size into mmap-able form.
+
+    Downloads the checkpoint first if Whisper has not cached it yet. The write
+    is atomic, so concurrent processes never see a partial file. The converted
+    fp32 copy is kept next to Whisper's own checkpoint, about twice its size.
+
+    @model_size: Whisper model name, e.g. 'small'.
+    @on_step: Called between the download and the conversion; may raise to
+        abandon the load.
+    @return: Path to the converted checkpoint.
+    @raise RuntimeError: This Whisper version lacks the private helpers used
+        to locate the checkpoint.
+    """
+    import torch  # pylint: disable=import-outside-toplevel
+    import whisper  # pylint: disable=import-outside-toplevel
+
+    target = mmap_checkpoint_path(model_size)
+    if target.exists():
+        return target
+
+    download_root = os.path.join(
+        os.getenv("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")), "whisper"
+    )
+    # Private API (openai-whisper 2023-2024): checked, not assumed
+    download = getattr(whisper, "_download", None)
+    models = getattr(whisper, "_MODELS", None)
+    if not callable(download) or not isinstance(models, dict) or model_size not in models:
+        raise RuntimeError("this Whisper version does not expose its checkpoint downloads")
+    source = download(models[model_size], download_root, False)
+    if on_step:
+        on_step()
+    checkpoint = torch.load(source, map_location="cpu", weights_only=True)
+
+    # Store fp32 so the mapped tensors can be assigned to the model as-is
+    state = {k: v.float().contiguous() for k, v in checkpoint["model_state_dict"].items()}
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_suffix(f".{os.getpid()}.tmp")
+    torch.save({"dims": checkpoint["dims"], "model_state_dict": state}, tmp)
+    os.replace(tmp, target)
+    return target
+
+
+def load_mmap_model(
+    model_size: str, device: Optional[str] = None, on_step: Optional[Callable[[], None]] = None,
+) -> Any:
+    """
+    Build a Whisper model whose weights are backed by a memory-mapped file.
+
+    @model_size: Whisper model name, e.g. 'small'.
+    @device: Torch device, default CUDA if available else CPU. On CUDA the
+        weights are copied to the GPU, so only loading gets faster.
+    @on_step: Called between loading steps (download, conversion, mapping,
+        assigning weights); may raise to abandon the load.
+    @return: Whisper model instance.
+    """
+    import torch  # pylint: disable=import-outside-toplevel
+    import whisper  # pylint: disable=import-outside-toplevel
+    from whisper.model import ModelDimensions, Whisper  # pylint: disable=import-outside-toplevel
+
+    device = device or ("cuda" if torch.cuda.is_available() else "cpu")
+    path = convert_checkpoint(model_size, on_step)
+    if on_step:
+        on_step()
+    checkpoint = torch.load(path, map_location="cpu", mmap=True, weights_only=True)
+    dims = ModelDimensions(**checkpoint["dims"])
+
+    # Build on the meta device so no throwaway weights are allocated, then
+    # assign the mapped tensors directly instead of copying into parameters
+    with torch.device("meta"):
+        model = Whisper(dims)
+    if on_step:
+        on_step()
+    model.load_state_dict(checkpoint["model_state_dict"], assign=True)
+
+    # Non-persistent buffers are not in the checkpoint; recreate them
+    mask = torch.empty(dims.n_text_ctx, dims.n_text_ctx).fill_(float("-inf")).triu_(1)
+    model.decoder.register_buffer("mask", mask, persistent=False)
+    all_heads = torch.zeros(dims.n_text_layer, dims.n_text_head, dtype=torch.bool)
+    all_heads[dims.n_text_layer // 2:] = True
+    model.register_buffer("alignment_heads", all_heads.to_sparse(), persistent=False)
+    alignment_heads = getattr(whisper, "_ALIGNMENT_HEADS", {}).get(model_size)
+    if alignment_heads is not None:
+        model.set_alignment_heads(alignment_heads)
+
+    if any(t.is_meta for t in itertools.chain(model.parameters(), model.buffers())):
+        raise RuntimeError("Memory-mapped model has uninitialised tensors")
+
+    model = model.to(device)
+    model.mmap_backed = device == "cpu"  # forked workers share these pages as they are
+    return model
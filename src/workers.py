@@ -0,0 +1,292 @@
+"""
+Forked worker processes that share one copy of the model.
+
+The parent loads the model once and moves its weights into shared memory; each
+worker is forked afterwards and inherits them copy-on-write, so adding a worker
+costs only its activations and decoder state rather than another full model.
+
+The parent also supervises the workers: a job that overruns its timeout has its
+worker killed, and any dead worker is replaced by a fresh fork of the
+still-loaded model. With a memory floor set, the largest worker is stopped
+before available memory runs out; its job is retried in chunks and the pool
+shrinks by one.
+"""
+
+import multiprocessing
+import os
+import signal
+import time
+from multiprocessing.connection import Connection, wait
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from src.memguard import MemoryMonitor
+from src.memory import available_mb, rss_mb, unique_rss_mb
+from src.writers import part_path
+
+# Set in the parent right before forking; workers inherit it without pickling
+_shared_model: Any = None
+
+# (input_path, output_path, language)
+Job = tuple[Path, Path, Optional[str]]
+
+_MEMORY_POLL_SECONDS = 1.0
+
+
+def fork_supported(device: str) -> bool:
+    """Forked workers need the fork start method and a CPU-resident model."""
+    return "fork" in multiprocessing.get_all_start_methods() and device == "CPU"
+
+
+def _share_weights(model: Any) -> None:
+    """
+    Make model weights shareable so forked workers never copy them.
+
+    A TieredModel's refine model is loaded here, before forking; loaded lazily
+    in each worker it would cost a copy per worker. Memory-mapped weights
+    (weights.load_mmap_model()) are already shared page-cache pages, and
+    share_memory() would copy them into /dev/shm, so they are left as they are.
+    """
+    models = [model.draft, model.refine] if hasattr(model, "draft") else [model]
+    for m in models:
+        if hasattr(m, "share_memory") and not getattr(m, "mmap_backed", False):
+            m.share_memory()
+
+
+def _kill(proc: Any) -> None:
+    """SIGKILL a worker's whole process group, so ffmpeg decoders it started die with it."""
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+    if proc.is_alive():
+        proc.kill()
+    proc.join(timeout=5)
+
+
+def _discard_outputs(job: Job, formats: Optional[list[str]]) -> None:
+    """
+    Remove the half-written .part files of a killed job.
+
+    Finished outputs are only ever renamed into place whole (see
+    writers.write_outputs()), so existing transcripts are left alone.
+    """
+    _, output_path, _ = job
+    for path in (output_path, output_path.with_name(f"{output_path.stem}_en.txt")):
+        for name in formats or ["txt"]:
+            part_path(path.with_suffix(f".{name}")).unlink(missing_ok=True)
+
+
+def _worker_main(conn: Connection, options: dict) -> None:
+    """Worker loop: receive jobs, transcribe with the inherited model, send results."""
+    # Own process group (see _kill); the parent may already have set it
+    try:
+        os.setsid()
+    except OSError:
+        pass
+
+    import torch  # pylint: disable=import-outside-toplevel
+    from src.transcriber import transcribe_file  # pylint: disable=import-outside-toplevel
+
+    torch.set_num_threads(options["threads"])
+
+    with MemoryMonitor() as monitor:
+        while True:
+            message = conn.recv()
+            if message is None:
+                break
+            (input_path, output_path, language), chunk_seconds = message
+            stats: dict = {}
+            monitor.reset()
+            with torch.inference_mode():
+                success, error = transcribe_file(
+                    _shared_model, input_path, output_path, language, options["task"],
+                    formats=options["formats"], word_timestamps=options["word_timestamps"],
+                    stats=stats, chunk_seconds=chunk_seconds,
+                )
+            stats["worker_pid"] = os.getpid()
+            stats["worker_uss_mb"] = unique_rss_mb()
+            stats["peak_mb"] = monitor.peak()
+            conn.send((success, error, stats))
+    conn.close()
+
+
+def run_forked(
+    model: Any,
+    jobs: list[Job],
+    workers: int,
+    task: str,
+    on_done: Callable[[Job, bool, str | None, dict], None],
+    formats: Optional[list[str]] = None,
+    word_timestamps: bool = False,
+    timeouts: Optional[dict[Path, float]] = None,
+    on_start: Optional[Callable[[Job], None]] = None,
+    threads: int = 0,
+    chunks: Optional[dict[Path, float]] = None,
+    memory_floor_mb: Optional[float] = None,
+    retry_chunk_seconds: Optional[float] = None,
+) -> None:
+    """
+    Run transcription jobs across forked workers sharing @model.
+
+    @model: Loaded Whisper model instance (CPU).
+    @jobs: (input_path, output_path, language) tuples, dispatched in order.
+    @workers: Number of worker processes.
+    @task: 'transcribe', 'translate', or config.DUAL_TASK.
+    @on_done: Called in the parent with (job, success, error, stats) as each job finishes.
+    @formats: Output formats to write for each file.
+    @word_timestamps: Ask Whisper for per-word timings.
+    @timeouts: Seconds each input path may run before its worker is killed and
+        the job reported as failed; paths not listed run unbounded.
+    @on_start: Called in the parent with each job as it is dispatched.
+    @threads: Torch threads per worker; 0 splits the CPU cores evenly.
+    @chunks: Chunk length in seconds for input paths to transcribe in pieces.
+    @memory_floor_mb: When available memory drops below this, stop the worker
+        using the most memory and run one fewer; None disables the check.
+    @retry_chunk_seconds: Chunk length for retrying a job whose worker was
+        stopped for memory (or killed by the kernel); None fails such jobs.
+    """
+    global _shared_model
+
+    workers = max(1, min(workers, len(jobs)))
+    options = {
+        "task": task,
+        "formats": formats,
+        "word_timestamps": word_timestamps,
+        "threads": threads or max(1, (os.cpu_count() or 1) // workers),
+    }
+    timeouts = timeouts or {}
+    chunks = dict(chunks or {})
+    notes: dict[Path, list[str]] = {}
+
+    _share_weights(model)
+    _shared_model = model
+    ctx = multiprocessing.get_context("fork")
+
+    procs: dict[Connection, Any] = {}
+    pending = list(reversed(jobs))
+    running: dict[Connection, Job] = {}
+    deadlines: dict[Connection, float] = {}
+
+    def _spawn() -> Optional[Connection]:
+        parent_conn, child_conn = ctx.Pipe()
+        proc = ctx.Process(target=_worker_main, args=(child_conn, options), daemon=True)
+        try:
+            proc.start()
+        except OSError:
+            parent_conn.close()
+            return None
+        finally:
+            child_conn.close()
+        try:
+            os.setpgid(proc.pid, proc.pid)  # also done by the worker; whichever runs first wins
+        except OSError:
+            pass
+        procs[parent_conn] = proc
+        return parent_conn
+
+    def _replace(conn: Connection) -> Optional[Connection]:
+        """Kill a hung or dead worker (with its children) and fork a fresh one from the loaded model."""
+        _kill(procs.pop(conn))
+        conn.close()
+        return _spawn()
+
+    def _dispatch(conn: Optional[Connection]) -> None:
+        if conn is None or not pending:
+            return
+        job = pending.pop()
+        running[conn] = job
+        if job[0] in timeouts:
+            deadlines[conn] = time.monotonic() + timeouts[job[0]]
+        if on_start:
+            on_start(job)
+        conn.send((job, chunks.get(job[0])))
+
+    def _done(job: Job, success: bool, error: str | None, stats: dict) -> None:
+        if job[0] in notes:
+            stats["notes"] = notes.pop(job[0]) + stats.get("notes", [])
+        on_done(job, success, error, stats)
+
+    def _retry_chunked(job: Job, reason: str) -> bool:
+        """Requeue a job that ran out of memory in chunks; False if it already was."""
+        if retry_chunk_seconds is None or job[0] in chunks:
+            return False
+        chunks[job[0]] = retry_chunk_seconds
+        notes.setdefault(job[0], []).append(
+            f"memory guard: {reason}; retried in {retry_chunk_seconds / 60:.0f}-minute chunks"
+        )
+        pending.append(job)
+        return True
+
+    def _relieve_memory() -> None:
+        """Stop the largest worker when available memory falls below the floor."""
+        available = available_mb()
+        if available is None or available >= memory_floor_mb or not running:
+            return
+        conn = max(running, key=lambda c: rss_mb(procs[c].pid) or 0.0)
+        job = running.pop(conn)
+        deadlines.pop(conn, None)
+        _kill(procs.pop(conn))
+        conn.close()
+        _discard_outputs(job, formats)
+        # Fewer workers from now on, unless this was the last one
+        replacement = _spawn() if not running else None
+        reason = f"worker stopped at {available:.0f} MB available"
+        if not running and replacement is None:
+            reason += "; no worker left"
+        elif replacement is None:
+            reason += f"; workers {len(running) + 1} -> {len(running)}"
+        if not _retry_chunked(job, reason):
+            _done(job, False, f"Out of memory ({available:.0f} MB available)", {"notes": [f"memory guard: {reason}"]})
+        _dispatch(replacement)
+
+    try:
+        for _ in range(workers):
+            _dispatch(_spawn())
+
+        while running:
+            wait_for = max(0.0, min(deadlines.values()) - time.monotonic()) if deadlines else None
+            if memory_floor_mb is not None:
+                wait_for = min(wait_for, _MEMORY_POLL_SECONDS) if wait_for is not None else _MEMORY_POLL_SECONDS
+            for conn in wait(list(running), timeout=wait_for):
+                job = running.pop(conn)
+                deadlines.pop(conn, None)
+                try:
+                    success, error, stats = conn.recv()
+                except EOFError:
+                    procs[conn].join(timeout=5)
+                    killed = procs[conn].exitcode == -signal.SIGKILL
+                    conn = _replace(conn)
+                    _discard_outputs(job, formats)
+                    if killed and _retry_chunked(job, "worker killed by the system (likely out of memory)"):
+                        _dispatch(conn)
+                        continue
+                    success, error, stats = False, "Worker exited unexpectedly", {"notes": ["worker restarted"]}
+                _done(job, success, error, stats)
+                _dispatch(conn)
+
+            if memory_floor_mb is not None:
+                _relieve_memory()
+
+            now = time.monotonic()
+            for conn in [c for c, deadline in deadlines.items() if deadline <= now]:
+                job = running.pop(conn)
+                del deadlines[conn]
+                limit = timeouts[job[0]]
+                replacement = _replace(conn)
+                _discard_outputs(job, formats)
+                _done(job, False, f"Timed out after {limit:.0f}s", {"notes": ["killed by watchdog; worker restarted"]})
+                _dispatch(replacement)
+
+        for job in reversed(pending):
+            _done(job, False, "No workers left", {})
+    finally:
+        for conn, proc in procs.items():
+            try:
+                conn.send(None)
+            except OSError:
+                pass
+            proc.join(timeout=5)
+            if proc.is_alive():
+                _kill(proc)
+        _shared_model = None
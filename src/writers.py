@@ -0,0 +1,135 @@
+"""
+Transcript output writers (txt, json, srt, vtt, tsv) rendered in one pass.
+"""
+
+import json
+import os
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Callable, Optional
+
+_BUFFER_SIZE = 1 << 16
+
+
+def format_timestamp(seconds: float, decimal_marker: str = ".") -> str:
+    """
+    Format seconds as HH:MM:SS.mmm (milliseconds truncated, not rounded).
+
+    @seconds: Offset from the start of the audio.
+    @decimal_marker: Separator before milliseconds ('.' or ',' for SRT).
+    @return: Formatted timestamp without brackets.
+    """
+    total = int(seconds)
+    ms = int((seconds - total) * 1000)
+    h, m, s = total // 3600, (total % 3600) // 60, total % 60
+    return f"{h:02d}:{m:02d}:{s:02d}{decimal_marker}{ms:03d}"
+
+
+def _text(segment: dict) -> str:
+    return segment["text"].strip()
+
+
+# ─── Per-format renderers ────────────────────────────────────────────────────
+def _txt_segment(_index: int, segment: dict) -> str:
+    return f"[{format_timestamp(segment['start'])}] {_text(segment)}\n\n"
+
+
+def _srt_segment(index: int, segment: dict) -> str:
+    start = format_timestamp(segment["start"], ",")
+    end = format_timestamp(segment["end"], ",")
+    return f"{index + 1}\n{start} --> {end}\n{_text(segment)}\n\n"
+
+
+def _vtt_header(_result: dict) -> str:
+    return "WEBVTT\n\n"
+
+
+def _vtt_segment(_index: int, segment: dict) -> str:
+    return f"{format_timestamp(segment['start'])} --> {format_timestamp(segment['end'])}\n{_text(segment)}\n\n"
+
+
+def _tsv_header(_result: dict) -> str:
+    return "start\tend\ttext\n"
+
+
+def _tsv_segment(_index: int, segment: dict) -> str:
+    text = _text(segment).replace("\t", " ")
+    return f"{int(segment['start'] * 1000)}\t{int(segment['end'] * 1000)}\t{text}\n"
+
+
+def _json_header(result: dict) -> str:
+    return f'{{"language": {json.dumps(result.get("language"))}, "segments": [\n'
+
+
+def _json_segment(index: int, segment: dict) -> str:
+    prefix = ",\n" if index else ""
+    return prefix + json.dumps(segment, ensure_ascii=False, default=float)
+
+
+def _json_footer(result: dict) -> str:
+    return f'\n], "text": {json.dumps(result.get("text", "").strip(), ensure_ascii=False)}}}\n'
+
+
+# Registry of available writers. Keys must match config.OUTPUT_FORMATS choices.
+WRITERS: dict[str, dict[str, Optional[Callable]]] = {
+    "txt": {"header": None, "segment": _txt_segment, "footer": None},
+    "json": {"header": _json_header, "segment": _json_segment, "footer": _json_footer},
+    "srt": {"header": None, "segment": _srt_segment, "footer": None},
+    "vtt": {"header": _vtt_header, "segment": _vtt_segment, "footer": None},
+    "tsv": {"header": _tsv_header, "segment": _tsv_segment, "footer": None},
+}
+
+
+def write_outputs(result: dict, output_path: Path, formats: list[str]) -> list[Path]:
+    """
+    Render a Whisper result into every requested format in a single segment pass.
+
+    @result: Dict returned by model.transcribe() (needs 'segments').
+    @output_path: Path of the primary .txt output; other formats share its stem.
+    @formats: Writer names from WRITERS, e.g. ['txt', 'srt'].
+    @return: List of paths written.
+
+    Every format is written to a `.part` file first and all of them are renamed
+    into place only once complete, so a crash mid-write never leaves a
+    truncated transcript where a finished one is expected.
+    """
+    names = [f for f in dict.fromkeys(formats) if f in WRITERS]
+    paths = [output_path.with_suffix(f".{name}") for name in names]
+    parts = [part_path(p) for p in paths]
+
+    try:
+        _render(result, names, parts)
+    except BaseException:
+        for part in parts:
+            part.unlink(missing_ok=True)
+        raise
+    # The primary .txt marks a file as done, so it goes last
+    for part, path in sorted(zip(parts, paths), key=lambda pair: pair[1] == output_path):
+        os.replace(part, path)
+    return paths
+
+
+def part_path(path: Path) -> Path:
+    """Temporary path an output is written to before being renamed to @path."""
+    return path.with_name(f"{path.name}.part")
+
+
+def _render(result: dict, names: list[str], paths: list[Path]) -> None:
+    with ExitStack() as stack:
+        handles = [
+            stack.enter_context(open(p, "w", encoding="utf-8", buffering=_BUFFER_SIZE))
+            for p in paths
+        ]
+        writers = [WRITERS[name] for name in names]
+
+        for w, f in zip(writers, handles):
+            if w["header"]:
+                f.write(w["header"](result))
+
+        for index, segment in enumerate(result["segments"]):
+            for w, f in zip(writers, handles):
+                f.write(w["segment"](index, segment))
+
+        for w, f in zip(writers, handles):
+            if w["footer"]:
+                f.write(w["footer"](result))